@@ -0,0 +1,29 @@
+from typing import Dict, FrozenSet
+
+
+def correct_option_numbers(question: Dict) -> FrozenSet[str]:
+    """
+    Returns the 1-based numbers, as strings, of the correct options of a
+    question, the form in which players enter their answers.
+    """
+    correct_answers = question["correct_answers"]
+    return frozenset(
+        str(number)
+        for number, option in enumerate(question["options"], 1)
+        if option in correct_answers
+    )
+
+
+def parse_answer(answer: str) -> FrozenSet[str]:
+    """
+    Parses an answer such as "1,3" into the set of chosen option numbers.
+    """
+    return frozenset(answer.split(","))
+
+
+def is_correct_answer(question: Dict, answer: str) -> bool:
+    """
+    Grades one answer: it is correct if it chooses exactly the correct
+    options. Used both by the interactive quiz and by exam grading.
+    """
+    return parse_answer(answer) == correct_option_numbers(question)
@@ -0,0 +1,330 @@
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+from answer_grading import parse_answer
+
+SCHEMA_VERSION = 1
+SCHEMA_FILE = "schema.json"
+LOGINS_FILE = "logins.txt"
+LOCK_FILE = ".lock"
+QUESTION_ID_BYTES = 16
+MASK_BITS = 64
+
+# (column, array typecode, NumPy dtype). Every column is a file of
+# fixed-width little-endian values, one per event, named `<column>.bin`.
+COLUMNS = (
+    ("timestamp_ms", "q", "<i8"),
+    ("user", "I", "<u4"),
+    ("chosen", "Q", "<u8"),
+    ("correct", "B", "u1"),
+    ("response_ms", "I", "<u4"),
+)
+# Question ids are stored as 16 raw bytes, see encode_question_id.
+QUESTION_COLUMN = ("question", f"S{QUESTION_ID_BYTES}")
+
+
+def encode_question_id(question_id: Optional[str]) -> bytes:
+    """
+    Returns the fixed-width form of a question id: the 16 bytes of a hex
+    UUID (the ids from question_ids.new_question_id), a BLAKE2 digest of
+    any other id, or zero bytes if the question has no id.
+    """
+    if not question_id:
+        return bytes(QUESTION_ID_BYTES)
+    if len(question_id) == 2 * QUESTION_ID_BYTES:
+        try:
+            return bytes.fromhex(question_id)
+        except ValueError:
+            pass
+    import hashlib
+    return hashlib.blake2b(question_id.encode("utf-8"),
+                           digest_size=QUESTION_ID_BYTES).digest()
+
+
+def decode_question_id(raw: bytes) -> Optional[str]:
+    """
+    Returns the hex form of a stored question id, or None for zero bytes.
+    """
+    return raw.hex() if any(raw) else None
+
+
+def chosen_mask(answer: str) -> int:
+    """
+    Returns the chosen option numbers of an answer such as "1,3" as a
+    bitmask: bit 0 is option 1. Entries that are not option numbers
+    between 1 and 64 are ignored.
+    """
+    mask = 0
+    for number in parse_answer(answer):
+        number = number.strip()
+        if number.isdigit() and 1 <= int(number) <= MASK_BITS:
+            mask |= 1 << (int(number) - 1)
+    return mask
+
+
+class AnswerLog:
+    def __init__(self, directory: str = "answer_log"):
+        """
+        Initializes an append-only log of quiz answers.
+
+        Every answer is an event with the time, the user, the question id,
+        the chosen options as a bitmask, whether it was correct and how long
+        the user took to answer. The log is stored in columns: one binary
+        file per field, with fixed-width values (see COLUMNS), so the n-th
+        event is at offset n * width in every file. A scan over millions of
+        events reads only the columns it needs, either with
+        `read_columns` or, without copying, with `memmap_columns`.
+        Logins are written once to logins.txt; the user column holds the
+        line number of the login.
+
+        Events are buffered by `record` and appended by `flush`. Several
+        processes (one quiz per SSH session) may write to the same log:
+        `flush` holds an exclusive lock on the directory's lock file while
+        it numbers new logins against the current logins.txt and appends
+        every column, so the columns of different writers never interleave.
+        A crash can still leave some columns longer than others; events
+        present in every column count, and the extra tail is cut off by the
+        next flush.
+
+        Args:
+            directory (str): The directory of the log, created on first flush.
+        """
+        self.directory = directory
+        self._pending = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        self._pending_questions = bytearray()
+        # Users are numbered at flush time, under the lock.
+        self._pending_logins: List[str] = []
+        self._logins: Optional[List[str]] = None
+        self._login_ids: Dict[str, int] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _column_path(self, name: str) -> str:
+        return self._path(f"{name}.bin")
+
+    def _load_logins(self, reload: bool = False):
+        if self._logins is not None and not reload:
+            return
+        try:
+            with open(self._path(LOGINS_FILE), "r", encoding="utf-8") as file:
+                self._logins = file.read().splitlines()
+        except FileNotFoundError:
+            self._logins = []
+        self._login_ids = {login: i for i, login in enumerate(self._logins)}
+
+    @property
+    def logins(self) -> List[str]:
+        """
+        The logins of the user column, by user number.
+        """
+        self._load_logins()
+        return self._logins
+
+    def _widths(self) -> Dict[str, int]:
+        widths = {name: array(typecode).itemsize
+                  for name, typecode, _ in COLUMNS}
+        widths[QUESTION_COLUMN[0]] = QUESTION_ID_BYTES
+        return widths
+
+    def __len__(self) -> int:
+        """
+        Returns the number of events written to the log, not counting
+        buffered ones.
+        """
+        counts = []
+        for name, width in self._widths().items():
+            try:
+                counts.append(os.path.getsize(self._column_path(name)) // width)
+            except FileNotFoundError:
+                counts.append(0)
+        return min(counts)
+
+    def record(self, login: str, question_id: Optional[str], answer: str,
+               correct: bool, response_ms: int, timestamp_ms: int = None):
+        """
+        Buffers one answer event.
+
+        Args:
+            login (str): The user's login.
+            question_id (str, optional): The id of the question answered.
+            answer (str): The answer as entered, e.g. "1,3".
+            correct (bool): Whether the answer was correct.
+            response_ms (int): How long the user took to answer.
+            timestamp_ms (int, optional): The Unix time of the answer in
+                milliseconds. Defaults to now.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        pending = self._pending
+        pending["timestamp_ms"].append(timestamp_ms)
+        self._pending_logins.append(login)
+        pending["chosen"].append(chosen_mask(answer))
+        pending["correct"].append(1 if correct else 0)
+        pending["response_ms"].append(
+            min(max(int(response_ms), 0), 0xFFFFFFFF)
+        )
+        self._pending_questions += encode_question_id(question_id)
+
+    def _write_schema(self):
+        schema_path = self._path(SCHEMA_FILE)
+        if os.path.exists(schema_path):
+            return
+        schema = {
+            "version": SCHEMA_VERSION,
+            "columns": {name: dtype for name, _, dtype in COLUMNS},
+            "logins": LOGINS_FILE,
+        }
+        schema["columns"][QUESTION_COLUMN[0]] = QUESTION_COLUMN[1]
+        with open(schema_path, "w", encoding="utf-8") as file:
+            json.dump(schema, file, indent=4)
+
+    def _repair(self):
+        """
+        Cuts every column to the length of the shortest one, dropping the
+        events a crash left half-written. Called with the lock held, so no
+        other writer is in the middle of an append.
+        """
+        count = len(self)
+        for name, width in self._widths().items():
+            path = self._column_path(name)
+            if os.path.exists(path) and os.path.getsize(path) > count * width:
+                os.truncate(path, count * width)
+
+    def _number_users(self) -> List[str]:
+        """
+        Fills the user column of the buffered events from the logins file
+        as it is now, and returns the logins that are new to it.
+        """
+        self._load_logins(reload=True)
+        new_logins = []
+        users = self._pending["user"]
+        for login in self._pending_logins:
+            user = self._login_ids.get(login)
+            if user is None:
+                user = self._login_ids[login] = len(self._logins)
+                self._logins.append(login)
+                new_logins.append(login)
+            users.append(user)
+        return new_logins
+
+    def flush(self):
+        """
+        Appends the buffered events to the column files.
+        """
+        import fcntl
+
+        if not self._pending_questions:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._write_schema()
+            self._repair()
+            new_logins = self._number_users()
+            try:
+                if new_logins:
+                    with open(self._path(LOGINS_FILE), "a",
+                              encoding="utf-8") as file:
+                        file.write("".join(f"{login}\n" for login in new_logins))
+
+                for name, values in self._pending.items():
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    with open(self._column_path(name), "ab") as file:
+                        values.tofile(file)
+                with open(self._column_path(QUESTION_COLUMN[0]), "ab") as file:
+                    file.write(self._pending_questions)
+            except BaseException:
+                # The numbers may be wrong on a retry: logins.txt is read
+                # again then.
+                self._pending["user"] = array("I")
+                self._logins = None
+                raise
+
+        self._pending = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        self._pending_questions = bytearray()
+        self._pending_logins = []
+
+    def read_columns(self, names=None) -> Dict:
+        """
+        Reads whole columns into memory.
+
+        Args:
+            names (Iterable[str], optional): The columns to read. Defaults to
+                all of them.
+
+        Returns:
+            Dict: An array per numeric column and, for "question", the raw
+            bytes (16 per event).
+        """
+        count = len(self)
+        typecodes = {name: typecode for name, typecode, _ in COLUMNS}
+        names = list(typecodes) + [QUESTION_COLUMN[0]] if names is None else names
+        columns = {}
+        for name in names:
+            path = self._column_path(name)
+            if name == QUESTION_COLUMN[0]:
+                columns[name] = b""
+                if count:
+                    with open(path, "rb") as file:
+                        columns[name] = file.read(count * QUESTION_ID_BYTES)
+                continue
+            values = array(typecodes[name])
+            if count:
+                with open(path, "rb") as file:
+                    values.fromfile(file, count)
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns[name] = values
+        return columns
+
+    def memmap_columns(self, names=None) -> Dict:
+        """
+        Maps columns into memory as NumPy arrays without reading them.
+
+        NumPy is an optional dependency, needed only for this method
+        (pip install numpy); it is imported here so that writing the log
+        and `read_columns` work without it.
+
+        Args:
+            names (Iterable[str], optional): The columns to map. Defaults to
+                all of them.
+
+        Returns:
+            Dict: A read-only numpy.memmap per column.
+        """
+        import numpy
+
+        dtypes = {name: dtype for name, _, dtype in COLUMNS}
+        dtypes[QUESTION_COLUMN[0]] = QUESTION_COLUMN[1]
+        count = len(self)
+        return {
+            name: numpy.memmap(self._column_path(name), dtype=dtypes[name],
+                               mode="r", shape=(count,))
+            for name in (dtypes if names is None else names)
+        }
+
+    def iter_events(self) -> Iterator[Dict]:
+        """
+        Yields the written events as dicts, decoding logins and question ids.
+        Meant for small logs and tests; scans should use the columns.
+        """
+        columns = self.read_columns()
+        logins = self.logins
+        questions = columns[QUESTION_COLUMN[0]]
+        for i in range(len(columns["user"])):
+            yield {
+                "timestamp_ms": columns["timestamp_ms"][i],
+                "login": logins[columns["user"][i]],
+                "question_id": decode_question_id(
+                    questions[i * QUESTION_ID_BYTES:(i + 1) * QUESTION_ID_BYTES]
+                ),
+                "chosen": columns["chosen"][i],
+                "correct": bool(columns["correct"][i]),
+                "response_ms": columns["response_ms"][i],
+            }
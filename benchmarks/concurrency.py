@@ -0,0 +1,149 @@
+"""
+Multi-threaded stress benchmark of the shared managers.
+
+Runs a UserManager and an indexed QuizResultManager shared by a pool of
+threads, each doing a mix of leaderboard and percentile reads and result
+saves, for every thread count. Reports reads and writes per second, then
+checks that no save was lost and that the indexes match the saved file.
+Exits with status 1 if the check fails.
+
+    python benchmarks/concurrency.py
+    python benchmarks/concurrency.py --threads 1,2,4,8,16 --seconds 5 --writes 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import (  # noqa: E402
+    MIXED_CATEGORY, category_names, iter_users, write_users
+)
+from quantile_sketch import PercentileIndex  # noqa: E402
+from quiz_result_manager import LeaderboardIndex, QuizResultManager  # noqa: E402
+from user_manager import UserManager  # noqa: E402
+
+CATEGORIES = category_names(10) + [MIXED_CATEGORY]
+
+
+def count_results(users: Dict) -> int:
+    return sum(len(results) for user in users.values()
+               for results in user["quiz_results"].values())
+
+
+def scores(top) -> List[int]:
+    # Equal scores may be listed in another order after a rebuild.
+    return [score for _, score, _ in top]
+
+
+def worker(result_manager: QuizResultManager, logins: List[str],
+           deadline: float, write_share: float, seed: int, counts: Dict):
+    rng = random.Random(seed)
+    reads = writes = 0
+    while time.perf_counter() < deadline:
+        category = rng.choice(CATEGORIES)
+        if rng.random() < write_share:
+            result_manager.save_quiz_result(
+                rng.choice(logins), category, rng.randint(0, 20)
+            )
+            writes += 1
+        elif rng.random() < 0.5:
+            result_manager.get_top_20(category)
+            reads += 1
+        else:
+            result_manager.get_percentile(category, rng.randint(0, 20))
+            reads += 1
+    counts["reads"] += reads
+    counts["writes"] += writes
+
+
+def run(threads: int, seconds: float, write_share: float, users: int) -> Dict:
+    """
+    Runs the stress test with `threads` threads in a fresh data directory.
+
+    Returns:
+        Dict: Operation counts and rates, and the consistency check result.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="quiz-concurrency-") as directory:
+        os.chdir(directory)
+        try:
+            initial = write_users(UserManager.USER_DATA_FILE, iter_users(users))
+            user_manager = UserManager()
+            logins = list(user_manager.load_user_data())
+            result_manager = QuizResultManager(
+                user_manager,
+                LeaderboardIndex(UserManager.USER_DATA_FILE),
+                PercentileIndex(UserManager.USER_DATA_FILE),
+            )
+            counts = {"reads": 0, "writes": 0}
+            lock = threading.Lock()
+            deadline = time.perf_counter() + seconds
+
+            def task(seed):
+                partial = {"reads": 0, "writes": 0}
+                worker(result_manager, logins, deadline, write_share, seed,
+                       partial)
+                with lock:
+                    for key, value in partial.items():
+                        counts[key] += value
+
+            pool = [threading.Thread(target=task, args=(seed,))
+                    for seed in range(threads)]
+            started = time.perf_counter()
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            saved = user_manager.load_user_data()
+            expected = LeaderboardIndex.from_users(saved)
+            index = result_manager.leaderboard_index
+            consistent = (
+                count_results(saved) == initial + counts["writes"]
+                and index.is_current()
+                and all(scores(index.top(c)) == scores(expected.top(c))
+                        for c in CATEGORIES)
+            )
+        finally:
+            os.chdir(cwd)
+    return {
+        "threads": threads,
+        "reads": counts["reads"],
+        "writes": counts["writes"],
+        "reads_per_second": counts["reads"] / elapsed,
+        "writes_per_second": counts["writes"] / elapsed,
+        "consistent": consistent,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", default="1,2,4,8",
+                        help="comma-separated thread counts")
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="duration of each run")
+    parser.add_argument("--writes", type=float, default=0.01,
+                        help="share of operations that save a result")
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>8}{'reads/s':>12}{'writes/s':>10}{'writes':>8}  check")
+    failed = False
+    for threads in (int(n) for n in args.threads.split(",")):
+        row = run(threads, args.seconds, args.writes, args.users)
+        failed |= not row["consistent"]
+        print(f"{row['threads']:>8}{row['reads_per_second']:>12.0f}"
+              f"{row['writes_per_second']:>10.1f}{row['writes']:>8}  "
+              f"{'ok' if row['consistent'] else 'LOST UPDATES'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
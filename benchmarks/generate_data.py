@@ -0,0 +1,369 @@
+"""
+Synthetic data generator for questions.json and users.json.
+
+Writes question banks and user stores in the application's file formats,
+at any size, to evaluate the slow paths at production scale. Output is
+deterministic for a given seed and is streamed record by record, so even
+10⁷ records need only a few megabytes of memory.
+
+    python benchmarks/generate_data.py questions --count 100000 -o questions.json
+    python benchmarks/generate_data.py users --users 10000 --results 5 -o users.json
+    python benchmarks/generate_data.py submissions --questions questions.json \
+        --users 10000 --count 1000000 -o submissions.jsonl
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+BASE_CATEGORIES = [
+    "географія", "історія", "математика", "література", "біологія",
+    "хімія", "фізика", "спорт", "музика", "кіно", "мистецтво",
+    "астрономія", "інформатика", "економіка", "мови",
+]
+MIXED_CATEGORY = "Змішана"
+SYLLABLES = [
+    "ка", "ра", "но", "ві", "ло", "ми", "ст", "ко", "ри", "на", "ти",
+    "за", "по", "ле", "ні", "до", "ва", "пі", "ше", "чи", "ю", "ї",
+    "го", "бу", "дж", "єв", "мо", "ро", "са", "ту", "ха", "ці",
+]
+QUESTION_STARTS = [
+    "Яка", "Який", "Яке", "Хто", "Що", "Де", "Коли", "Скільки",
+    "Чому", "Котрий",
+]
+COMMON_OPTIONS = [["Так", "Ні"], ["Правда", "Неправда"]]
+# Relative activity by hour of the day: quiet at night, peaks in the evening.
+HOUR_WEIGHTS = [
+    1, 1, 1, 1, 1, 2, 3, 5, 7, 8, 8, 8,
+    9, 9, 8, 8, 9, 11, 13, 15, 15, 12, 7, 3,
+]
+# Relative activity by weekday, Monday first.
+WEEKDAY_WEIGHTS = [10, 10, 10, 10, 9, 13, 14]
+
+
+def category_names(count: int) -> List[str]:
+    """
+    Returns `count` category names, the built-in names first.
+    """
+    names = BASE_CATEGORIES[:count]
+    names += [f"категорія {i}" for i in range(len(names) + 1, count + 1)]
+    return names
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def iter_questions(
+        count: int, categories: int = 10, min_options: int = 2,
+        max_options: int = 5, multi_answer_ratio: float = 0.15,
+        seed: int = 1
+) -> Iterator[Dict]:
+    """
+    Yields synthetic questions in the format of questions.json.
+
+    About a fifth of the questions use shared yes/no style options, as
+    real banks do; the rest use generated Cyrillic words or numbers.
+
+    Args:
+        count (int): The number of questions.
+        categories (int): The number of categories.
+        min_options (int): The minimum number of options per question.
+        max_options (int): The maximum number of options per question.
+        multi_answer_ratio (float): The share of questions with more than
+            one correct answer (needs at least three options).
+        seed (int): The random seed.
+    """
+    rng = random.Random(seed)
+    names = category_names(categories)
+    for _ in range(count):
+        if rng.random() < 0.2:
+            options = list(rng.choice(COMMON_OPTIONS))
+        else:
+            option_count = rng.randint(min_options, max_options)
+            if rng.random() < 0.3:
+                options = [str(value) for value in
+                           rng.sample(range(2000), option_count)]
+            else:
+                options = []
+                while len(options) < option_count:
+                    word = _word(rng)
+                    if word not in options:
+                        options.append(word)
+
+        if len(options) > 2 and rng.random() < multi_answer_ratio:
+            correct_answers = rng.sample(options, rng.randint(2, len(options) - 1))
+        else:
+            correct_answers = [rng.choice(options)]
+
+        words = " ".join(_word(rng) for _ in range(rng.randint(3, 8)))
+        yield {
+            "category": rng.choice(names),
+            "question": f"{rng.choice(QUESTION_STARTS)} {words}?",
+            "options": options,
+            "correct_answers": correct_answers,
+            "id": f"{rng.getrandbits(128):032x}",
+        }
+
+
+class ActivityClock:
+    def __init__(self, rng: random.Random, start: date, days: int):
+        """
+        Draws result timestamps between `start` and `start + days`.
+
+        Activity grows linearly over the period, is higher at weekends and
+        follows HOUR_WEIGHTS during the day.
+        """
+        self.rng = rng
+        self.start = datetime.combine(start, datetime.min.time())
+        self.days = days
+        self.hours = range(24)
+        self.hour_cum_weights = [
+            sum(HOUR_WEIGHTS[:hour + 1]) for hour in self.hours
+        ]
+
+    def draw(self) -> datetime:
+        rng = self.rng
+        while True:
+            day = int(self.days * math.sqrt(rng.random()))
+            moment = self.start + timedelta(days=day)
+            weekday_weight = WEEKDAY_WEIGHTS[moment.weekday()]
+            if rng.random() * max(WEEKDAY_WEIGHTS) < weekday_weight:
+                break
+        hour = rng.choices(self.hours, cum_weights=self.hour_cum_weights)[0]
+        return moment + timedelta(
+            hours=hour, minutes=rng.randrange(60), seconds=rng.randrange(60)
+        )
+
+
+def iter_users(
+        users: int, results: int = 3, categories: int = 10,
+        questions_per_quiz: int = 20, start: date = date(2024, 1, 1),
+        days: int = 365, seed: int = 1
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yields synthetic (login, user) pairs in the format of users.json.
+
+    Every user has `results` results in each category and in the mixed
+    category, in chronological order. Scores follow a per-user skill, so
+    some users consistently do better than others.
+
+    Args:
+        users (int): The number of users.
+        results (int): Results per user and category.
+        categories (int): The number of categories.
+        questions_per_quiz (int): The maximum score.
+        start (date): The first day of activity.
+        days (int): The number of days of activity.
+        seed (int): The random seed.
+    """
+    rng = random.Random(seed)
+    clock = ActivityClock(rng, start, days)
+    names = category_names(categories) + [MIXED_CATEGORY]
+    for number in range(users):
+        skill = rng.betavariate(5, 3)
+        mean = questions_per_quiz * skill
+        deviation = math.sqrt(questions_per_quiz * skill * (1 - skill))
+        birth_date = date(1960, 1, 1) + timedelta(days=rng.randrange(45 * 365))
+
+        quiz_results = {}
+        for category in names:
+            moments = sorted(clock.draw() for _ in range(results))
+            quiz_results[category] = [
+                {
+                    "category": category,
+                    "score": min(questions_per_quiz,
+                                 max(0, round(rng.gauss(mean, deviation)))),
+                    "date": moment.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                for moment in moments
+            ]
+        yield f"user{number:07d}", {
+            "password": f"pass{rng.randrange(10 ** 6):06d}",
+            "birth_date": birth_date.isoformat(),
+            "quiz_results": quiz_results,
+        }
+
+
+def iter_submissions(
+        count: int, questions: List[Dict], users: int,
+        questions_per_sheet: int = 20, seed: int = 1
+) -> Iterator[Dict]:
+    """
+    Yields synthetic exam answer sheets for exam_grading.
+
+    Each sheet belongs to one of the `users` generated logins and answers
+    up to `questions_per_sheet` questions of one category. Each answer is
+    correct with the probability of the user's skill; wrong answers pick
+    a random option.
+
+    Args:
+        count (int): The number of sheets.
+        questions (List[Dict]): The question bank, with ids.
+        users (int): The number of logins, as generated by iter_users.
+        questions_per_sheet (int): Questions per sheet.
+        seed (int): The random seed.
+    """
+    rng = random.Random(seed)
+    by_category = {}
+    for question in questions:
+        by_category.setdefault(question["category"], []).append(question)
+    categories = sorted(by_category)
+    skills = [rng.betavariate(5, 3) for _ in range(users)]
+    for _ in range(count):
+        user = rng.randrange(users)
+        category = rng.choice(categories)
+        sheet = rng.sample(
+            by_category[category],
+            min(questions_per_sheet, len(by_category[category]))
+        )
+        answers = []
+        for question in sheet:
+            options = question["options"]
+            if rng.random() < skills[user]:
+                chosen = [
+                    str(number) for number, option in enumerate(options, 1)
+                    if option in question["correct_answers"]
+                ]
+                answers.append(",".join(chosen))
+            else:
+                answers.append(str(rng.randint(1, len(options))))
+        yield {
+            "login": f"user{user:07d}",
+            "category": category,
+            "question_ids": [question["id"] for question in sheet],
+            "answers": answers,
+        }
+
+
+def write_jsonl(file_path: str, records: Iterable[Dict]) -> int:
+    """
+    Streams records to a JSONL file.
+
+    Returns:
+        int: The number of records written.
+    """
+    written = 0
+    with open(file_path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+            written += 1
+    return written
+
+
+def write_questions(file_path: str, questions: Iterable[Dict]) -> int:
+    """
+    Streams questions to a questions.json file.
+
+    Returns:
+        int: The number of questions written.
+    """
+    written = 0
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write('{"questions": [')
+        for question in questions:
+            file.write(",\n" if written else "\n")
+            file.write(json.dumps(question, ensure_ascii=False))
+            written += 1
+        file.write("\n]}\n")
+    return written
+
+
+def write_users(file_path: str, users: Iterable[Tuple[str, Dict]]) -> int:
+    """
+    Streams users to a users.json file.
+
+    Returns:
+        int: The number of quiz results written.
+    """
+    written = 0
+    results = 0
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for login, user in users:
+            file.write(",\n" if written else "\n")
+            file.write(json.dumps(login, ensure_ascii=False))
+            file.write(": ")
+            file.write(json.dumps(user, ensure_ascii=False))
+            written += 1
+            results += sum(map(len, user["quiz_results"].values()))
+        file.write("\n}\n")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=1)
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+
+    questions = subparsers.add_parser("questions", help="a questions.json bank")
+    questions.add_argument("--count", type=int, default=1000)
+    questions.add_argument("--categories", type=int, default=10)
+    questions.add_argument("--min-options", type=int, default=2)
+    questions.add_argument("--max-options", type=int, default=5)
+    questions.add_argument("--multi-answer-ratio", type=float, default=0.15)
+    questions.add_argument("-o", "--output", default="questions.json")
+
+    users = subparsers.add_parser("users", help="a users.json store")
+    users.add_argument("--users", type=int, default=1000)
+    users.add_argument("--results", type=int, default=3,
+                       help="results per user and category")
+    users.add_argument("--categories", type=int, default=10)
+    users.add_argument("--start", type=date.fromisoformat,
+                       default=date(2024, 1, 1))
+    users.add_argument("--days", type=int, default=365)
+    users.add_argument("-o", "--output", default="users.json")
+
+    submissions = subparsers.add_parser(
+        "submissions", help="exam answer sheets (JSONL) for exam_grading"
+    )
+    submissions.add_argument("--questions", default="questions.json",
+                             help="the bank to answer; questions need ids")
+    submissions.add_argument("--users", type=int, default=1000)
+    submissions.add_argument("--count", type=int, default=1000)
+    submissions.add_argument("--per-sheet", type=int, default=20)
+    submissions.add_argument("-o", "--output", default="submissions.jsonl")
+
+    args = parser.parse_args(argv)
+    if args.kind == "questions" and not 2 <= args.min_options <= args.max_options:
+        parser.error("need 2 <= --min-options <= --max-options")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    if args.kind == "questions":
+        count = write_questions(args.output, iter_questions(
+            args.count, args.categories, args.min_options, args.max_options,
+            args.multi_answer_ratio, args.seed
+        ))
+        print(f"{args.output}: {count} questions")
+    elif args.kind == "submissions":
+        with open(args.questions, "r", encoding="utf-8") as file:
+            questions = [question for question in json.load(file)["questions"]
+                         if question.get("id")]
+        if not questions:
+            sys.exit(f"{args.questions}: no questions with ids")
+        count = write_jsonl(args.output, iter_submissions(
+            args.count, questions, args.users, args.per_sheet, args.seed
+        ))
+        print(f"{args.output}: {count} answer sheets")
+    else:
+        count = write_users(args.output, iter_users(
+            args.users, args.results, args.categories,
+            start=args.start, days=args.days, seed=args.seed
+        ))
+        print(f"{args.output}: {args.users} users, {count} results")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
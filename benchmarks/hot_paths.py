@@ -0,0 +1,333 @@
+"""
+Benchmark suite for the hot paths of the quiz application.
+
+Generates synthetic data files for each data size, times every benchmark
+in a working directory holding those files, and compares the results with
+a JSON baseline. Exits with status 1 when a benchmark is slower than its
+baseline by more than the threshold.
+
+    python benchmarks/hot_paths.py                     # compare with baseline
+    python benchmarks/hot_paths.py --save-baseline     # record a new baseline
+    python benchmarks/hot_paths.py --sizes large --filter get_top_20
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.generate_data import (  # noqa: E402
+    iter_questions, iter_users, write_questions, write_users
+)
+from quiz_category import MixedCategory, SpecificCategory  # noqa: E402
+from quiz_loader import QuizLoader  # noqa: E402
+from quiz_orchestrator import QuizOrchestrator  # noqa: E402
+from quiz_result_manager import IQuizResultManager, QuizResultManager  # noqa: E402
+from user_manager import UserManager  # noqa: E402
+from victorine_utility import QuizDataManager  # noqa: E402
+
+BASELINE_FILE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+# Write benchmarks vary by up to ~50% between runs on a shared machine.
+DEFAULT_THRESHOLD = 0.5
+# Data sizes as (questions, users); users have 3 results per category.
+SIZES = {
+    "small": (1_000, 100),
+    "medium": (10_000, 1_000),
+    "large": (100_000, 10_000),
+}
+DEFAULT_SIZES = ("small", "medium")
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    """
+    Registers a benchmark. The decorated function is called with the
+    working directory prepared for one data size and returns the callable
+    to time.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@contextlib.contextmanager
+def scripted_input(answers: List[str]):
+    """
+    Answers input() prompts from `answers`, cycling, and discards output.
+    """
+    position = 0
+
+    def fake_input(prompt=""):
+        nonlocal position
+        answer = answers[position % len(answers)]
+        position += 1
+        return answer
+
+    original = builtins.input
+    builtins.input = fake_input
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+
+class DiscardingResultManager(IQuizResultManager):
+    def save_quiz_result(self, login, category, score):
+        self.last_score = score
+
+    def get_user_results(self, login):
+        return {}
+
+    def get_top_20(self, category):
+        return []
+
+
+def _first_user(user_manager):
+    login, user = next(iter(user_manager.load_user_data().items()))
+    return login, user["password"]
+
+
+@benchmark("load_questions")
+def bench_load_questions():
+    loader = QuizLoader()
+    return loader.load_questions
+
+
+@benchmark("specific_category")
+def bench_specific_category():
+    questions = QuizLoader().load_questions()
+    category = questions[0]["category"]
+
+    def run():
+        quiz_category = SpecificCategory(questions, category)
+        return quiz_category.get_questions()
+    return run
+
+
+@benchmark("mixed_category")
+def bench_mixed_category():
+    questions = QuizLoader().load_questions()
+
+    def run():
+        return MixedCategory(questions).get_questions()
+    return run
+
+
+@benchmark("grade_quiz")
+def bench_grade_quiz():
+    questions = QuizLoader().load_questions()
+    category = questions[0]["category"]
+    orchestrator = QuizOrchestrator(
+        UserManager(), DiscardingResultManager(), QuizLoader()
+    )
+
+    def run():
+        with scripted_input(["1"]):
+            orchestrator.start_quiz("user0000000", category)
+    return run
+
+
+@benchmark("save_quiz_result")
+def bench_save_quiz_result():
+    result_manager = QuizResultManager(UserManager())
+
+    def run():
+        result_manager.save_quiz_result("user0000000", "географія", 10)
+    return run
+
+
+@benchmark("get_top_20_specific")
+def bench_get_top_20_specific():
+    result_manager = QuizResultManager(UserManager())
+    return lambda: result_manager.get_top_20("географія")
+
+
+@benchmark("get_top_20_mixed")
+def bench_get_top_20_mixed():
+    result_manager = QuizResultManager(UserManager())
+    return lambda: result_manager.get_top_20("Змішана")
+
+
+@benchmark("get_user_results")
+def bench_get_user_results():
+    result_manager = QuizResultManager(UserManager())
+    return lambda: result_manager.get_user_results("user0000000")
+
+
+@benchmark("login_user")
+def bench_login_user():
+    user_manager = UserManager()
+    login, password = _first_user(user_manager)
+
+    def run():
+        with scripted_input([login, password]):
+            return user_manager.login_user()
+    return run
+
+
+@benchmark("save_questions")
+def bench_save_questions():
+    quiz_data_manager = QuizDataManager("questions.json")
+    questions = quiz_data_manager.get_questions()
+    return lambda: quiz_data_manager.save_questions(questions)
+
+
+def prepare_data(directory: str, questions: int, users: int, seed: int = 1):
+    """
+    Writes questions.json and users.json of the given size to `directory`.
+    """
+    write_questions(os.path.join(directory, "questions.json"),
+                    iter_questions(questions, seed=seed))
+    write_users(os.path.join(directory, UserManager.USER_DATA_FILE),
+                iter_users(users, seed=seed))
+
+
+def time_callable(function: Callable, repeat: int = 5,
+                  min_time: float = 0.2) -> float:
+    """
+    Returns the best time of one call, in seconds, over `repeat` rounds.
+    Each round repeats the call until it takes at least `min_time`.
+    """
+    function()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1000:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def run_benchmarks(sizes: Dict[str, Tuple[int, int]], name_filter: str = "",
+                   repeat: int = 5, min_time: float = 0.2,
+                   keys=None) -> Dict[str, float]:
+    """
+    Runs the registered benchmarks at every size; with `keys`, only the
+    given "name[size]" entries.
+
+    Returns:
+        Dict[str, float]: Seconds per call keyed by "name[size]".
+    """
+    results = {}
+    cwd = os.getcwd()
+    for size, (questions, users) in sizes.items():
+        if keys and not any(key.endswith(f"[{size}]") for key in keys):
+            continue
+        with tempfile.TemporaryDirectory(prefix="quiz-bench-") as directory:
+            prepare_data(directory, questions, users)
+            os.chdir(directory)
+            try:
+                for name, setup in BENCHMARKS.items():
+                    key = f"{name}[{size}]"
+                    if name_filter not in name or (keys and key not in keys):
+                        continue
+                    results[key] = time_callable(
+                        setup(), repeat, min_time
+                    )
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[Tuple[str, float, float, bool]]:
+    """
+    Compares results with a baseline.
+
+    Returns:
+        list: Tuples of (key, seconds, baseline seconds or None, regressed).
+    """
+    rows = []
+    for key, seconds in results.items():
+        reference = baseline.get(key)
+        regressed = reference is not None and seconds > reference * (1 + threshold)
+        rows.append((key, seconds, reference, regressed))
+    return rows
+
+
+def load_baseline(file_path: str) -> Dict[str, float]:
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(file_path: str, results: Dict[str, float]):
+    baseline = load_baseline(file_path)
+    baseline.update(results)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump({"version": 1, "results": dict(sorted(baseline.items()))},
+                  file, indent=4)
+        file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--filter", default="",
+                        help="run only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown, e.g. 0.5 for 50%%")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    unknown = [size for size in args.sizes.split(",") if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+    sizes = {size: SIZES[size] for size in args.sizes.split(",")}
+
+    baseline = load_baseline(args.baseline)
+    results = run_benchmarks(sizes, args.filter, args.repeat)
+    rows = compare(results, baseline, args.threshold)
+    regressed = {row[0] for row in rows if row[3]}
+    if regressed and not args.save_baseline:
+        # Time regressions once more so a single noisy run does not fail.
+        for key, seconds in run_benchmarks(
+                sizes, args.filter, args.repeat, keys=regressed).items():
+            results[key] = min(results[key], seconds)
+        rows = compare(results, baseline, args.threshold)
+
+    print(f"{'benchmark':<32}{'ms':>10}{'baseline':>10}{'change':>9}")
+    for key, seconds, reference, regressed in rows:
+        if reference is None:
+            reference_text, change_text = "-", "new"
+        else:
+            reference_text = f"{reference * 1000:.3f}"
+            change_text = f"{(seconds / reference - 1) * 100:+.0f}%"
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{key:<32}{seconds * 1000:>10.3f}{reference_text:>10}"
+              f"{change_text:>9}{marker}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    return 1 if any(row[3] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
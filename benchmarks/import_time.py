@@ -0,0 +1,89 @@
+"""
+Import-time benchmark for the quiz CLI.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters,
+reports the median cumulative import time of the module and the slowest
+imports by self time, and exits with status 1 if the median exceeds the
+budget.
+
+    python benchmarks/import_time.py --budget-ms 80
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str):
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        list: Tuples of (module, self_us, cumulative_us), in output order.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        entries.append(
+            (fields[2].strip(), int(fields[0]), int(fields[1]))
+        )
+    return entries
+
+
+def measure(module: str = "quiz_app"):
+    """
+    Imports `module` once in a fresh interpreter.
+
+    Returns:
+        list: The parsed importtime entries.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="quiz_app")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=80.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    totals = []
+    self_times = {}
+    for _ in range(args.runs):
+        entries = measure(args.module)
+        totals.append(next(
+            cumulative for name, _, cumulative in entries
+            if name == args.module
+        ))
+        for name, self_us, _ in entries:
+            self_times.setdefault(name, []).append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"{args.module}: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.1f} ms)")
+    slowest = sorted(
+        self_times.items(), key=lambda item: -statistics.median(item[1])
+    )[:args.top]
+    for name, values in slowest:
+        print(f"  {statistics.median(values) / 1000:7.2f} ms  {name}")
+
+    if median_ms > args.budget_ms:
+        print("Import time budget exceeded.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
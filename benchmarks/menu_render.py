@@ -0,0 +1,85 @@
+"""
+Menu rendering benchmark.
+
+Draws the user menu and a top-20 table repeatedly with an uncached rich
+renderer, the cached rich renderer and the plain-text renderer, and reports
+the time per display and the bytes written per display.
+
+    python benchmarks/menu_render.py --repeat 200
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from menu_renderer import PlainMenuRenderer, RichMenuRenderer  # noqa: E402
+from quiz_orchestrator import USER_MENU  # noqa: E402
+
+TOP_COLUMNS = ("Place", "User", "Score", "Date")
+TOP_ROWS = [
+    (str(place), f"user{place}", str(20 - place), "2024-05-01 12:00:00")
+    for place in range(1, 21)
+]
+
+
+class UncachedRichMenuRenderer(RichMenuRenderer):
+    def render_menu(self, title, rows):
+        return self.render_table(title, ("", ""), rows)
+
+
+def _rich_renderer(cls):
+    from rich.console import Console
+    return cls(Console(file=io.StringIO(), force_terminal=True, width=80))
+
+
+def _output(renderer):
+    return renderer.console.file if hasattr(renderer, "console") else renderer.file
+
+
+def measure(renderer, repeat: int):
+    """
+    Returns (menu_ms, menu_bytes, table_ms, table_bytes) per display.
+    """
+    output = _output(renderer)
+    results = []
+    for display in (
+        lambda: renderer.print_menu("Меню користувача", USER_MENU),
+        lambda: renderer.print_table("Топ-20", TOP_COLUMNS, TOP_ROWS),
+    ):
+        output.seek(0)
+        output.truncate()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            display()
+        elapsed = time.perf_counter() - started
+        written = len(output.getvalue().encode("utf-8"))
+        results += [elapsed * 1000 / repeat, written / repeat]
+    return tuple(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    renderers = [
+        ("rich", _rich_renderer(UncachedRichMenuRenderer)),
+        ("rich, cached", _rich_renderer(RichMenuRenderer)),
+        ("plain", PlainMenuRenderer(io.StringIO())),
+    ]
+    print(f"{'renderer':<14}{'menu ms':>10}{'menu B':>9}"
+          f"{'top-20 ms':>11}{'top-20 B':>10}")
+    for name, renderer in renderers:
+        menu_ms, menu_bytes, table_ms, table_bytes = measure(
+            renderer, args.repeat
+        )
+        print(f"{name:<14}{menu_ms:>10.3f}{menu_bytes:>9.0f}"
+              f"{table_ms:>11.3f}{table_bytes:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
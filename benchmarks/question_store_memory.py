@@ -0,0 +1,103 @@
+"""
+Memory comparison of the question representations.
+
+Builds a synthetic bank as question dicts parsed from JSON (the way
+QuizLoader holds questions.json) and as a ColumnarQuestionStore, and
+reports the memory each one holds according to tracemalloc.
+
+    python benchmarks/question_store_memory.py --count 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_store import ColumnarQuestionStore  # noqa: E402
+
+CATEGORIES = [
+    "географія", "історія", "математика", "література", "біологія",
+    "хімія", "фізика", "спорт", "музика", "кіно",
+]
+COMMON_OPTIONS = ["Так", "Ні", "Не знаю"]
+COUNTRIES = [
+    "Україна", "Польща", "Франція", "Німеччина", "Італія", "Іспанія",
+    "Канада", "США", "Китай", "Японія", "Бразилія", "Австралія",
+]
+
+
+def synthetic_questions(count: int, seed: int = 1):
+    """
+    Yields `count` question dicts, each decoded from its own JSON text so
+    that no strings are shared between questions, as after json.load.
+    """
+    rng = random.Random(seed)
+    for number in range(count):
+        category = rng.choice(CATEGORIES)
+        kind = rng.random()
+        if kind < 0.3:
+            options = COMMON_OPTIONS[:2]
+        elif kind < 0.7:
+            options = rng.sample(COUNTRIES, 4)
+        else:
+            options = [str(rng.randrange(1000)) for _ in range(4)]
+        record = {
+            "category": category,
+            "question": f"Питання №{number} з категорії {category}?",
+            "options": options,
+            "correct_answers": [rng.choice(options)],
+        }
+        yield json.loads(json.dumps(record, ensure_ascii=False))
+
+
+def measure(build):
+    """
+    Returns (result, retained_bytes, peak_bytes, seconds) of `build()`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rows = []
+    dicts, retained, peak, elapsed = measure(
+        lambda: list(synthetic_questions(args.count, args.seed))
+    )
+    rows.append(("dicts", retained, peak, elapsed))
+    del dicts
+
+    store, retained, peak, elapsed = measure(
+        lambda: ColumnarQuestionStore.from_questions(
+            synthetic_questions(args.count, args.seed)
+        )
+    )
+    rows.append(("columnar", retained, peak, elapsed))
+
+    print(f"{args.count} questions, {len(store.options)} distinct options")
+    print(f"{'store':<10}{'retained MB':>13}{'peak MB':>10}{'build s':>10}")
+    for name, retained, peak, elapsed in rows:
+        print(f"{name:<10}{retained / 2 ** 20:>13.1f}"
+              f"{peak / 2 ** 20:>10.1f}{elapsed:>10.1f}")
+    print(f"ratio: {rows[0][1] / rows[1][1]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,799 @@
+import functools
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from colorama import Fore, Style
+
+from quantile_sketch import PercentileIndex
+from quiz_result_manager import (
+    IQuizResultManager, LeaderboardIndex, QuizResultManager
+)
+from user_manager import IUserManager, UserManager
+from warm_start import file_fingerprint
+
+DEFAULT_SOCKET = os.path.join(".quiz_cache", "daemon.sock")
+# Payload length, request id, then the operation in a request and the
+# status in a response.
+FRAME = struct.Struct("<IIB")
+MAX_PAYLOAD = 64 << 20
+OK, ERROR = 0, 1
+# An operation is sent as its position in this tuple.
+OPS = (
+    "ping", "load_users", "save_users", "has_user", "add_user",
+    "check_password", "update_user", "save_result", "save_results",
+    "user_results", "top_20", "percentile",
+)
+_OP_CODES = {name: code for code, name in enumerate(OPS)}
+
+
+class DaemonError(Exception):
+    """
+    An operation failed in the daemon; the message is the daemon's error.
+    """
+
+
+class LostRequestError(DaemonError):
+    """
+    The connection broke before the daemon answered a request, so it is
+    unknown whether the request was carried out.
+    """
+
+
+def encode_frame(request_id: int, code: int, body) -> bytes:
+    payload = json.dumps(body, ensure_ascii=False,
+                         separators=(",", ":")).encode("utf-8")
+    return FRAME.pack(len(payload), request_id, code) + payload
+
+
+class CachedUserManager(UserManager):
+    def __init__(self, file_path: str = UserManager.USER_DATA_FILE):
+        """
+        A UserManager keeping the parsed user data in memory.
+
+        The data is read again only when the file's fingerprint changes,
+        i.e. when another program (an admin tool, an app started without
+        the daemon) wrote it; saves go through to the file and keep the
+        cache.
+
+        Args:
+            file_path (str): The user data file.
+        """
+        self.USER_DATA_FILE = file_path
+        self._users: Optional[Dict] = None
+        self._fingerprint = None
+        super().__init__()
+
+    def load_user_data(self):
+        fingerprint = file_fingerprint(self.USER_DATA_FILE)
+        if self._users is None or fingerprint != self._fingerprint:
+            self._users = super().load_user_data()
+            self._fingerprint = fingerprint
+        return self._users
+
+    def save_user_data(self, data):
+        # Callers modify the loaded dict in place: if the write fails, the
+        # cache may hold changes the file does not, so it is dropped.
+        self._users = None
+        super().save_user_data(data)
+        self._users = data
+        self._fingerprint = file_fingerprint(self.USER_DATA_FILE)
+
+
+class _Connection:
+    def __init__(self, sock: socket.socket):
+        self.socket = sock
+        self.received = bytearray()
+        self.outgoing = bytearray()
+
+
+class CacheDaemon:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET,
+                 users_file: str = UserManager.USER_DATA_FILE):
+        """
+        Initializes the cache daemon and binds its Unix socket.
+
+        The daemon owns the user data: it keeps the parsed users, the
+        leaderboard index and the percentile sketches in memory across
+        requests, so quiz processes served by it never parse users.json.
+        Requests of all clients are handled one at a time by a single
+        selector loop, so read-modify-write cycles of different processes
+        cannot interleave.
+
+        Each request and response is a FRAME header (payload length,
+        request id, operation or status) followed by a JSON payload: the
+        argument list of a request, the result or error message of a
+        response. A client may send many requests before reading the
+        responses (pipelining); they are answered in order.
+
+        The socket is created with owner-only permissions, as the user
+        data includes passwords.
+
+        Args:
+            socket_path (str): The socket path.
+            users_file (str): The user data file.
+
+        Raises:
+            OSError: If another daemon is listening on `socket_path`.
+        """
+        self.socket_path = socket_path
+        self.user_manager = CachedUserManager(users_file)
+        self.leaderboard_index = LeaderboardIndex(users_file)
+        self.percentile_index = PercentileIndex(users_file)
+        self.result_manager = QuizResultManager(
+            self.user_manager, self.leaderboard_index, self.percentile_index
+        )
+        self._connections: Dict[int, _Connection] = {}
+        self._running = False
+
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._remove_stale_socket()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self._listener.bind(socket_path)
+        finally:
+            os.umask(old_umask)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ)
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)  # Left behind by a daemon that died.
+            return
+        finally:
+            probe.close()
+        raise OSError(f"a daemon is already listening on {self.socket_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server_close()
+
+    def serve_forever(self):
+        """
+        Handles requests until `shutdown` is called.
+        """
+        self._running = True
+        while self._running:
+            for key, events in self._selector.select():
+                if key.fileobj is self._listener:
+                    self._accept()
+                elif key.fileobj is self._wakeup_reader:
+                    self._wakeup_reader.recv(64)
+                else:
+                    connection = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(connection)
+                    if (events & selectors.EVENT_WRITE
+                            and connection.socket.fileno() >= 0):
+                        self._write(connection)
+
+    def shutdown(self):
+        """
+        Stops serve_forever; safe to call from another thread or a signal
+        handler.
+        """
+        self._running = False
+        self._wakeup_writer.send(b"\0")
+
+    def server_close(self):
+        for connection in list(self._connections.values()):
+            self._close(connection)
+        self._selector.close()
+        self._listener.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        connection = _Connection(sock)
+        self._connections[sock.fileno()] = connection
+        self._selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _close(self, connection: _Connection):
+        self._connections.pop(connection.socket.fileno(), None)
+        self._selector.unregister(connection.socket)
+        connection.socket.close()
+
+    def _read(self, connection: _Connection):
+        try:
+            data = connection.socket.recv(1 << 16)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(connection)
+            return
+        received = connection.received
+        received += data
+
+        # Every complete request is answered before the socket is read
+        # again, so pipelined requests are handled in the order sent.
+        offset = 0
+        while len(received) - offset >= FRAME.size:
+            length, request_id, code = FRAME.unpack_from(received, offset)
+            if length > MAX_PAYLOAD:
+                self._close(connection)
+                return
+            end = offset + FRAME.size + length
+            if len(received) < end:
+                break
+            connection.outgoing += self._respond(
+                request_id, code, received[offset + FRAME.size:end]
+            )
+            offset = end
+        del received[:offset]
+        if connection.outgoing:
+            self._write(connection)
+
+    def _write(self, connection: _Connection):
+        try:
+            sent = connection.socket.send(connection.outgoing)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._close(connection)
+            return
+        del connection.outgoing[:sent]
+        events = selectors.EVENT_READ
+        if connection.outgoing:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(connection.socket, events, connection)
+
+    def _respond(self, request_id: int, code: int, payload) -> bytes:
+        try:
+            if code >= len(OPS):
+                raise ValueError(f"unknown operation {code}")
+            args = json.loads(bytes(payload).decode("utf-8"))
+            result = getattr(self, f"op_{OPS[code]}")(*args)
+        except Exception as e:
+            return encode_frame(request_id, ERROR, f"{type(e).__name__}: {e}")
+        return encode_frame(request_id, OK, result)
+
+    def op_ping(self):
+        return "pong"
+
+    def op_load_users(self):
+        # Passwords never leave the daemon, see op_check_password.
+        return {
+            login: {key: value for key, value in user.items()
+                    if key != "password"}
+            for login, user in self.user_manager.load_user_data().items()
+        }
+
+    def op_save_users(self, data: Dict):
+        # Users come back without their passwords: the stored ones are kept.
+        stored = self.user_manager.load_user_data()
+        for login, user in data.items():
+            if "password" not in user and "password" in stored.get(login, {}):
+                user["password"] = stored[login]["password"]
+        # The results may have changed in any way: the indexes are rebuilt.
+        self.user_manager.save_user_data(data)
+        self.leaderboard_index.rebuild(data)
+        self.percentile_index.rebuild(data)
+
+    def op_has_user(self, login: str) -> bool:
+        return login in self.user_manager.load_user_data()
+
+    def op_add_user(self, login: str, password: str, birth_date: str) -> bool:
+        users = self.user_manager.load_user_data()
+        if login in users:
+            return False
+        users[login] = {
+            "password": password,
+            "birth_date": birth_date,
+            "quiz_results": {}
+        }
+        self.result_manager._save_and_index(users, [])
+        return True
+
+    def op_check_password(self, login: str, password: str) -> bool:
+        user = self.user_manager.load_user_data().get(login)
+        return user is not None and user["password"] == password
+
+    def op_update_user(self, login: str, password: str,
+                       birth_date: str) -> bool:
+        users = self.user_manager.load_user_data()
+        if login not in users:
+            return False
+        users[login]["password"] = password
+        users[login]["birth_date"] = birth_date
+        self.result_manager._save_and_index(users, [])
+        return True
+
+    def op_save_result(self, login: str, category: str, score: int):
+        self.result_manager.save_quiz_result(login, category, score)
+
+    def op_save_results(self, results: List) -> int:
+        return self.result_manager.save_quiz_results(results)
+
+    def op_user_results(self, login: str) -> Dict:
+        return self.result_manager.get_user_results(login)
+
+    def op_top_20(self, category: str) -> List:
+        return self.result_manager.get_top_20(category)
+
+    def op_percentile(self, category: str, score: int,
+                      window: str = None) -> Optional[float]:
+        return self.result_manager.get_percentile(category, score, window)
+
+
+class DaemonClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET,
+                 timeout: float = 10):
+        """
+        Initializes a client of a CacheDaemon; the connection is opened on
+        the first request and again after it broke. A request that cannot
+        be sent on a broken connection (e.g. after the daemon restarted)
+        is sent again on a new one; requests that were sent but not
+        answered when the connection broke raise LostRequestError from
+        `wait`.
+
+        `call` sends a request and waits for its response. `send` only
+        sends it and returns its id, so several requests can be in flight
+        on the connection; `wait` returns the response of one of them, and
+        `pipeline` sends a batch and waits for all of it, with a single
+        round trip.
+
+        Args:
+            socket_path (str): The daemon's socket.
+            timeout (float): Seconds to wait for the daemon.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._buffer = bytearray()
+        self._next_id = 0
+        self._in_flight: List[int] = []
+        self._lost = set()
+        self._responses: Dict[int, Tuple[int, object]] = {}
+
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._socket = sock
+        return self._socket
+
+    def close(self):
+        """
+        Closes the connection. Responses already received can still be
+        waited for; requests still in flight are lost.
+        """
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        self._buffer.clear()
+        self._lost.update(self._in_flight)
+        self._in_flight.clear()
+
+    def _frame(self, op: str, args) -> Tuple[int, bytes]:
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        return request_id, encode_frame(request_id, _OP_CODES[op], list(args))
+
+    def _send_frames(self, frames: List[Tuple[int, bytes]]):
+        data = b"".join(frame for _, frame in frames)
+        while True:
+            reconnecting = self._socket is not None
+            try:
+                self._connect().sendall(data)
+                break
+            except OSError:
+                self.close()
+                # A daemon only handles complete frames, so the requests
+                # were not carried out; a new connection gets them once.
+                if not reconnecting:
+                    raise
+        self._in_flight.extend(request_id for request_id, _ in frames)
+
+    def send(self, op: str, *args) -> int:
+        """
+        Sends a request without waiting for the response.
+
+        Returns:
+            int: The request id, to pass to `wait`.
+        """
+        request_id, frame = self._frame(op, args)
+        self._send_frames([(request_id, frame)])
+        return request_id
+
+    def _receive(self):
+        sock = self._connect()
+        while True:
+            if len(self._buffer) >= FRAME.size:
+                length, request_id, status = FRAME.unpack_from(self._buffer)
+                end = FRAME.size + length
+                if len(self._buffer) >= end:
+                    result = json.loads(
+                        bytes(self._buffer[FRAME.size:end]).decode("utf-8")
+                    )
+                    del self._buffer[:end]
+                    self._in_flight.remove(request_id)
+                    self._responses[request_id] = (status, result)
+                    return
+            try:
+                data = sock.recv(1 << 16)
+            except OSError:
+                self.close()
+                raise
+            if not data:
+                self.close()
+                raise ConnectionError("the cache daemon closed the connection")
+            self._buffer += data
+
+    def wait(self, request_id: int):
+        """
+        Returns the result of a request sent with `send`.
+
+        Raises:
+            DaemonError: If the operation failed in the daemon.
+            LostRequestError: If the connection broke before the answer.
+        """
+        while request_id not in self._responses:
+            if request_id in self._lost:
+                self._lost.discard(request_id)
+                raise LostRequestError(
+                    f"the connection to the cache daemon broke before "
+                    f"request {request_id} was answered"
+                )
+            if request_id not in self._in_flight:
+                raise KeyError(f"no request {request_id} in flight")
+            try:
+                self._receive()
+            except OSError:
+                # close() marked the request lost: reported above.
+                if request_id not in self._lost:
+                    raise
+        status, result = self._responses.pop(request_id)
+        if status != OK:
+            raise DaemonError(result)
+        return result
+
+    def call(self, op: str, *args):
+        return self.wait(self.send(op, *args))
+
+    def pipeline(self, calls: Iterable[Tuple]) -> List:
+        """
+        Sends (op, *args) requests together and returns their results.
+        """
+        frames = [self._frame(op, args) for op, *args in calls]
+        self._send_frames(frames)
+        return [self.wait(request_id) for request_id, _ in frames]
+
+
+class FileFallback:
+    def __init__(self):
+        """
+        The file-backed managers that daemon-served managers switch to
+        when the daemon stops answering in the middle of a session; they
+        are created on the first switch and shared by the managers of one
+        connection (see `connect`), so they keep using the same files.
+        """
+        self.user_manager: Optional[UserManager] = None
+        self.result_manager: Optional[QuizResultManager] = None
+
+    @property
+    def active(self) -> bool:
+        return self.user_manager is not None
+
+    def switch(self, error: Exception):
+        if self.active:
+            return
+        print(f"{Fore.RED}"
+              f"Демон кешу недоступний ({error}), працюємо з "
+              f"{UserManager.USER_DATA_FILE}."
+              f"{Style.RESET_ALL}")
+        self.user_manager = UserManager()
+        self.result_manager = QuizResultManager(self.user_manager)
+
+
+def _falls_back_to_file(method):
+    """
+    Runs a daemon-served manager method, or the same method of the
+    manager's file-backed fallback once the daemon stopped answering.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if not self.fallback.active:
+            try:
+                return method(self, *args)
+            except OSError as e:
+                self.fallback.switch(e)
+        return getattr(self._file_manager(), method.__name__)(*args)
+    return wrapper
+
+
+class DaemonUserManager(IUserManager):
+    def __init__(self, client: DaemonClient,
+                 fallback: Optional[FileFallback] = None):
+        """
+        An IUserManager served by a CacheDaemon. The prompts are the same
+        as UserManager's; only the lookups and writes go to the daemon,
+        which never sends a password back: `load_user_data` returns the
+        users without them, and `save_user_data` keeps the stored ones of
+        users saved without a password.
+
+        If the daemon stops answering, the manager switches to a
+        UserManager on users.json for the rest of the session; a prompt
+        the daemon failed in is asked again.
+        """
+        self.client = client
+        self.fallback = fallback or FileFallback()
+
+    def _file_manager(self) -> UserManager:
+        return self.fallback.user_manager
+
+    def _call(self, op: str, *args):
+        try:
+            return self.client.call(op, *args)
+        except LostRequestError as e:
+            # Every user operation can be done again on the file: a lost
+            # registration is then only reported as a taken login.
+            raise ConnectionError(str(e)) from e
+
+    @_falls_back_to_file
+    def load_user_data(self):
+        return self._call("load_users")
+
+    @_falls_back_to_file
+    def save_user_data(self, data):
+        self._call("save_users", data)
+
+    @_falls_back_to_file
+    def register_user(self):
+        print("\nРеєстрація")
+        login = input(f"{Fore.YELLOW}Введіть логін:{Style.RESET_ALL}")
+        if self._call("has_user", login):
+            print(
+                f"{Fore.LIGHTRED_EX}Логін вже існує. Спробуйте інший."
+                f"{Style.RESET_ALL}"
+            )
+            return None
+
+        password = input(
+            f"{Fore.YELLOW}"
+            f"Введіть пароль: "
+            f"{Style.RESET_ALL}"
+        )
+        birth_date = input(
+            f"{Fore.YELLOW}"
+            f"Введіть дату народження (у форматі РРРР-ММ-ДД): "
+            f"{Style.RESET_ALL}"
+        )
+        # Someone may have taken the login while the prompts were open.
+        if not self._call("add_user", login, password, birth_date):
+            print(
+                f"{Fore.LIGHTRED_EX}Логін вже існує. Спробуйте інший."
+                f"{Style.RESET_ALL}"
+            )
+            return None
+        print(f"{Fore.GREEN}"
+              f"Реєстрація успішна!"
+              f"{Style.RESET_ALL}")
+        return login
+
+    @_falls_back_to_file
+    def login_user(self):
+        print(
+            f"{Fore.BLUE}"
+            f"\nВхід"
+            f"{Style.RESET_ALL}"
+        )
+        login = input(
+            f"{Fore.YELLOW}"
+            f"Введіть логін: "
+            f"{Style.RESET_ALL}"
+        )
+        if not self._call("has_user", login):
+            print(
+                f"{Fore.LIGHTRED_EX}"
+                f"Користувач не знайдений. Спершу зареєструйтесь."
+                f"{Style.RESET_ALL}"
+            )
+            return None
+
+        password = input(
+            f"{Fore.YELLOW}"
+            f"Введіть пароль: "
+            f"{Style.RESET_ALL}"
+        )
+        if self._call("check_password", login, password):
+            print(f"{Fore.BLUE}"
+                  f"Ласкаво просимо, {login}!"
+                  f"{Style.RESET_ALL}")
+            return login
+        print(f"{Fore.RED}Невірний пароль.{Style.RESET_ALL}")
+        return None
+
+    @_falls_back_to_file
+    def update_user_settings(self, login, new_password, new_birth_date):
+        if not self._call("update_user", login, new_password,
+                          new_birth_date):
+            print(f"{Fore.RED}"
+                  f"Користувача з таким логіном не існує."
+                  f"{Style.RESET_ALL}")
+            return
+        print(f"{Fore.GREEN}"
+              f"Налаштування успішно оновлено!"
+              f"{Style.RESET_ALL}")
+
+
+class DaemonResultManager(IQuizResultManager):
+    def __init__(self, client: DaemonClient,
+                 fallback: Optional[FileFallback] = None):
+        """
+        An IQuizResultManager served by a CacheDaemon, from its in-memory
+        leaderboard index and percentile sketches.
+
+        `save_quiz_result` does not wait for the daemon: the save is
+        pipelined with the next request (in a quiz, the percentile query),
+        which the daemon answers after the save, so both take one round
+        trip. A failed save is raised by that next request, or by `flush`;
+        a save whose answer was lost with the connection is reported as a
+        LostRequestError, not sent again, since the daemon may already
+        have stored it.
+
+        If the daemon stops answering, the manager switches to a
+        QuizResultManager on users.json for the rest of the session, and
+        warns about the saves it had not confirmed.
+        """
+        self.client = client
+        self.fallback = fallback or FileFallback()
+        self._unconfirmed: List[int] = []
+
+    def _file_manager(self) -> QuizResultManager:
+        if self._unconfirmed:
+            try:
+                self.flush()
+            except DaemonError as e:
+                print(f"{Fore.RED}"
+                      f"Результати могли не зберегтися: {e}"
+                      f"{Style.RESET_ALL}")
+        return self.fallback.result_manager
+
+    def flush(self):
+        """
+        Waits for the saves not confirmed yet.
+
+        Raises:
+            DaemonError: If one of them failed; LostRequestError if the
+                connection broke before they were confirmed.
+        """
+        saves, self._unconfirmed = self._unconfirmed, []
+        errors = []
+        for request_id in saves:
+            try:
+                self.client.wait(request_id)
+            except DaemonError as e:
+                errors.append(e)
+        lost = [e for e in errors if isinstance(e, LostRequestError)]
+        if lost:
+            raise LostRequestError(
+                f"{len(lost)} quiz result(s) may not have been saved: "
+                f"{lost[0]}"
+            )
+        if errors:
+            raise errors[0]
+
+    def _call(self, op: str, *args):
+        request_id = self.client.send(op, *args)
+        try:
+            self.flush()
+        except DaemonError:
+            # Collect the answer anyway, so it is not left behind.
+            try:
+                self.client.wait(request_id)
+            except DaemonError:
+                pass
+            raise
+        try:
+            return self.client.wait(request_id)
+        except LostRequestError as e:
+            if op == "save_results":
+                raise
+            # A lost read is safe to answer from the file instead.
+            raise ConnectionError(str(e)) from e
+
+    @_falls_back_to_file
+    def save_quiz_result(self, login, category, score):
+        self._unconfirmed.append(
+            self.client.send("save_result", login, category, score)
+        )
+
+    @_falls_back_to_file
+    def save_quiz_results(self, results):
+        return self._call("save_results", [list(result) for result in results])
+
+    @_falls_back_to_file
+    def get_user_results(self, login):
+        return self._call("user_results", login)
+
+    @_falls_back_to_file
+    def get_top_20(self, category):
+        return [tuple(entry) for entry in self._call("top_20", category)]
+
+    @_falls_back_to_file
+    def get_percentile(self, category, score, window=None):
+        return self._call("percentile", category, score, window)
+
+
+def connect(socket_path: str = DEFAULT_SOCKET
+            ) -> Tuple[DaemonUserManager, DaemonResultManager]:
+    """
+    Connects to a running daemon and returns the two managers, sharing
+    one connection and, if the daemon stops later, one FileFallback.
+
+    Raises:
+        OSError: If no daemon answers on `socket_path`.
+    """
+    client = DaemonClient(socket_path)
+    client.call("ping")
+    fallback = FileFallback()
+    return (DaemonUserManager(client, fallback),
+            DaemonResultManager(client, fallback))
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Локальний демон кешу користувачів і таблиць лідерів."
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help=f"шлях до сокета (за замовчуванням {DEFAULT_SOCKET})")
+    parser.add_argument("--users", default=UserManager.USER_DATA_FILE,
+                        help="файл користувачів")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        daemon = CacheDaemon(args.socket, args.users)
+    except OSError as e:
+        print(f"{Fore.RED}Не вдалося запустити демон: {e}{Style.RESET_ALL}",
+              file=sys.stderr)
+        return 1
+    with daemon:
+        print(f"{Fore.GREEN}Демон кешу слухає {args.socket}{Style.RESET_ALL}")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import json
+import os
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from colorama import Fore, Style
+from answer_grading import correct_option_numbers, parse_answer
+
+CHUNK_SIZE = 5000
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The answer keys of the worker process, set once by _init_worker.
+_answer_keys: Dict[str, FrozenSet[str]] = {}
+
+
+def compile_answer_keys(questions: Iterable[Dict]) -> Dict[str, FrozenSet[str]]:
+    """
+    Compiles the answer key of every question with an id.
+
+    Returns:
+        Dict[str, FrozenSet[str]]: Correct option numbers by question id.
+    """
+    return {
+        question["id"]: correct_option_numbers(question)
+        for question in questions if question.get("id")
+    }
+
+
+def grade_submission(record: Dict, answer_keys: Dict[str, FrozenSet[str]]
+                     ) -> Tuple[int, int]:
+    """
+    Grades one answer sheet.
+
+    Args:
+        record (Dict): The sheet with `question_ids` (strings) and
+            `answers` (strings or numbers) lists of equal length, and an
+            optional `date` in DATE_FORMAT.
+        answer_keys: Compiled answer keys, see compile_answer_keys.
+
+    Returns:
+        Tuple[int, int]: The score and the number of unknown question ids,
+        which count as wrong.
+
+    Raises:
+        ValueError: If the sheet is malformed.
+    """
+    question_ids = record.get("question_ids")
+    answers = record.get("answers")
+    if (not isinstance(record.get("login"), str)
+            or not isinstance(record.get("category"), str)):
+        raise ValueError("не вказано логін або категорію")
+    if (not isinstance(question_ids, list) or not isinstance(answers, list)
+            or len(question_ids) != len(answers)):
+        raise ValueError("кількість відповідей не збігається з кількістю питань")
+    if (not all(isinstance(question_id, str) for question_id in question_ids)
+            or not all(isinstance(answer, (str, int))
+                       and not isinstance(answer, bool) for answer in answers)):
+        raise ValueError("некоректний ідентифікатор питання або відповідь")
+    date = record.get("date")
+    if date is not None:
+        from datetime import datetime
+        try:
+            datetime.strptime(date, DATE_FORMAT)
+        except (TypeError, ValueError):
+            raise ValueError(f"некоректна дата: {date!r}") from None
+
+    score = 0
+    unknown = 0
+    for question_id, answer in zip(question_ids, answers):
+        key = answer_keys.get(question_id)
+        if key is None:
+            unknown += 1
+        elif parse_answer(str(answer)) == key:
+            score += 1
+    return score, unknown
+
+
+def grade_lines(lines: List[Tuple[int, str]],
+                answer_keys: Dict[str, FrozenSet[str]] = None) -> List[Tuple]:
+    """
+    Grades a chunk of submission lines.
+
+    Returns:
+        List[Tuple]: For each line either
+        ("ok", line_number, login, category, score, date, unknown) or
+        ("error", line_number, message).
+    """
+    if answer_keys is None:
+        answer_keys = _answer_keys
+    graded = []
+    for line_number, line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("запис не є об'єктом")
+            score, unknown = grade_submission(record, answer_keys)
+        except (json.JSONDecodeError, ValueError) as e:
+            message = "некоректний JSON" if isinstance(
+                e, json.JSONDecodeError) else str(e)
+            graded.append(("error", line_number, message))
+            continue
+        graded.append(("ok", line_number, record["login"], record["category"],
+                       score, record.get("date"), unknown))
+    return graded
+
+
+def _init_worker(answer_keys):
+    global _answer_keys
+    _answer_keys = answer_keys
+
+
+def iter_chunks(file_path: str, chunk_size: int = CHUNK_SIZE
+                ) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Reads a JSONL file in chunks of (line number, line), skipping blank
+    lines.
+    """
+    chunk = []
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if line.strip():
+                chunk.append((line_number, line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade_file(file_path: str, answer_keys: Dict[str, FrozenSet[str]],
+               workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+               ) -> Iterator[Tuple]:
+    """
+    Grades a submissions file, yielding the graded lines in file order.
+
+    With more than one worker the chunks are graded in a process pool.
+    The answer keys are sent to each worker once, by the pool
+    initializer, instead of with every chunk. At most two chunks per
+    worker are in flight, so the file is streamed and never held whole.
+
+    Args:
+        file_path (str): The JSONL submissions file.
+        answer_keys: Compiled answer keys, see compile_answer_keys.
+        workers (int, optional): The number of worker processes. Defaults
+            to the number of CPUs; 1 grades in this process.
+        chunk_size (int): Lines per task.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(file_path, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from grade_lines(chunk, answer_keys)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(answer_keys,)
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(grade_lines, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def grade_exam(result_manager, submissions_path: str, questions: List[Dict],
+               workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+               dry_run: bool = False) -> Dict:
+    """
+    Grades a submissions file and saves the scores with a single batched
+    write through `result_manager.save_quiz_results`.
+
+    Each line of the file is a JSON object with `login`, `category`,
+    `question_ids` and `answers` (e.g. "2" or "1,3", as entered in the
+    quiz), and optionally the `date` of the exam.
+
+    Args:
+        result_manager (IQuizResultManager): Where to save the scores.
+        submissions_path (str): The JSONL submissions file.
+        questions (List[Dict]): The question bank, with ids.
+        workers (int, optional): Worker processes, see grade_file.
+        chunk_size (int): Lines per task.
+        dry_run (bool): Grade without saving.
+
+    Returns:
+        Dict: A report with the number of graded, saved and invalid sheets,
+        unknown question ids and the first errors.
+    """
+    answer_keys = compile_answer_keys(questions)
+    report = {"graded": 0, "saved": 0, "invalid": 0,
+              "unknown_questions": 0, "errors": []}
+    results = []
+    for graded in grade_file(submissions_path, answer_keys, workers,
+                             chunk_size):
+        if graded[0] == "error":
+            report["invalid"] += 1
+            if len(report["errors"]) < 20:
+                report["errors"].append(f"рядок {graded[1]}: {graded[2]}")
+            continue
+        _, _, login, category, score, date, unknown = graded
+        report["graded"] += 1
+        report["unknown_questions"] += unknown
+        results.append((login, category, score, date))
+
+    if not dry_run:
+        report["saved"] = result_manager.save_quiz_results(results)
+    return report
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Оцінює відповіді офлайн-іспиту та зберігає результати."
+    )
+    parser.add_argument("submissions", help="файл JSONL з відповідями")
+    parser.add_argument("--questions", default="questions.json",
+                        help="файл з питаннями (за замовчуванням questions.json)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="кількість процесів (за замовчуванням - усі ядра)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="лише оцінити, нічого не зберігати")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from quiz_result_manager import QuizResultManager
+    from user_manager import UserManager
+    from victorine_utility import QuizDataManager
+
+    args = parse_args(argv)
+    questions = QuizDataManager(args.questions).get_questions()
+    report = grade_exam(
+        QuizResultManager(UserManager()), args.submissions, questions,
+        args.workers, args.chunk_size, args.dry_run
+    )
+
+    print(f"{Fore.GREEN}Оцінено: {report['graded']}, "
+          f"збережено: {report['saved']}{Style.RESET_ALL}")
+    if report["graded"] > report["saved"] and not args.dry_run:
+        print(f"{Fore.YELLOW}Пропущено невідомих користувачів: "
+              f"{report['graded'] - report['saved']}{Style.RESET_ALL}")
+    if report["unknown_questions"]:
+        print(f"{Fore.YELLOW}Невідомих питань у відповідях: "
+              f"{report['unknown_questions']}{Style.RESET_ALL}")
+    if report["invalid"]:
+        print(f"{Fore.RED}Некоректних записів: {report['invalid']}"
+              f"{Style.RESET_ALL}")
+        for error in report["errors"]:
+            print(f"{Fore.RED}  {error}{Style.RESET_ALL}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import heapq
+import json
+import sys
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+from colorama import Fore, Style
+
+from quiz_result_manager import MIXED_CATEGORY, LeaderboardIndex
+
+SUMMARY_VERSION = 1
+DEFAULT_PORT = 8765
+
+
+def build_summary(index: LeaderboardIndex, node: str) -> Dict:
+    """
+    Summarizes the leaderboards of one node: for every category (and the
+    mixed one) the best `index.size` results and the number of results.
+
+    The best results of the union of several nodes are among the best
+    results of each node, so these summaries are all a merge needs; no
+    node's full history is ever sent or re-read.
+
+    Args:
+        index (LeaderboardIndex): The node's leaderboard index.
+        node (str): The node name, recorded with every result.
+
+    Returns:
+        Dict: The summary, JSON-serializable.
+    """
+    return {
+        "version": SUMMARY_VERSION,
+        "nodes": [node],
+        "size": index.size,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "categories": {
+            category: {
+                "count": index.count(category),
+                "top": [[login, score, date, node]
+                        for login, score, date in index.top(category)],
+            }
+            for category in index.categories()
+        },
+    }
+
+
+def export_summary(result_manager, node: str) -> Dict:
+    """
+    Summarizes the leaderboards of a QuizResultManager, using its
+    leaderboard index (see QuizResultManager.get_leaderboard_index).
+    """
+    return build_summary(result_manager.get_leaderboard_index(), node)
+
+
+def merge_summaries(summaries: Iterable[Dict], size: int = 20) -> Dict:
+    """
+    Combines node summaries into one summary of the same form, so merged
+    summaries can be merged again (e.g. per region, then globally).
+
+    Each category's top lists are already sorted, so they are merged
+    lazily and only the first `size` entries are taken: the work is
+    O(nodes * K) per category. Equal scores keep the order of the
+    summaries, then the order within each node.
+
+    Raises:
+        ValueError: If a summary has an unknown version.
+    """
+    summaries = list(summaries)
+    for summary in summaries:
+        if summary.get("version") != SUMMARY_VERSION:
+            raise ValueError("unsupported leaderboard summary version")
+
+    categories = sorted({
+        category for summary in summaries for category in summary["categories"]
+    })
+    merged = {}
+    for category in categories:
+        parts = [summary["categories"][category] for summary in summaries
+                 if category in summary["categories"]]
+        ordered = heapq.merge(
+            *([(-entry[1], node, position, entry)
+               for position, entry in enumerate(part["top"])]
+              for node, part in enumerate(parts))
+        )
+        merged[category] = {
+            "count": sum(part["count"] for part in parts),
+            "top": [entry for _, _, _, entry in islice(ordered, size)],
+        }
+    return {
+        "version": SUMMARY_VERSION,
+        "nodes": [node for summary in summaries for node in summary["nodes"]],
+        "size": size,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "categories": merged,
+    }
+
+
+def top(summary: Dict, category: str, limit: int = 20
+        ) -> List[Tuple[str, int, str]]:
+    """
+    Returns the best results of a category from a (merged) summary, as
+    (login, score, date) tuples like QuizResultManager.get_top_20.
+    """
+    entries = summary["categories"].get(category, {}).get("top", [])
+    return [(login, score, date) for login, score, date, _ in entries[:limit]]
+
+
+def load_summary(source: str) -> Dict:
+    """
+    Reads a summary from a file or from a node serving it (an http:// URL,
+    see `serve`).
+    """
+    if source.startswith(("http://", "https://")):
+        from urllib.request import urlopen
+
+        with urlopen(source, timeout=10) as response:
+            return json.load(response)
+    with open(source, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_summary(summary: Dict, file_path: str):
+    from victorine_utility import write_json_atomic
+
+    write_json_atomic(file_path, summary)
+
+
+def serve(result_manager, node: str, port: int = DEFAULT_PORT,
+          host: str = "127.0.0.1"):
+    """
+    Serves the node's current summary at http://host:port/summary until
+    interrupted. The summary is built from the leaderboard index on every
+    request, so it is as fresh as the node's users.json.
+    """
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/summary":
+                self.send_error(404)
+                return
+            body = json.dumps(export_summary(result_manager, node),
+                              ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with HTTPServer((host, port), Handler) as server:
+        print(f"{Fore.GREEN}Підсумок лідерів: "
+              f"http://{host}:{server.server_port}/summary{Style.RESET_ALL}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def parse_args(argv=None):
+    import argparse
+    import socket
+
+    parser = argparse.ArgumentParser(
+        description="Підсумки таблиць лідерів вузлів та їх об'єднання."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="підсумок цього вузла у файл")
+    export.add_argument("--node", default=socket.gethostname())
+    export.add_argument("-o", "--output", default="leaderboard_summary.json")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="віддавати підсумок вузла через localhost"
+    )
+    serve_parser.add_argument("--node", default=socket.gethostname())
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    merge = subparsers.add_parser("merge", help="об'єднати підсумки вузлів")
+    merge.add_argument("sources", nargs="+", help="файли або http:// адреси")
+    merge.add_argument("--size", type=int, default=20)
+    merge.add_argument("-o", "--output", default="leaderboard_global.json")
+
+    show = subparsers.add_parser("top", help="показати топ з підсумку")
+    show.add_argument("summary", help="файл або http:// адреса")
+    show.add_argument("--category", default=MIXED_CATEGORY)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command in ("export", "serve"):
+        from quiz_result_manager import QuizResultManager
+        from user_manager import UserManager
+
+        user_manager = UserManager()
+        result_manager = QuizResultManager(
+            user_manager, LeaderboardIndex(UserManager.USER_DATA_FILE)
+        )
+        if args.command == "serve":
+            serve(result_manager, args.node, args.port)
+            return 0
+        write_summary(export_summary(result_manager, args.node), args.output)
+        print(f"{Fore.GREEN}Підсумок записано у {args.output}{Style.RESET_ALL}")
+        return 0
+
+    try:
+        if args.command == "merge":
+            summary = merge_summaries(
+                (load_summary(source) for source in args.sources), args.size
+            )
+            write_summary(summary, args.output)
+            print(f"{Fore.GREEN}Об'єднано вузлів: {len(summary['nodes'])}, "
+                  f"записано у {args.output}{Style.RESET_ALL}")
+            return 0
+
+        summary = load_summary(args.summary)
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Не вдалося прочитати підсумок: {e}{Style.RESET_ALL}",
+              file=sys.stderr)
+        return 1
+    for place, (login, score, date) in enumerate(top(summary, args.category), 1):
+        print(f"{place:>2}. {login:<20} {score:>4}  {date}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
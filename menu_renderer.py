@@ -0,0 +1,149 @@
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Sequence, Tuple
+from colorama import Style
+import metrics
+
+MENU_CACHE_SIZE = 32
+
+
+class IMenuRenderer(ABC):
+    def __init__(self):
+        self._menu_cache = OrderedDict()
+
+    @abstractmethod
+    def render_table(self, title: str, columns: Sequence[str],
+                     rows: Sequence[Sequence[str]]) -> str:
+        """
+        Renders a table to a string ready to be written to the terminal.
+
+        Args:
+            title (str): The table title.
+            columns (Sequence[str]): Column headers; empty headers are
+                not shown.
+            rows (Sequence[Sequence[str]]): The table rows.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, text: str):
+        """
+        Writes rendered text to the terminal.
+        """
+        pass
+
+    def _cache_key(self, title, rows):
+        return title, rows
+
+    def render_menu(self, title: str, rows: Sequence[Tuple[str, str]]) -> str:
+        """
+        Renders a menu of (option, description) rows.
+
+        Menus only change when their content does, so the rendered text is
+        cached by content and reused on every later display.
+        """
+        rows = tuple(tuple(row) for row in rows)
+        key = self._cache_key(title, rows)
+        text = self._menu_cache.get(key)
+        if text is None:
+            text = self.render_table(title, ("", ""), rows)
+            self._menu_cache[key] = text
+            if len(self._menu_cache) > MENU_CACHE_SIZE:
+                self._menu_cache.popitem(last=False)
+        else:
+            self._menu_cache.move_to_end(key)
+        return text
+
+    def print_menu(self, title: str, rows: Sequence[Tuple[str, str]]):
+        with metrics.span("menu_render"):
+            text = self.render_menu(title, rows)
+        with metrics.span("terminal_write"):
+            self.write(text)
+
+    def print_table(self, title: str, columns: Sequence[str],
+                    rows: Sequence[Sequence[str]]):
+        with metrics.span("table_render"):
+            text = self.render_table(title, columns, rows)
+        with metrics.span("terminal_write"):
+            self.write(text)
+
+
+class RichMenuRenderer(IMenuRenderer):
+    def __init__(self, console=None):
+        """
+        Initializes a renderer drawing rich tables.
+
+        Args:
+            console (Console, optional): The rich Console to render with.
+                Defaults to a new Console.
+        """
+        super().__init__()
+        if console is None:
+            from rich.console import Console
+            console = Console()
+        self.console = console
+
+    def _cache_key(self, title, rows):
+        # The rendered text depends on the terminal width and colour support.
+        return (title, rows, self.console.width, self.console.color_system)
+
+    def render_table(self, title, columns, rows):
+        from rich.table import Table
+
+        table = Table(title=title)
+        for column in columns:
+            if column:
+                table.add_column(column, justify="center")
+            else:
+                table.add_column()
+        for row in rows:
+            table.add_row(*row)
+
+        with self.console.capture() as capture:
+            self.console.print(table)
+        return capture.get()
+
+    def write(self, text):
+        file = self.console.file
+        file.write(text)
+        file.flush()
+
+
+class PlainMenuRenderer(IMenuRenderer):
+    def __init__(self, file=None):
+        """
+        Initializes a renderer producing plain text with a bold title and
+        space-aligned columns. It needs no box drawing or cursor control and
+        writes a fraction of the bytes of a rich table, which helps on slow
+        or high-latency terminals. rich is not imported at all.
+
+        Args:
+            file: The stream to write to. Defaults to sys.stdout at the
+                time of writing.
+        """
+        super().__init__()
+        self.file = file
+
+    def render_table(self, title, columns, rows):
+        lines = [f"{Style.BRIGHT}{title}{Style.RESET_ALL}"]
+        table = list(rows)
+        if any(columns):
+            table.insert(0, columns)
+
+        widths = [
+            max((len(row[i]) for row in table if i < len(row)), default=0)
+            for i in range(len(columns))
+        ]
+        for row_number, row in enumerate(table):
+            cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+            line = "  " + "  ".join(cells).rstrip()
+            if row_number == 0 and any(columns):
+                line = f"{Style.BRIGHT}{line}{Style.RESET_ALL}"
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+
+    def write(self, text):
+        file = self.file if self.file is not None else sys.stdout
+        file.write(text)
+        file.flush()
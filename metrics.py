@@ -0,0 +1,211 @@
+import _thread
+import functools
+import json
+import time
+from bisect import bisect_left
+from typing import Dict
+
+# Upper bounds of the latency buckets, in seconds.
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, float("inf"),
+)
+PREFIX = "quiz_"
+
+_enabled = False
+_lock = _thread.allocate_lock()
+_histograms: Dict[str, "Histogram"] = {}
+
+
+class Histogram:
+    def __init__(self, name: str):
+        """
+        Initializes a latency histogram with the fixed BUCKETS.
+
+        Args:
+            name (str): The metric name, without prefix and unit.
+        """
+        self.name = name
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def to_dict(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+def enable():
+    """
+    Starts collecting metrics. Collection is off by default; while it is
+    off, timed functions only check a flag and spans do nothing.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """
+    Drops every collected metric.
+    """
+    with _lock:
+        _histograms.clear()
+
+
+def observe(name: str, seconds: float):
+    """
+    Records one duration of `name`, if collection is enabled.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram(name)
+        histogram.observe(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """
+    Returns a context manager timing its block as `name`:
+
+        with metrics.span("menu_render"):
+            ...
+    """
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(name: str):
+    """
+    Decorates a function so every call is timed as `name`. Calls raising
+    an exception are timed as well.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def snapshot() -> Dict[str, Dict]:
+    """
+    Returns the collected histograms as plain dicts keyed by name.
+    """
+    with _lock:
+        return {name: _histograms[name].to_dict() for name in sorted(_histograms)}
+
+
+def format_prometheus() -> str:
+    """
+    Formats the collected histograms in the Prometheus text format.
+    """
+    lines = []
+    for name, data in snapshot().items():
+        metric = f"{PREFIX}{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in data["buckets"].items():
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+        lines.append(f"{metric}_sum {data['sum']}")
+        lines.append(f"{metric}_count {data['count']}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def format_json() -> str:
+    return json.dumps(snapshot(), indent=4)
+
+
+def dump(file_path: str):
+    """
+    Writes the collected metrics to `file_path`, as JSON if the name ends
+    with .json and in the Prometheus text format otherwise.
+    """
+    text = format_json() if file_path.endswith(".json") else format_prometheus()
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def dump_on_exit(file_path: str):
+    """
+    Enables collection and writes the metrics to `file_path` when the
+    process exits and, on POSIX, whenever it receives SIGUSR1.
+
+    The signal handler only wakes a dumper thread through a pipe: dumping
+    in the handler itself would deadlock if the signal arrived while the
+    interrupted code held the metrics lock.
+    """
+    import atexit
+    import os
+    import signal
+    import threading
+
+    enable()
+    atexit.register(dump, file_path)
+    if hasattr(signal, "SIGUSR1") and (
+            threading.current_thread() is threading.main_thread()):
+        reader, writer = os.pipe()
+        os.set_blocking(writer, False)
+
+        def dump_when_signalled():
+            while os.read(reader, 1):
+                dump(file_path)
+
+        def request_dump(signum, frame):
+            try:
+                os.write(writer, b"\0")
+            except BlockingIOError:
+                pass  # Enough dumps are pending already.
+
+        threading.Thread(target=dump_when_signalled, name="metrics-dump",
+                         daemon=True).start()
+        signal.signal(signal.SIGUSR1, request_dump)
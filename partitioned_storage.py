@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, List
+from colorama import Fore, Style
+import metrics
+from question_ids import assign_question_ids
+from quiz_loader import IQuizLoader
+from victorine_utility import (
+    IQuizDataManager, QuizDataManager, write_json_atomic
+)
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _group_by_category(questions: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Groups questions by category, keeping the order in which categories
+    first appear and the order of questions within each category.
+    """
+    groups = {}
+    for question in questions:
+        groups.setdefault(question["category"], []).append(question)
+    return groups
+
+
+def _partition_digest(questions: List[Dict]) -> str:
+    """
+    Returns a digest of a partition's content, used to skip rewriting
+    partitions that did not change.
+    """
+    payload = json.dumps(questions, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class PartitionedQuizDataManager(IQuizDataManager):
+    def __init__(self, directory="questions"):
+        """
+        Initializes a PartitionedQuizDataManager instance.
+
+        Questions are stored as one JSON file per category inside
+        `directory`, plus a `manifest.json` that lists the partitions
+        with their file name, question count and content digest.
+
+        Args:
+            directory (str): The directory holding the partitions.
+                Defaults to 'questions'.
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    def load_manifest(self):
+        """
+        Reads the manifest of the partitioned store.
+
+        Returns:
+            dict: The manifest. An empty manifest is returned if the
+            store does not exist yet.
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {"version": 1, "partitions": []}
+
+    def _read_partition(self, entry):
+        path = os.path.join(self.directory, entry["file"])
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)["questions"]
+
+    def get_categories(self):
+        """
+        Returns the categories of the store in manifest order, without
+        reading any partition. If the manifest is damaged, an empty list is
+        returned.
+        """
+        try:
+            return [
+                entry["category"]
+                for entry in self.load_manifest()["partitions"]
+            ]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            print("Помилка при читанні файлу.")
+            return []
+
+    @metrics.timed("question_data_load")
+    def get_questions(self):
+        """
+        Reads the questions of every partition. Reading never writes; see
+        `QuizDataManager.get_questions`.
+
+        Returns:
+            list: All questions, grouped by category in manifest order.
+            If the store is missing or damaged, an empty list is returned.
+        """
+        try:
+            questions = []
+            for entry in self.load_manifest()["partitions"]:
+                questions.extend(self._read_partition(entry))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            print("Помилка при читанні файлу.")
+            return []
+        return questions
+
+    def get_category_questions(self, category):
+        """
+        Reads the questions of a single category from its partition only.
+
+        Args:
+            category (str): The category to read.
+
+        Returns:
+            list: The questions of the category, or an empty list if the
+            category does not exist or the store is damaged.
+        """
+        try:
+            for entry in self.load_manifest()["partitions"]:
+                if entry["category"] == category:
+                    return self._read_partition(entry)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            print("Помилка при читанні файлу.")
+        return []
+
+    @metrics.timed("question_data_save")
+    def save_questions(self, questions):
+        """
+        Writes the questions to the partitioned store, giving an id to the
+        questions without one (see `assign_question_ids`).
+
+        Only partitions whose content differs from the manifest digest are
+        rewritten; partitions of categories that no longer have questions
+        are removed. The manifest is replaced last, after all partition
+        files are in place.
+
+        Args:
+            questions (list): The full list of questions to store.
+        """
+        assign_question_ids(questions)
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self.load_manifest()
+        existing = {
+            entry["category"]: entry for entry in manifest["partitions"]
+        }
+        next_number = 1 + max(
+            (int(entry["file"].split(".")[0])
+             for entry in manifest["partitions"]),
+            default=0
+        )
+
+        partitions = []
+        for category, category_questions in _group_by_category(
+                questions).items():
+            digest = _partition_digest(category_questions)
+            entry = existing.pop(category, None)
+            if entry is None:
+                entry = {"category": category,
+                         "file": f"{next_number:04d}.json"}
+                next_number += 1
+            elif entry.get("sha1") == digest:
+                partitions.append(entry)
+                continue
+
+            write_json_atomic(
+                os.path.join(self.directory, entry["file"]),
+                {"category": category, "questions": category_questions}
+            )
+            partitions.append(dict(
+                entry, count=len(category_questions), sha1=digest
+            ))
+
+        new_manifest = {"version": 1, "partitions": partitions}
+        if new_manifest != manifest:
+            write_json_atomic(self.manifest_path, new_manifest)
+
+        for entry in existing.values():
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+
+    @metrics.timed("question_data_save")
+    def append_questions(self, questions):
+        """
+        Adds questions to the store, rewriting only the partitions of
+        their categories and the manifest.
+
+        Args:
+            questions (list): The questions to add, with unique ids.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self.load_manifest()
+        partitions = manifest["partitions"]
+        entries = {entry["category"]: entry for entry in partitions}
+        next_number = 1 + max(
+            (int(entry["file"].split(".")[0]) for entry in partitions),
+            default=0
+        )
+
+        for category, added in _group_by_category(questions).items():
+            entry = entries.get(category)
+            if entry is None:
+                entry = {"category": category,
+                         "file": f"{next_number:04d}.json"}
+                next_number += 1
+                partitions.append(entry)
+                category_questions = added
+            else:
+                category_questions = self._read_partition(entry) + added
+            write_json_atomic(
+                os.path.join(self.directory, entry["file"]),
+                {"category": category, "questions": category_questions}
+            )
+            entry.update(count=len(category_questions),
+                         sha1=_partition_digest(category_questions))
+
+        write_json_atomic(self.manifest_path, manifest)
+
+
+class PartitionedQuizLoader(IQuizLoader):
+    def __init__(self, directory="questions"):
+        """
+        Initializes a PartitionedQuizLoader reading the store written by
+        PartitionedQuizDataManager.
+
+        Args:
+            directory (str): The directory holding the partitions.
+                Defaults to 'questions'.
+        """
+        self.data_manager = PartitionedQuizDataManager(directory)
+
+    @metrics.timed("questions_load")
+    def load_questions(self) -> List[Dict]:
+        """
+        Loads the questions of every partition.
+
+        If the store is not found, returns an empty list and prints a message.
+
+        Returns:
+            List[Dict]: List of questions.
+        """
+        if not os.path.exists(self.data_manager.manifest_path):
+            print(
+                f"{Fore.RED}Файл з запитаннями не знайдено!{Style.RESET_ALL}"
+            )
+            return []
+        return self.data_manager.get_questions()
+
+    def load_category_questions(self, category: str) -> List[Dict]:
+        """
+        Loads the questions of a single category, reading only its partition.
+
+        Args:
+            category (str): The category to load.
+
+        Returns:
+            List[Dict]: List of questions in the category.
+        """
+        return self.data_manager.get_category_questions(category)
+
+    def load_categories(self) -> List[str]:
+        """
+        Lists the categories from the manifest, without reading any
+        partition.
+        """
+        return self.data_manager.get_categories()
+
+
+def convert_questions_file(source="questions.json", directory="questions"):
+    """
+    Converts a single-file question bank into the partitioned layout.
+
+    Args:
+        source (str): The path to the existing questions file.
+        directory (str): The directory to write the partitions to.
+
+    Returns:
+        int: The number of converted questions.
+    """
+    questions = QuizDataManager(source).get_questions()
+    PartitionedQuizDataManager(directory).save_questions(questions)
+    return len(questions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Розбиває файл з питаннями на окремі файли за категоріями."
+    )
+    parser.add_argument("source", nargs="?", default="questions.json")
+    parser.add_argument("directory", nargs="?", default="questions")
+    args = parser.parse_args()
+    count = convert_questions_file(args.source, args.directory)
+    print(f"Перенесено {count} питань до {args.directory}.")
@@ -0,0 +1,190 @@
+import builtins
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from typing import List, Tuple
+
+PHASE_RE = re.compile(r"^\[(?P<name>[\w-]+)\]$")
+EMPTY_ANSWER = "<enter>"
+FIRST_PHASE = "startup"
+
+
+class ScriptExhausted(EOFError):
+    """
+    Raised when the application asks for more input than the script has.
+    """
+
+
+def parse_script(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Parses a replay script into phases of answers.
+
+    Every line is one answer to an input() prompt. A line like `[login]`
+    starts a new phase, `#` starts a comment line, blank lines are skipped
+    and `<enter>` stands for an empty answer. Answers before the first
+    phase header belong to the "startup" phase.
+
+    Returns:
+        List[Tuple[str, List[str]]]: (phase name, answers) pairs in order.
+    """
+    phases = [(FIRST_PHASE, [])]
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = PHASE_RE.match(line)
+        if match:
+            phases.append((match.group("name"), []))
+        else:
+            phases[-1][1].append("" if line == EMPTY_ANSWER else line)
+    return [(name, answers) for name, answers in phases
+            if answers or name != FIRST_PHASE]
+
+
+class PhaseProfiler:
+    def __init__(self, output_dir: str = "profile", top: int = 25):
+        """
+        Initializes a profiler that profiles each phase separately.
+
+        For every phase it writes `NN-<phase>.prof` (cProfile data, for
+        pstats or snakeviz) and `NN-<phase>.txt` with the functions with
+        the highest cumulative time and the allocations that grew most
+        during the phase according to tracemalloc. `summary.txt` lists the
+        wall time and memory growth of every phase.
+
+        Args:
+            output_dir (str): The directory for the reports.
+            top (int): The number of entries in each report.
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.phase = None
+        self.number = 0
+        self.summary = []
+        self._profile = None
+        self._snapshot = None
+        self._started = 0.0
+
+    def start_phase(self, name: str):
+        """
+        Finishes the current phase, if any, and starts profiling `name`.
+        """
+        self.stop()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.number += 1
+        self.phase = name
+        self._snapshot = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self):
+        """
+        Finishes the current phase and writes its reports.
+        """
+        if self._profile is None:
+            return
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.number:02d}-{self.phase}")
+        self._profile.dump_stats(base + ".prof")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top)
+
+        differences = snapshot.compare_to(self._snapshot, "lineno")
+        growth = sum(difference.size_diff for difference in differences)
+        with open(base + ".txt", "w", encoding="utf-8") as file:
+            file.write(f"phase: {self.phase}\n")
+            file.write(f"wall time: {elapsed * 1000:.1f} ms\n")
+            file.write(f"memory growth: {growth / 1024:.1f} KiB\n\n")
+            file.write(stream.getvalue())
+            file.write(f"\nTop {self.top} allocations by growth:\n")
+            for difference in differences[:self.top]:
+                file.write(f"{difference}\n")
+
+        self.summary.append((self.phase, elapsed, growth))
+        self._profile = None
+        self._snapshot = None
+
+    def close(self):
+        """
+        Finishes the current phase, writes summary.txt and stops tracing.
+        """
+        self.stop()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if not self.summary:
+            return
+        with open(os.path.join(self.output_dir, "summary.txt"), "w",
+                  encoding="utf-8") as file:
+            file.write(f"{'phase':<20}{'ms':>10}{'KiB':>10}\n")
+            for name, elapsed, growth in self.summary:
+                file.write(f"{name:<20}{elapsed * 1000:>10.1f}"
+                           f"{growth / 1024:>10.1f}\n")
+
+
+class ScriptedReplay:
+    def __init__(self, phases: List[Tuple[str, List[str]]],
+                 profiler: PhaseProfiler = None):
+        """
+        Initializes a replay that answers input() prompts from a script.
+
+        Within the `with` block, input() returns the next scripted answer
+        and echoes it after the prompt. A phase lasts from its first answer
+        until the first answer of the next phase is requested, so the work
+        an answer triggers is profiled in that answer's phase. The work
+        before the first prompt is the "startup" phase.
+
+        Args:
+            phases: (phase name, answers) pairs, see parse_script.
+            profiler (PhaseProfiler, optional): Profiles each phase.
+        """
+        self.phases = phases
+        self.profiler = profiler
+        self._answers = [
+            (name, answer) for name, answers in phases for answer in answers
+        ]
+        self._position = 0
+        self._phase = None
+        self._original_input = None
+
+    @classmethod
+    def from_file(cls, file_path: str, profiler: PhaseProfiler = None):
+        with open(file_path, "r", encoding="utf-8") as file:
+            return cls(parse_script(file.read()), profiler)
+
+    def _input(self, prompt=""):
+        if self._position >= len(self._answers):
+            raise ScriptExhausted("the replay script has no more answers")
+        phase, answer = self._answers[self._position]
+        self._position += 1
+        if phase != self._phase:
+            self._phase = phase
+            if self.profiler is not None:
+                self.profiler.start_phase(phase)
+        print(f"{prompt}{answer}")
+        return answer
+
+    def __enter__(self):
+        self._original_input = builtins.input
+        builtins.input = self._input
+        if self.profiler is not None:
+            self._phase = FIRST_PHASE
+            self.profiler.start_phase(FIRST_PHASE)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        builtins.input = self._original_input
+        if self.profiler is not None:
+            self.profiler.close()
+        return exc_type is ScriptExhausted
@@ -0,0 +1,291 @@
+import math
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from quiz_result_manager import MIXED_CATEGORY
+from warm_start import file_fingerprint
+
+DEFAULT_K = 200
+# The part of a result's date ("%Y-%m-%d %H:%M:%S") naming its window.
+WINDOWS = {"year": 4, "month": 7, "day": 10}
+
+
+class KLLSketch:
+    def __init__(self, k: int = DEFAULT_K, seed: int = None):
+        """
+        Initializes an empty KLL quantile sketch.
+
+        The sketch keeps a sample of the values it has seen in levels of
+        compactors: a value at level h stands for 2**h values. When a level
+        is full, it is sorted and every other value (starting at a random
+        one of the first two) moves up a level. Lower levels get less room
+        than higher ones, so about 3k values are kept however many are
+        added, and ranks are off by about 1.7 / k of the count (around 1%
+        for the default k = 200).
+
+        Sketches of different shards or processes are combined with
+        `merge`, and sent between them as dicts (`to_dict`/`from_dict`).
+
+        Args:
+            k (int): The size of the top level; memory and accuracy grow
+                with it.
+            seed (int, optional): Seeds the choices of compaction, for
+                repeatable results.
+        """
+        self.k = k
+        self.count = 0
+        self.levels: List[List] = [[]]
+        self._random = random.Random(seed)
+        self._capacity_cache = None
+
+    def _capacities(self) -> List[int]:
+        if self._capacity_cache is None:
+            height = len(self.levels)
+            self._capacity_cache = [
+                max(2, int(math.ceil(self.k * (2 / 3) ** (height - level - 1))))
+                for level in range(height)
+            ]
+        return self._capacity_cache
+
+    def update(self, value):
+        """
+        Adds a value.
+        """
+        level0 = self.levels[0]
+        level0.append(value)
+        self.count += 1
+        if len(level0) >= self._capacities()[0]:
+            self._compress()
+
+    def _compress(self):
+        capacities = self._capacities()
+        while sum(map(len, self.levels)) >= sum(capacities):
+            for level, values in enumerate(self.levels):
+                if len(values) >= capacities[level]:
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                        self._capacity_cache = None
+                    values.sort()
+                    # An odd value out stays at its level.
+                    keep = values.pop() if len(values) % 2 else None
+                    offset = self._random.getrandbits(1)
+                    self.levels[level + 1].extend(values[offset::2])
+                    self.levels[level] = [] if keep is None else [keep]
+                    break
+            else:
+                return
+            capacities = self._capacities()
+
+    def merge(self, other: "KLLSketch"):
+        """
+        Adds the values summarized by another sketch.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self._capacity_cache = None
+        for level, values in enumerate(other.levels):
+            self.levels[level].extend(values)
+        self.count += other.count
+        self._compress()
+
+    def rank(self, value) -> int:
+        """
+        Returns the estimated number of values smaller than `value`.
+        """
+        rank = 0
+        for level, values in enumerate(self.levels):
+            rank += sum(1 for v in values if v < value) << level
+        return min(rank, self.count)
+
+    def quantile(self, q: float):
+        """
+        Returns an estimate of the q-quantile (0 <= q <= 1), or None for an
+        empty sketch.
+        """
+        weighted = sorted(
+            (value, 1 << level)
+            for level, values in enumerate(self.levels) for value in values
+        )
+        if not weighted:
+            return None
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "count": self.count, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [list(values) for values in data["levels"]] or [[]]
+        return sketch
+
+
+class PercentileIndex:
+    def __init__(self, source_path: str = None, k: int = DEFAULT_K,
+                 window: str = "month", windows: int = 12):
+        """
+        Initializes an empty index of score sketches.
+
+        Every category, and the mixed category covering all of them, has a
+        KLLSketch of all its scores and one per time window of the last
+        `windows` windows; older windows are dropped. Memory is therefore
+        bounded by categories * (windows + 1) * ~3k scores, independent of
+        the number of results.
+
+        Like LeaderboardIndex, the index is kept in step with the user data
+        file through its fingerprint.
+
+        Args:
+            source_path (str, optional): The user data file the index is
+                built from.
+            k (int): The accuracy parameter of the sketches.
+            window (str): The window length: "year", "month" or "day".
+            windows (int): The number of windows kept per category.
+        """
+        self.source_path = source_path
+        self.k = k
+        self.window = window
+        self.windows = windows
+        self.fingerprint = None
+        self._all: Dict[str, KLLSketch] = {}
+        self._windowed: Dict[str, "OrderedDict[str, KLLSketch]"] = {}
+
+    @classmethod
+    def from_users(cls, users: Dict, source_path: str = None, **kwargs):
+        index = cls(source_path, **kwargs)
+        index.rebuild(users)
+        return index
+
+    def rebuild(self, users: Dict, fingerprint=None):
+        """
+        Replaces the content of the index with the results in `users`.
+
+        Args:
+            users (Dict): The user data.
+            fingerprint: The fingerprint of the source file taken before
+                `users` was read. Taken now if omitted.
+        """
+        if fingerprint is None and self.source_path:
+            fingerprint = file_fingerprint(self.source_path)
+        self.fingerprint = fingerprint
+        self._all = {}
+        self._windowed = {}
+        for user, data in users.items():
+            for category, results in data.get("quiz_results", {}).items():
+                for result in results:
+                    self.add(user, category, result["score"], result["date"])
+
+    def window_of(self, date: str) -> str:
+        return date[:WINDOWS[self.window]]
+
+    def _sketch(self, category: str, window: str) -> Optional[KLLSketch]:
+        windowed = self._windowed.setdefault(category, OrderedDict())
+        sketch = windowed.get(window)
+        if sketch is None:
+            if (len(windowed) >= self.windows
+                    and window < next(iter(windowed))):
+                return None  # Older than every window kept.
+            sketch = windowed[window] = KLLSketch(self.k)
+            if list(windowed) != sorted(windowed):
+                for key in sorted(windowed):
+                    windowed.move_to_end(key)
+            while len(windowed) > self.windows:
+                windowed.popitem(last=False)
+        return sketch
+
+    def add(self, login: str, category: str, score: int, date: str):
+        """
+        Adds a result to the sketches of its category and of the mixed
+        category. The login is not kept; the signature matches
+        LeaderboardIndex.add.
+        """
+        window = self.window_of(date)
+        categories = (category,) if category == MIXED_CATEGORY else (
+            category, MIXED_CATEGORY
+        )
+        for name in categories:
+            sketch = self._all.get(name)
+            if sketch is None:
+                sketch = self._all[name] = KLLSketch(self.k)
+            sketch.update(score)
+            windowed = self._sketch(name, window)
+            if windowed is not None:
+                windowed.update(score)
+
+    def percentile(self, category: str, score: int,
+                   window: str = None) -> Optional[float]:
+        """
+        Returns the estimated percentage of results of a category (all
+        categories for the mixed one) below `score`, or None if there are
+        none.
+
+        Args:
+            category (str): The category.
+            score (int): The score to rank.
+            window (str, optional): A window such as "2025-01" for a month;
+                all time if omitted.
+        """
+        if window is None:
+            sketch = self._all.get(category)
+        else:
+            sketch = self._windowed.get(category, {}).get(window)
+        if sketch is None or not sketch.count:
+            return None
+        return 100 * sketch.rank(score) / sketch.count
+
+    def merge(self, other: "PercentileIndex"):
+        """
+        Adds the sketches of another index, e.g. one built by another
+        process or from another shard of the results.
+        """
+        for category, sketch in other._all.items():
+            self._all.setdefault(category, KLLSketch(self.k)).merge(sketch)
+        for category, windowed in other._windowed.items():
+            for window, sketch in windowed.items():
+                target = self._sketch(category, window)
+                if target is not None:
+                    target.merge(sketch)
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "window": self.window,
+            "windows": self.windows,
+            "all": {c: s.to_dict() for c, s in self._all.items()},
+            "windowed": {
+                c: {w: s.to_dict() for w, s in windowed.items()}
+                for c, windowed in self._windowed.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, source_path: str = None) -> "PercentileIndex":
+        index = cls(source_path, data["k"], data["window"], data["windows"])
+        index._all = {c: KLLSketch.from_dict(s) for c, s in data["all"].items()}
+        index._windowed = {
+            c: OrderedDict((w, KLLSketch.from_dict(s))
+                           for w, s in sorted(windowed.items()))
+            for c, windowed in data["windowed"].items()
+        }
+        return index
+
+    def is_current(self) -> bool:
+        """
+        Returns True if the source file has not changed since the index was
+        last synchronized with it.
+        """
+        return (self.source_path is not None
+                and file_fingerprint(self.source_path) == self.fingerprint)
+
+    def mark_current(self):
+        if self.source_path:
+            self.fingerprint = file_fingerprint(self.source_path)
@@ -0,0 +1,224 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+from typing import Dict, List
+from quiz_loader import IQuizLoader
+from warm_start import file_fingerprint
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class QuestionBank:
+    def __init__(self, questions: List[Dict], fingerprint=None):
+        """
+        Initializes an immutable snapshot of the question bank together with
+        the indexes derived from it.
+
+        A bank is never modified after it is built; a reload builds a new
+        bank and swaps the reference, so code holding the old bank keeps a
+        consistent view.
+
+        Args:
+            questions (List[Dict]): The questions of the bank.
+            fingerprint: The fingerprint of the source file.
+        """
+        self.questions = questions
+        self.fingerprint = fingerprint
+        self.by_category = {}
+        for question in questions:
+            self.by_category.setdefault(question["category"], []).append(
+                question
+            )
+        self.categories = sorted(self.by_category)
+
+    @classmethod
+    def from_file(cls, file_path: str = "questions.json") -> "QuestionBank":
+        """
+        Parses a questions file into a bank.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        fingerprint = file_fingerprint(file_path)
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(data["questions"], fingerprint)
+
+
+class _Inotify:
+    """
+    A minimal ctypes wrapper over Linux inotify, watching one directory.
+    """
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, file_name: str, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds for an event on `file_name`.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, name_length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            if os.fsdecode(name) == file_name:
+                return True
+        return False
+
+    def close(self):
+        os.close(self.fd)
+
+
+class QuestionBankWatcher:
+    def __init__(self, file_path: str = "questions.json",
+                 interval: float = 1.0, bank: QuestionBank = None):
+        """
+        Initializes a watcher that keeps a QuestionBank in sync with a file.
+
+        The file is parsed once here, unless an already built `bank` is
+        given (e.g. from a warm-start snapshot). After `start`, a background thread
+        waits for changes (inotify on Linux, otherwise polling the file's
+        fingerprint every `interval` seconds), parses the new file and
+        replaces `bank` in a single reference assignment. A file that fails
+        to parse, e.g. while it is still being written, leaves the current
+        bank in place.
+
+        Args:
+            file_path (str): The questions file to watch.
+            interval (float): The polling interval in seconds.
+            bank (QuestionBank, optional): The initial bank. A bank whose
+                fingerprint no longer matches the file is replaced on the
+                first check.
+        """
+        self.file_path = file_path
+        self.interval = interval
+        self.bank = bank if bank is not None else self._load()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self) -> QuestionBank:
+        try:
+            return QuestionBank.from_file(self.file_path)
+        except FileNotFoundError:
+            return QuestionBank([], None)
+
+    def check(self) -> bool:
+        """
+        Reloads the bank if the file changed since the last load. A file
+        that cannot be read or parsed leaves the current bank in place.
+
+        Returns:
+            bool: True if a new bank was swapped in.
+        """
+        try:
+            if file_fingerprint(self.file_path) == self.bank.fingerprint:
+                return False
+            bank = self._load()
+        except (OSError, json.JSONDecodeError, KeyError, UnicodeDecodeError):
+            return False
+        self.bank = bank
+        return True
+
+    def start(self):
+        """
+        Starts watching the file in a daemon thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="question-bank-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the watcher thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        file_name = os.path.basename(self.file_path)
+        try:
+            inotify = _Inotify(directory)
+        except (OSError, AttributeError, TypeError):
+            inotify = None
+
+        try:
+            while not self._stop.is_set():
+                if inotify is None:
+                    self._stop.wait(self.interval)
+                else:
+                    inotify.wait(file_name, self.interval)
+                self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+
+class WatchingQuizLoader(IQuizLoader):
+    def __init__(self, watcher: QuestionBankWatcher):
+        """
+        Initializes a loader that serves questions from the current bank of
+        a QuestionBankWatcher, without touching the file.
+
+        Args:
+            watcher (QuestionBankWatcher): The watcher providing the bank.
+        """
+        self.watcher = watcher
+
+    def load_questions(self) -> List[Dict]:
+        """
+        Returns the questions of the current bank. The list must not be
+        modified; it is shared by every caller until the next reload.
+
+        Returns:
+            List[Dict]: List of questions.
+        """
+        return self.watcher.bank.questions
+
+    def load_category_questions(self, category: str) -> List[Dict]:
+        """
+        Returns the questions of a category from the current bank's index.
+
+        Args:
+            category (str): The category to load.
+
+        Returns:
+            List[Dict]: List of questions in the category.
+        """
+        return self.watcher.bank.by_category.get(category, [])
+
+    def load_categories(self) -> List[str]:
+        return self.watcher.bank.categories
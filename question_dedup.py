@@ -0,0 +1,194 @@
+import hashlib
+import re
+from typing import Dict, Iterable, List, Tuple
+from question_search import normalize_text
+
+# Latin letters that look like Cyrillic ones; folded only inside words that
+# also contain Cyrillic letters, e.g. "гeографія" typed with a Latin "e".
+LATIN_TO_CYRILLIC = str.maketrans("aceiopxy", "асеіорху")
+CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+WORD_RE = re.compile(r"\w+(?:'\w+)*")
+
+SHINGLE_SIZE = 4
+NUM_BINS = 32
+BAND_ROWS = 4
+DEFAULT_THRESHOLD = 0.7
+
+
+def _fold_word(match) -> str:
+    word = match.group(0)
+    if CYRILLIC_RE.search(word):
+        return word.translate(LATIN_TO_CYRILLIC)
+    return word
+
+
+def normalize_question_text(text: str) -> str:
+    """
+    Normalizes text for duplicate detection: search normalization, Latin
+    look-alike letters folded to Cyrillic in mixed-script words, and
+    punctuation and repeated whitespace dropped.
+    """
+    words = WORD_RE.findall(normalize_text(text))
+    return " ".join(WORD_RE.sub(_fold_word, word) for word in words)
+
+
+def _hash64(data: str) -> int:
+    digest = hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def exact_fingerprint(text: str) -> int:
+    """
+    Returns a 64-bit fingerprint of the normalized text; equal fingerprints
+    mean exact duplicates up to case, punctuation and look-alike letters.
+    """
+    return _hash64(normalize_question_text(text))
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    Computes a one-permutation MinHash signature of the character shingles
+    of the normalized text.
+
+    Every shingle is hashed once; the hash selects one of NUM_BINS bins and
+    the bin keeps its minimum. Empty bins borrow the value of the next
+    non-empty bin so short texts still get a full signature. The share of
+    equal bins of two signatures estimates the Jaccard similarity of their
+    shingle sets.
+    """
+    normalized = normalize_question_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {
+            normalized[i:i + SHINGLE_SIZE]
+            for i in range(len(normalized) - SHINGLE_SIZE + 1)
+        }
+
+    bins = [None] * NUM_BINS
+    for shingle in shingles:
+        value = _hash64(shingle)
+        index = value % NUM_BINS
+        value //= NUM_BINS
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    for i in range(NUM_BINS):
+        if bins[i] is None:
+            nearest = next((j for j in filled if j > i), filled[0])
+            distance = (nearest - i) % NUM_BINS
+            bins[i] = bins[nearest] + distance * 2 ** 59
+    return tuple(bins)
+
+
+def signature_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """
+    Estimates the Jaccard similarity of two MinHash signatures.
+    """
+    return sum(a == b for a, b in zip(first, second)) / NUM_BINS
+
+
+class DuplicateDetector:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Initializes an incremental duplicate detector.
+
+        Exact duplicates are found through a fingerprint dictionary. Near
+        duplicates are found with locality-sensitive hashing: each signature
+        is split into bands of BAND_ROWS values and only texts sharing a band
+        are compared, so adding a text costs about the same regardless of
+        how many texts were added before.
+
+        Args:
+            threshold (float): The minimum estimated similarity for two texts
+                to count as near duplicates.
+        """
+        self.threshold = threshold
+        self._fingerprints = {}
+        self._signatures = {}
+        self._buckets = {}
+
+    def add(self, key, text: str) -> List[Tuple[object, float]]:
+        """
+        Adds a text and returns the previously added texts it duplicates.
+
+        Args:
+            key: Any hashable identifier of the text.
+            text (str): The text to add.
+
+        Returns:
+            List[Tuple[object, float]]: Keys of duplicate texts with their
+            similarity; exact duplicates have similarity 1.0.
+        """
+        matches = {}
+        fingerprint = exact_fingerprint(text)
+        for other in self._fingerprints.get(fingerprint, ()):
+            matches[other] = 1.0
+        self._fingerprints.setdefault(fingerprint, []).append(key)
+
+        signature = minhash_signature(text)
+        for band in range(0, NUM_BINS, BAND_ROWS):
+            bucket_key = (band, signature[band:band + BAND_ROWS])
+            bucket = self._buckets.setdefault(bucket_key, [])
+            for other in bucket:
+                if other in matches:
+                    continue
+                similarity = signature_similarity(
+                    signature, self._signatures[other]
+                )
+                if similarity >= self.threshold:
+                    matches[other] = similarity
+            bucket.append(key)
+        self._signatures[key] = signature
+
+        return sorted(matches.items(), key=lambda item: -item[1])
+
+
+def find_duplicate_clusters(
+        questions: List[Dict], threshold: float = DEFAULT_THRESHOLD
+) -> List[List[int]]:
+    """
+    Groups questions whose texts are exact or near duplicates.
+
+    Args:
+        questions (List[Dict]): The questions to check.
+        threshold (float): The minimum estimated similarity.
+
+    Returns:
+        List[List[int]]: Clusters of question positions, each with at
+        least two questions, in the order of their first question.
+    """
+    parent = list(range(len(questions)))
+
+    def find(position):
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    detector = DuplicateDetector(threshold)
+    for position, question in enumerate(questions):
+        for other, _ in detector.add(position, question["question"]):
+            root, other_root = find(position), find(other)
+            if root != other_root:
+                parent[max(root, other_root)] = min(root, other_root)
+
+    clusters = {}
+    for position in range(len(questions)):
+        clusters.setdefault(find(position), []).append(position)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+
+def find_category_variants(categories: Iterable[str]) -> List[List[str]]:
+    """
+    Finds category names that differ only in case, punctuation or
+    look-alike letters, e.g. "гeографія" and "географія".
+
+    Returns:
+        List[List[str]]: Groups of two or more category spellings.
+    """
+    groups = {}
+    for category in categories:
+        groups.setdefault(normalize_question_text(category), set()).add(category)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
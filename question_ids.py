@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+
+def new_question_id() -> str:
+    """
+    Returns a new random question id (a UUID4 in hex).
+    """
+    import uuid
+    return uuid.uuid4().hex
+
+
+def assign_question_ids(questions: List[Dict]) -> bool:
+    """
+    Gives an id to every question that has none, and a new one to every
+    question whose id repeats an earlier question's id (e.g. after a copy
+    was pasted into the file).
+
+    Ids do not depend on the question's content, so they stay the same
+    when the question is edited, and two questions with the same text are
+    still told apart.
+
+    Args:
+        questions (List[Dict]): The questions, changed in place.
+
+    Returns:
+        bool: True if any id was assigned, i.e. the questions need saving.
+    """
+    seen = set()
+    changed = False
+    for question in questions:
+        question_id = question.get("id")
+        if not question_id or question_id in seen:
+            question_id = question["id"] = new_question_id()
+            changed = True
+        seen.add(question_id)
+    return changed
+
+
+def build_id_index(questions: List[Optional[Dict]]) -> Dict[str, int]:
+    """
+    Maps question ids to their positions in `questions`. Entries that are
+    None (removed questions) and questions without an id are skipped.
+    """
+    return {
+        question["id"]: position
+        for position, question in enumerate(questions)
+        if question is not None and "id" in question
+    }
+
+
+def migrate_question_ids(quiz_data_manager) -> int:
+    """
+    Gives an id to every stored question without one and saves the store
+    once. Ids are otherwise assigned only when questions are written, so
+    this converts a bank from before the ids, or one edited by hand.
+
+    Args:
+        quiz_data_manager (IQuizDataManager): The store to convert.
+
+    Returns:
+        int: The number of questions given a new id.
+    """
+    with quiz_data_manager.locked_for_update():
+        questions = quiz_data_manager.get_questions()
+        before = [question.get("id") for question in questions]
+        if not assign_question_ids(questions):
+            return 0
+        quiz_data_manager.save_questions(questions)
+    return sum(old != question["id"]
+               for old, question in zip(before, questions))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Присвоює ідентифікатори питанням, які їх не мають."
+    )
+    parser.add_argument(
+        "path", nargs="?", default="questions.json",
+        help="файл з питаннями або каталог розбитого на категорії сховища"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if os.path.isdir(args.path):
+        from partitioned_storage import PartitionedQuizDataManager
+        quiz_data_manager = PartitionedQuizDataManager(args.path)
+    else:
+        from victorine_utility import QuizDataManager
+        quiz_data_manager = QuizDataManager(args.path)
+    count = migrate_question_ids(quiz_data_manager)
+    print(f"Присвоєно ідентифікатори {count} питанням.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
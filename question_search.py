@@ -0,0 +1,193 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+APOSTROPHE_RE = re.compile("[’ʼ`‘]")
+TOKEN_RE = re.compile(r"\w+(?:'\w+)*")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for searching: NFKC form, a single apostrophe
+    character (Ukrainian words such as "м'ята" are written with several
+    different apostrophes) and case folding.
+    """
+    text = APOSTROPHE_RE.sub("'", unicodedata.normalize("NFKC", text))
+    return text.casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into normalized search terms.
+    """
+    return TOKEN_RE.findall(normalize_text(text))
+
+
+class QuestionSearchIndex:
+    def __init__(self, questions: Iterable[Dict] = ()):
+        """
+        Initializes an inverted index over question text and options.
+
+        Every indexed question gets an internal document id; each term maps
+        to the set of documents containing it. Queries intersect these sets,
+        so their cost depends on the number of matches and the vocabulary
+        size rather than on the number of questions.
+
+        Args:
+            questions (Iterable[Dict]): The questions to index.
+        """
+        self._documents = {}
+        self._document_terms = {}
+        self._postings = {}
+        self._ids = {}
+        self._next_id = 0
+        self._vocabulary = None
+        for question in questions:
+            self.add(question)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, question: Dict) -> int:
+        """
+        Adds a question to the index.
+
+        Args:
+            question (Dict): The question to add.
+
+        Returns:
+            int: The document id of the question.
+        """
+        doc_id = self._next_id
+        self._next_id += 1
+
+        text = " ".join([question["question"], *question.get("options", [])])
+        terms = frozenset(tokenize(text))
+        self._documents[doc_id] = question
+        self._document_terms[doc_id] = terms
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = {doc_id}
+                self._vocabulary = None
+            else:
+                postings.add(doc_id)
+
+        if question.get("id"):
+            self._ids[question["id"]] = doc_id
+        return doc_id
+
+    def remove(self, doc_id: int):
+        """
+        Removes a document from the index.
+
+        Args:
+            doc_id (int): The document id returned by `add`.
+        """
+        question = self._documents.pop(doc_id)
+        for term in self._document_terms.pop(doc_id):
+            postings = self._postings[term]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+        if self._ids.get(question.get("id")) == doc_id:
+            del self._ids[question["id"]]
+
+    def remove_question(self, question_id: str) -> bool:
+        """
+        Removes the question with the given id from the index.
+
+        Returns:
+            bool: True if the question was indexed.
+        """
+        doc_id = self._ids.get(question_id)
+        if doc_id is None:
+            return False
+        self.remove(doc_id)
+        return True
+
+    def replace(self, question_id: str, question: Dict) -> bool:
+        """
+        Replaces the indexed question with the given id by a new version.
+
+        Args:
+            question_id (str): The id of the question to replace.
+            question (Dict): The new version of the question.
+
+        Returns:
+            bool: True if the question was indexed.
+        """
+        if not self.remove_question(question_id):
+            return False
+        self.add(question)
+        return True
+
+    def remove_category(self, category: str) -> int:
+        """
+        Removes every question of a category from the index.
+
+        Returns:
+            int: The number of removed questions.
+        """
+        doc_ids = [
+            doc_id for doc_id, question in self._documents.items()
+            if question["category"] == category
+        ]
+        for doc_id in doc_ids:
+            self.remove(doc_id)
+        return len(doc_ids)
+
+    def _matching_terms(self, token: str) -> List[str]:
+        """
+        Returns all indexed terms that contain `token` as a substring.
+
+        The vocabulary is kept as one newline-separated string so the scan
+        runs in `str.find` rather than a Python-level loop over terms.
+        """
+        if self._vocabulary is None:
+            self._vocabulary = "\n" + "\n".join(self._postings) + "\n"
+        vocabulary = self._vocabulary
+
+        terms = []
+        start = vocabulary.find(token)
+        while start != -1:
+            term_start = vocabulary.rfind("\n", 0, start) + 1
+            term_end = vocabulary.find("\n", start)
+            terms.append(vocabulary[term_start:term_end])
+            start = vocabulary.find(token, term_end)
+        return terms
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Finds questions matching every word of the query.
+
+        A query word matches a question if it is a substring of any term
+        of the question text or its options.
+
+        Args:
+            query (str): The search query.
+            limit (int, optional): The maximum number of results.
+
+        Returns:
+            List[Dict]: Matching questions in the order they were indexed.
+        """
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not tokens:
+            return []
+
+        matches = None
+        for token in tokens:
+            token_matches = set()
+            for term in self._matching_terms(token):
+                token_matches |= self._postings[term]
+            matches = (token_matches if matches is None
+                       else matches & token_matches)
+            if not matches:
+                return []
+
+        doc_ids = sorted(matches)
+        if limit is not None:
+            doc_ids = doc_ids[:limit]
+        return [self._documents[doc_id] for doc_id in doc_ids]
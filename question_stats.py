@@ -0,0 +1,371 @@
+import os
+import random
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from answer_log import QUESTION_ID_BYTES, encode_question_id
+
+STATS_FILE = "question_stats.bin"
+MAGIC = b"QST1"
+HEADER = struct.Struct("<4sI")
+
+EASY, MEDIUM, HARD = 0, 1, 2
+BAND_NAMES = ("easy", "medium", "hard")
+# Share of easy, medium and hard questions in an adaptive quiz.
+DEFAULT_MIX = (0.3, 0.4, 0.3)
+# Upper bounds of the easy and medium bands on the difficulty scale.
+BAND_LIMITS = (1 / 3, 2 / 3)
+BAND_CACHE_SIZE = 8
+
+
+class QuestionStats:
+    def __init__(self, file_path: str = STATS_FILE):
+        """
+        Initializes per-question answer statistics.
+
+        For every question id the number of attempts, correct answers and
+        the total response time are kept in parallel arrays, so recording an
+        answer is O(1) and the whole table takes 32 bytes per question on
+        disk (16-byte id, as in answer_log, plus three counters).
+
+        The difficulty of a question is its smoothed error rate,
+        (wrong + 1) / (attempts + 2): a question nobody has answered yet
+        has difficulty 0.5 and moves towards its real error rate as answers
+        come in. Difficulty decides the band (easy, medium or hard) a
+        question is sampled from in adaptive quizzes, see DifficultyBands.
+
+        Several quiz processes may share the file: each remembers the
+        answers it recorded since its last save, and `save` adds them to
+        the file as it is then, under a file lock, instead of overwriting
+        the answers saved by the others.
+
+        Args:
+            file_path (str): The file the statistics are loaded from and
+                saved to.
+        """
+        self.file_path = file_path
+        self._ids = bytearray()
+        self._positions: Dict[bytes, int] = {}
+        self.attempts = array("I")
+        self.correct = array("I")
+        self.total_response_ms = array("Q")
+        # Answers recorded since the last save: id -> [attempts, correct, ms].
+        self._deltas: Dict[bytes, List[int]] = {}
+        # key -> (source, index), see bands_for.
+        self._bands: "OrderedDict[object, Tuple[object, DifficultyBands]]" = (
+            OrderedDict()
+        )
+
+    @classmethod
+    def load(cls, file_path: str = STATS_FILE) -> "QuestionStats":
+        """
+        Loads the statistics from `file_path`; a missing file gives empty
+        statistics.
+
+        Raises:
+            ValueError: If the file is not a statistics file.
+        """
+        stats = cls(file_path)
+        try:
+            with open(file_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return stats
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"{file_path} is not a question stats file")
+        magic, count = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + count * 32:
+            raise ValueError(f"{file_path} is not a question stats file")
+
+        offset = HEADER.size
+        stats._ids = bytearray(data[offset:offset + count * QUESTION_ID_BYTES])
+        offset += count * QUESTION_ID_BYTES
+        for column, width in ((stats.attempts, 4), (stats.correct, 4),
+                              (stats.total_response_ms, 8)):
+            column.frombytes(data[offset:offset + count * width])
+            offset += count * width
+            if sys.byteorder == "big":
+                column.byteswap()
+        stats._positions = {
+            bytes(stats._ids[i * QUESTION_ID_BYTES:(i + 1) * QUESTION_ID_BYTES]): i
+            for i in range(count)
+        }
+        return stats
+
+    def save(self):
+        """
+        Adds the answers recorded since the last save to the file.
+
+        With the lock file held, the file is read again, the new answers
+        are added to it and it is replaced atomically; these statistics
+        then take the merged counts, including the answers saved by other
+        processes. A file that cannot be read is replaced by these
+        statistics.
+        """
+        import fcntl
+
+        if not self._deltas:
+            return
+        with open(f"{self.file_path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                stored = QuestionStats.load(self.file_path)
+            except ValueError:
+                stored = None
+            if stored is None:
+                self._write()
+            else:
+                for key, (attempts, correct, response_ms) in self._deltas.items():
+                    position = stored._position(key)
+                    stored.attempts[position] += attempts
+                    stored.correct[position] += correct
+                    stored.total_response_ms[position] += response_ms
+                stored._write()
+        self._deltas = {}
+        if stored is not None:
+            self._update_from(stored)
+
+    def _update_from(self, stored: "QuestionStats"):
+        """
+        Takes the counts of `stored`, moving questions whose band changed
+        in the cached band indexes.
+        """
+        for key, stored_position in stored._positions.items():
+            position = self._position(key)
+            band = self._band_at(position)
+            self.attempts[position] = stored.attempts[stored_position]
+            self.correct[position] = stored.correct[stored_position]
+            self.total_response_ms[position] = (
+                stored.total_response_ms[stored_position]
+            )
+            self._moved(key, position, band)
+
+    def _write(self):
+        import tempfile
+
+        columns = [self.attempts, self.correct, self.total_response_ms]
+        if sys.byteorder == "big":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.file_path)}-",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(HEADER.pack(MAGIC, len(self)))
+                file.write(self._ids)
+                for column in columns:
+                    file.write(column.tobytes())
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def __len__(self) -> int:
+        return len(self.attempts)
+
+    def record(self, question_id: Optional[str], correct: bool,
+               response_ms: int = 0):
+        """
+        Counts one answer to a question. Answers to questions without an id
+        are ignored.
+        """
+        if not question_id:
+            return
+        key = encode_question_id(question_id)
+        position = self._position(key)
+        band = self._band_at(position)
+
+        response_ms = max(int(response_ms), 0)
+        self.attempts[position] += 1
+        if correct:
+            self.correct[position] += 1
+        self.total_response_ms[position] += response_ms
+        delta = self._deltas.setdefault(key, [0, 0, 0])
+        delta[0] += 1
+        delta[1] += 1 if correct else 0
+        delta[2] += response_ms
+
+        self._moved(key, position, band)
+
+    def _position(self, key: bytes) -> int:
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self.attempts)
+            self._ids += key
+            self.attempts.append(0)
+            self.correct.append(0)
+            self.total_response_ms.append(0)
+        return position
+
+    def _moved(self, key: bytes, position: int, band: int):
+        new_band = self._band_at(position)
+        if new_band != band:
+            for _, bands in self._bands.values():
+                bands.move(key, new_band)
+
+    def get(self, question_id: str) -> Tuple[int, int, float]:
+        """
+        Returns the attempts, correct answers and mean response time in ms
+        of a question; zeros for a question without answers.
+        """
+        position = self._positions.get(encode_question_id(question_id))
+        if position is None or not self.attempts[position]:
+            return 0, 0, 0.0
+        attempts = self.attempts[position]
+        return (attempts, self.correct[position],
+                self.total_response_ms[position] / attempts)
+
+    def _band_at(self, position: Optional[int]) -> int:
+        if position is None:
+            return MEDIUM
+        attempts = self.attempts[position]
+        difficulty = (attempts - self.correct[position] + 1) / (attempts + 2)
+        if difficulty < BAND_LIMITS[0]:
+            return EASY
+        if difficulty > BAND_LIMITS[1]:
+            return HARD
+        return MEDIUM
+
+    def difficulty(self, question_id: str) -> float:
+        """
+        Returns the smoothed error rate of a question, between 0 and 1.
+        """
+        attempts, correct, _ = self.get(question_id)
+        return (attempts - correct + 1) / (attempts + 2)
+
+    def band(self, question_id: Optional[str]) -> int:
+        """
+        Returns the difficulty band of a question: EASY, MEDIUM or HARD.
+        """
+        if not question_id:
+            return MEDIUM
+        return self._band_at(
+            self._positions.get(encode_question_id(question_id))
+        )
+
+    def bands_for(self, questions: Sequence[Dict], source=None,
+                  key=None) -> "DifficultyBands":
+        """
+        Returns the band index of a question selection, reusing the one
+        built for the same selection before.
+
+        Indexes are cached per `key` (e.g. the category) for the last
+        BAND_CACHE_SIZE keys. Each index is reused as long as its selection
+        comes from the same `source` object: the question bank it was taken
+        from, `questions` itself by default. A new source for a key (a
+        reloaded bank) replaces only that key's index, so quizzes switching
+        between categories keep theirs. While cached, an index is kept up
+        to date by `record`, so only the first quiz on a selection pays for
+        building it.
+
+        Args:
+            questions (Sequence[Dict]): The questions to index.
+            source: The object the selection was made from.
+            key: What distinguishes selections made from the same source.
+        """
+        source = questions if source is None else source
+        cached = self._bands.get(key)
+        if cached is not None and cached[0] is source:
+            self._bands.move_to_end(key)
+            return cached[1]
+        bands = DifficultyBands(questions, self)
+        self._bands[key] = (source, bands)
+        self._bands.move_to_end(key)
+        if len(self._bands) > BAND_CACHE_SIZE:
+            self._bands.popitem(last=False)
+        return bands
+
+
+class DifficultyBands:
+    def __init__(self, questions: Sequence[Dict], stats: QuestionStats):
+        """
+        Initializes an index of questions by difficulty band.
+
+        The index holds the positions of the questions of each band and the
+        slot of every question (by encoded id, see encode_question_id)
+        within its band. Moving a question to
+        another band is a swap with the last entry of its band, O(1), so the
+        index follows the statistics without being rebuilt, and a quiz is
+        drawn in O(count) instead of sorting the questions by difficulty.
+
+        Args:
+            questions (Sequence[Dict]): The questions to index.
+            stats (QuestionStats): The statistics giving the bands.
+        """
+        self.questions = questions
+        self.bands: List[List[int]] = [[], [], []]
+        self._slots: Dict[bytes, Tuple[int, int]] = {}
+        for position, question in enumerate(questions):
+            question_id = question.get("id")
+            band = stats.band(question_id)
+            if question_id:
+                self._slots[encode_question_id(question_id)] = (
+                    band, len(self.bands[band])
+                )
+            self.bands[band].append(position)
+
+    def move(self, key: bytes, band: int):
+        """
+        Moves a question, given by its encoded id, to another band, if the
+        index contains it.
+        """
+        slot = self._slots.get(key)
+        if slot is None or slot[0] == band:
+            return
+        old_band, index = slot
+        members = self.bands[old_band]
+        position = members[index]
+        last = members.pop()
+        if last != position:
+            members[index] = last
+            last_id = self.questions[last].get("id")
+            if last_id:
+                self._slots[encode_question_id(last_id)] = (old_band, index)
+        self._slots[key] = (band, len(self.bands[band]))
+        self.bands[band].append(position)
+
+    def sizes(self) -> Tuple[int, int, int]:
+        return tuple(len(members) for members in self.bands)
+
+    def quotas(self, count: int, mix=DEFAULT_MIX) -> List[int]:
+        """
+        Splits `count` questions between the bands by `mix`, giving the
+        share a band cannot fill to the bands with questions left.
+        """
+        count = min(count, len(self.questions))
+        shares = [count * weight / sum(mix) for weight in mix]
+        quotas = [int(share) for share in shares]
+        by_remainder = sorted(range(3), key=lambda i: shares[i] - quotas[i],
+                              reverse=True)
+        for band in by_remainder[:count - sum(quotas)]:
+            quotas[band] += 1
+
+        quotas = [min(quota, len(members))
+                  for quota, members in zip(quotas, self.bands)]
+        missing = count - sum(quotas)
+        for band in sorted(range(3), key=lambda i: len(self.bands[i]) - quotas[i],
+                           reverse=True):
+            extra = min(missing, len(self.bands[band]) - quotas[band])
+            quotas[band] += extra
+            missing -= extra
+        return quotas
+
+    def sample(self, count: int = 20, mix=DEFAULT_MIX) -> List[Dict]:
+        """
+        Draws up to `count` questions, balanced between the bands by `mix`,
+        in random order.
+        """
+        positions = []
+        for members, quota in zip(self.bands, self.quotas(count, mix)):
+            positions.extend(random.sample(members, quota))
+        random.shuffle(positions)
+        return [self.questions[position] for position in positions]
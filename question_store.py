@@ -0,0 +1,221 @@
+import json
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional
+
+MASK_BITS = 64
+
+
+class ColumnarQuestionStore(Sequence):
+    def __init__(self):
+        """
+        Initializes an empty columnar question store.
+
+        A list of question dicts keeps a separate category string, option
+        list and answer list for every question, so a category name or a
+        common option such as "Так" is stored once per question. The store
+        keeps the questions in columns instead:
+
+        - category ids in an array, indexing a list of category names;
+        - option ids in one flat array, with an offset array marking where
+          each question's options start; every distinct option text is
+          stored once in a shared pool;
+        - correct answers as a 64-bit mask over the question's options.
+          Answers that are not among the options (or beyond the 64th
+          option) are kept separately, which is rare;
+        - question ids in a list, with an id -> position index.
+
+        The store is a read-only Sequence of question dicts, so it can be
+        passed wherever a list of questions is read, e.g. to QuizCategory
+        subclasses and random.sample. Items are built on access; changes
+        to a returned dict are not stored.
+        """
+        self.categories: List[str] = []
+        self._category_ids: Dict[str, int] = {}
+        self.options: List[str] = []
+        self._option_ids: Dict[str, int] = {}
+
+        self.question_texts: List[str] = []
+        self.question_ids: List[Optional[str]] = []
+        self._positions: Dict[str, int] = {}
+        self.category_column = array("I")
+        self.option_offsets = array("I", [0])
+        self.option_column = array("I")
+        self.answer_masks = array("Q")
+        self._extra_answers: Dict[int, tuple] = {}
+        self._category_positions = None
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Dict]) -> "ColumnarQuestionStore":
+        """
+        Builds a store from question dicts; `questions` may be a generator,
+        so a bank can be converted without holding every dict at once.
+        """
+        store = cls()
+        for question in questions:
+            store.append(question)
+        return store
+
+    @classmethod
+    def from_file(cls, file_path: str = "questions.json") -> "ColumnarQuestionStore":
+        """
+        Builds a store from a questions file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls.from_questions(data["questions"])
+
+    def _intern_option(self, option: str) -> int:
+        option_id = self._option_ids.get(option)
+        if option_id is None:
+            option_id = len(self.options)
+            self._option_ids[option] = option_id
+            self.options.append(option)
+        return option_id
+
+    def append(self, question: Dict):
+        """
+        Adds a question to the end of the store.
+        """
+        category = question["category"]
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            category_id = len(self.categories)
+            self._category_ids[category] = category_id
+            self.categories.append(category)
+
+        options = question["options"]
+        correct_answers = question["correct_answers"]
+        mask = 0
+        for index, option in enumerate(options):
+            self.option_column.append(self._intern_option(option))
+            if index < MASK_BITS and option in correct_answers:
+                mask |= 1 << index
+        extra = tuple(
+            answer for answer in correct_answers
+            if answer not in options[:MASK_BITS]
+        )
+
+        position = len(self.question_texts)
+        if extra:
+            self._extra_answers[position] = extra
+        self.question_texts.append(question["question"])
+        question_id = question.get("id")
+        self.question_ids.append(question_id)
+        if question_id:
+            self._positions[question_id] = position
+        self.category_column.append(category_id)
+        self.option_offsets.append(len(self.option_column))
+        self.answer_masks.append(mask)
+        self._category_positions = None
+
+    def __len__(self) -> int:
+        return len(self.question_texts)
+
+    def __getitem__(self, index):
+        """
+        Returns the question at `index` as a new dict with the keys of
+        questions.json. Correct answers are listed in the order of the
+        options. A slice returns a list of dicts.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+
+        start = self.option_offsets[index]
+        end = self.option_offsets[index + 1]
+        options = [self.options[i] for i in self.option_column[start:end]]
+        mask = self.answer_masks[index]
+        correct_answers = [
+            option for bit, option in enumerate(options[:MASK_BITS])
+            if mask >> bit & 1
+        ]
+        correct_answers.extend(self._extra_answers.get(index, ()))
+        question = {
+            "category": self.categories[self.category_column[index]],
+            "question": self.question_texts[index],
+            "options": options,
+            "correct_answers": correct_answers,
+        }
+        if self.question_ids[index] is not None:
+            question["id"] = self.question_ids[index]
+        return question
+
+    def position_of(self, question_id: str) -> Optional[int]:
+        """
+        Returns the position of the question with the given id, or None.
+        """
+        return self._positions.get(question_id)
+
+    def get_by_id(self, question_id: str) -> Optional[Dict]:
+        """
+        Returns the question with the given id, or None.
+        """
+        position = self._positions.get(question_id)
+        return None if position is None else self[position]
+
+    def filter_category(self, category: str) -> "QuestionStoreView":
+        """
+        Returns the questions whose lower-cased category equals `category`,
+        the same selection SpecificCategory makes, without building a dict
+        for every question in the store.
+
+        The positions of all categories are collected in one pass over the
+        category column on first use and reused until the store changes.
+        """
+        if self._category_positions is None:
+            positions = [array("I") for _ in self.categories]
+            for position, category_id in enumerate(self.category_column):
+                positions[category_id].append(position)
+            self._category_positions = positions
+
+        matching = [
+            self._category_positions[category_id]
+            for category_id, name in enumerate(self.categories)
+            if name.lower() == category
+        ]
+        if len(matching) == 1:
+            return QuestionStoreView(self, matching[0])
+        # Spellings differing only in case are merged in store order.
+        return QuestionStoreView(
+            self, array("I", sorted(p for ps in matching for p in ps))
+        )
+
+
+class QuestionStoreView(Sequence):
+    def __init__(self, store: ColumnarQuestionStore, positions: array):
+        """
+        Initializes a read-only view of selected questions of a store.
+
+        Args:
+            store (ColumnarQuestionStore): The store holding the questions.
+            positions (array): Positions of the selected questions.
+        """
+        self.store = store
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store[i] for i in self.positions[index]]
+        return self.store[self.positions[index]]
+
+    def filter_category(self, category: str) -> "QuestionStoreView":
+        """
+        Returns the selected questions whose lower-cased category equals
+        `category`, from the store's category index, without building a
+        dict for any question.
+        """
+        matching = set(self.store.filter_category(category).positions)
+        return QuestionStoreView(self.store, array("I", (
+            position for position in self.positions if position in matching
+        )))
@@ -0,0 +1,317 @@
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Tuple
+from question_dedup import DuplicateDetector, exact_fingerprint
+from question_ids import new_question_id
+
+CSV_FIELDS = ["category", "question", "options", "correct_answers", "id"]
+CSV_LIST_SEPARATOR = "|"
+CSV_ESCAPE = "\\"
+
+
+def join_csv_list(items: List[str]) -> str:
+    """
+    Joins a list column of a CSV row with '|', escaping '|' and '\\' in
+    the items with a backslash so they survive `split_csv_list`.
+    """
+    return CSV_LIST_SEPARATOR.join(
+        item.replace(CSV_ESCAPE, CSV_ESCAPE * 2)
+        .replace(CSV_LIST_SEPARATOR, CSV_ESCAPE + CSV_LIST_SEPARATOR)
+        for item in items
+    )
+
+
+def split_csv_list(value: str) -> List[str]:
+    """
+    Splits a list column of a CSV row written by `join_csv_list`. Only
+    '\\|' and '\\\\' are escapes; any other backslash is kept as it is.
+    Items are stripped and empty items dropped.
+    """
+    items, current = [], []
+    position = 0
+    while position < len(value):
+        char = value[position]
+        following = value[position + 1:position + 2]
+        if char == CSV_ESCAPE and following in (CSV_ESCAPE, CSV_LIST_SEPARATOR):
+            current.append(following)
+            position += 1
+        elif char == CSV_LIST_SEPARATOR:
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        position += 1
+    items.append("".join(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def detect_format(file_path: str) -> str:
+    """
+    Detects the bulk file format from the file extension.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        str: 'jsonl' or 'csv'.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Непідтримуваний формат файлу: {extension}")
+
+
+def validate_question(record: Dict) -> Dict:
+    """
+    Validates a raw record and converts it into a question.
+
+    Args:
+        record (Dict): The record read from a bulk file.
+
+    Returns:
+        Dict: The question with stripped text fields.
+
+    Raises:
+        ValueError: If the record is not a valid question.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("запис не є об'єктом")
+
+    category = record.get("category")
+    question = record.get("question")
+    options = record.get("options")
+    correct_answers = record.get("correct_answers")
+
+    if not isinstance(category, str) or not category.strip():
+        raise ValueError("не вказано категорію")
+    if not isinstance(question, str) or not question.strip():
+        raise ValueError("не вказано запитання")
+    if (not isinstance(options, list) or len(options) < 2
+            or not all(isinstance(option, str) for option in options)):
+        raise ValueError("потрібно щонайменше два варіанти відповіді")
+    if (not isinstance(correct_answers, list) or not correct_answers
+            or not all(isinstance(answer, str) for answer in correct_answers)
+            or not set(correct_answers) <= set(options)):
+        raise ValueError("правильні відповіді мають бути серед варіантів")
+
+    question_data = dict(record)
+    question_data.update({
+        "category": category.strip(),
+        "question": question.strip(),
+        "options": options,
+        "correct_answers": correct_answers,
+    })
+    return question_data
+
+
+def question_key(question: Dict) -> int:
+    """
+    Returns a compact key identifying a question by its category and text,
+    ignoring case, punctuation and look-alike letters (see question_dedup).
+
+    Args:
+        question (Dict): The question.
+
+    Returns:
+        int: A 64-bit hash of the normalized category and text.
+    """
+    return exact_fingerprint(f"{question['category']}\n{question['question']}")
+
+
+def iter_jsonl_records(file_path: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Reads a JSON Lines file one record at a time.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Yields:
+        Tuple[int, Dict]: The line number and the decoded record. Records
+        that are not valid JSON are yielded as None.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None
+
+
+def iter_csv_records(file_path: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Reads a CSV file one record at a time.
+
+    The file must have the columns category, question, options and
+    correct_answers, and may have an id column; list columns are separated
+    by '|' (see `split_csv_list`).
+
+    Args:
+        file_path (str): The path of the file.
+
+    Yields:
+        Tuple[int, Dict]: The line number and the decoded record.
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            record = dict(row)
+            for field in ("options", "correct_answers"):
+                value = record.get(field)
+                if isinstance(value, str):
+                    record[field] = split_csv_list(value)
+            yield reader.line_num, record
+
+
+def iter_records(file_path: str, file_format: str = None):
+    """
+    Reads records from a JSONL or CSV file, detecting the format from the
+    extension unless `file_format` is given.
+    """
+    file_format = file_format or detect_format(file_path)
+    if file_format == "jsonl":
+        return iter_jsonl_records(file_path)
+    if file_format == "csv":
+        return iter_csv_records(file_path)
+    raise ValueError(f"Непідтримуваний формат файлу: {file_format}")
+
+
+def import_questions(quiz_data_manager, file_path, file_format=None,
+                     batch_size=1000, check_near_duplicates=True):
+    """
+    Imports questions from a JSONL or CSV file.
+
+    The file is read one record at a time. Each record is validated and
+    skipped if it duplicates a question already in the store or earlier in
+    the file. Accepted questions get an id unless they have one not used
+    yet, and are appended to the store (see `append_questions`) every
+    `batch_size` questions and at the end; a written batch is not kept in
+    memory. Only the keys and ids of the questions are kept, and, for the
+    near-duplicate check, their MinHash signatures keyed by line number
+    (or by position for questions already in the store), never their texts.
+
+    A partitioned store rewrites only the partitions a batch adds to, but
+    a single-file store rewrites the whole file for every batch, so a
+    large import into it should use a large `batch_size`.
+
+    Questions that are only similar to an existing one (see
+    question_dedup.DuplicateDetector) are still imported, but reported as
+    warnings so the admin can review them.
+
+    Args:
+        quiz_data_manager (IQuizDataManager): The store to import into.
+        file_path (str): The path of the file to import.
+        file_format (str, optional): 'jsonl' or 'csv'. Detected from the
+            extension if omitted.
+        batch_size (int): The number of questions per write.
+        check_near_duplicates (bool): Whether to look for near duplicates.
+
+    Returns:
+        dict: Counts of imported, duplicate, near-duplicate and invalid
+        records, and the first few validation errors and warnings.
+    """
+    report = {"imported": 0, "duplicates": 0, "near_duplicates": 0,
+              "invalid": 0, "errors": [], "warnings": []}
+    records = iter_records(file_path, file_format)
+
+    seen = set()
+    ids = set()
+    detector = DuplicateDetector() if check_near_duplicates else None
+    # Store questions are keyed by -position - 1, file records by their
+    # line number, so the detector holds only small ints and signatures.
+    for position, question in enumerate(quiz_data_manager.get_questions()):
+        seen.add(question_key(question))
+        ids.add(question.get("id"))
+        if detector is not None:
+            detector.add(-position - 1, question["question"])
+    batch = []
+
+    for line_number, record in records:
+        try:
+            if record is None:
+                raise ValueError("некоректний JSON")
+            question = validate_question(record)
+        except ValueError as e:
+            report["invalid"] += 1
+            if len(report["errors"]) < 20:
+                report["errors"].append(f"рядок {line_number}: {e}")
+            continue
+
+        key = question_key(question)
+        if key in seen:
+            report["duplicates"] += 1
+            continue
+        seen.add(key)
+
+        if detector is not None:
+            similar = detector.add(line_number, question["question"])
+            if similar:
+                report["near_duplicates"] += 1
+                if len(report["warnings"]) < 20:
+                    other = similar[0][0]
+                    source = (f"рядок {other}" if other > 0
+                              else f"питання №{-other} у сховищі")
+                    report["warnings"].append(
+                        f"рядок {line_number}: «{question['question']}» "
+                        f"схоже на {source}"
+                    )
+
+        if not question.get("id") or question["id"] in ids:
+            question["id"] = new_question_id()
+        ids.add(question["id"])
+        batch.append(question)
+        report["imported"] += 1
+        if len(batch) >= batch_size:
+            quiz_data_manager.append_questions(batch)
+            batch = []
+
+    if batch:
+        quiz_data_manager.append_questions(batch)
+    return report
+
+
+def export_questions(quiz_data_manager, file_path, file_format=None):
+    """
+    Exports all questions to a JSONL or CSV file, writing one record at
+    a time.
+
+    Args:
+        quiz_data_manager (IQuizDataManager): The store to export from.
+        file_path (str): The path of the file to write.
+        file_format (str, optional): 'jsonl' or 'csv'. Detected from the
+            extension if omitted.
+
+    Returns:
+        int: The number of exported questions.
+    """
+    file_format = file_format or detect_format(file_path)
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(f"Непідтримуваний формат файлу: {file_format}")
+    count = 0
+
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "jsonl":
+            for question in quiz_data_manager.get_questions():
+                file.write(json.dumps(question, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+        else:
+            writer = csv.DictWriter(
+                file, fieldnames=CSV_FIELDS, extrasaction="ignore"
+            )
+            writer.writeheader()
+            for question in quiz_data_manager.get_questions():
+                row = dict(question)
+                for field in ("options", "correct_answers"):
+                    row[field] = join_csv_list(question[field])
+                writer.writerow(row)
+                count += 1
+
+    return count
@@ -1,33 +1,287 @@
+import os
+from colorama import Fore, Style
 from user_manager import UserManager
-from quiz_result_manager import QuizResultManager
+from quiz_result_manager import LeaderboardIndex, QuizResultManager
 from quiz_loader import QuizLoader
 from quiz_orchestrator import QuizOrchestrator
 
+QUESTIONS_FILE = "questions.json"
+
 
 class QuizApp:
-    def __init__(self):
+    def __init__(self, questions_dir=None, watch_questions=False,
+                 warm_start=False, plain_output=False, profile_script=None,
+                 profile_dir="profile", answer_log_dir=None,
+                 question_stats_file=None, adaptive=False, shared_bank=None,
+                 daemon=None):
         """
         Initializes the QuizApp class, setting up the user manager, result manager,
         quiz loader, and quiz orchestrator components necessary for the application
         to function. These components are responsible for managing users, handling quiz
         results, loading quiz data, and orchestrating the overall quiz flow.
+
+        Args:
+            questions_dir (str, optional): A directory with a category-partitioned
+                question store (see partitioned_storage). If omitted, questions
+                are read from questions.json.
+            watch_questions (bool): Keep the parsed questions.json in memory and
+                reload it in the background when the file changes, instead of
+                parsing it on every request. Ignored with `questions_dir`.
+            warm_start (bool): Load the parsed question bank, the leaderboard
+                index and the score percentile sketches from snapshots in .quiz_cache when their source files are
+                unchanged, and save them on exit. Implies `watch_questions`.
+            plain_output (bool): Draw menus and tables as plain aligned text
+                instead of rich tables, for slow or remote terminals.
+            profile_script (str, optional): A replay script (see profiling)
+                whose answers are fed to the input prompts; each phase of the
+                script is profiled with cProfile and tracemalloc.
+            profile_dir (str): The directory for the profiling reports.
+            answer_log_dir (str, optional): A directory for the per-answer
+                event log (see answer_log). Answers are not logged if omitted.
+            question_stats_file (str, optional): A file with per-question
+                answer statistics (see question_stats), updated after every
+                quiz. Quizzes are then balanced between easy, medium and
+                hard questions.
+            adaptive (bool): Balance quizzes by difficulty, keeping the
+                statistics in question_stats.bin unless
+                `question_stats_file` names another file.
+            shared_bank (str or bool, optional): Read questions from a
+                compiled bank shared in memory by all quiz processes on the
+                host (see shared_bank): its path, or True for the default
+                path in .quiz_cache. The bank is republished from
+                questions.json when the file changes. Ignored with
+                `questions_dir`.
+            daemon (str or bool, optional): Serve users and results from a
+                running cache daemon (see cache_daemon) instead of reading
+                users.json in this process: its socket path, or True for
+                the default socket in .quiz_cache. Falls back to users.json
+                if the daemon does not answer, at startup or later on.
         """
-        self.user_manager = UserManager()
-        self.result_manager = QuizResultManager(self.user_manager)
-        self.quiz_loader = QuizLoader()
-        self.quiz_orchestrator = QuizOrchestrator(
-            self.user_manager, self.result_manager, self.quiz_loader
-        )
+        self.profile_script = profile_script
+        self.profile_dir = profile_dir
+        self.question_watcher = None
+        self.snapshot_cache = None
+        leaderboard_index = None
+        menu_renderer = None
+        answer_log = None
+        if answer_log_dir:
+            from answer_log import AnswerLog
+            answer_log = AnswerLog(answer_log_dir)
+        question_stats = None
+        if question_stats_file or adaptive:
+            from question_stats import STATS_FILE, QuestionStats
+            question_stats = QuestionStats.load(question_stats_file or STATS_FILE)
+        if plain_output:
+            from menu_renderer import PlainMenuRenderer
+            menu_renderer = PlainMenuRenderer()
+
+        if warm_start:
+            from warm_start import SnapshotCache
+            self.snapshot_cache = SnapshotCache()
+
+        self.user_manager = None
+        if daemon:
+            from cache_daemon import DEFAULT_SOCKET, connect
+            socket_path = daemon if isinstance(daemon, str) else DEFAULT_SOCKET
+            try:
+                self.user_manager, self.result_manager = connect(socket_path)
+            except OSError as e:
+                print(f"{Fore.RED}"
+                      f"Демон кешу недоступний ({e}), працюємо з "
+                      f"{UserManager.USER_DATA_FILE}."
+                      f"{Style.RESET_ALL}")
+
+        if self.user_manager is None:
+            from quantile_sketch import PercentileIndex
+
+            self.user_manager = UserManager()
+            percentile_index = None
+            if self.snapshot_cache is not None:
+                leaderboard_index = self.snapshot_cache.load_or_build(
+                    "leaderboard", [UserManager.USER_DATA_FILE],
+                    lambda: LeaderboardIndex.from_users(
+                        self.user_manager.load_user_data(),
+                        UserManager.USER_DATA_FILE
+                    )
+                )
+                percentile_index = self.snapshot_cache.load(
+                    "percentiles", [UserManager.USER_DATA_FILE]
+                )
+            if percentile_index is None:
+                # Built from the user data on the first percentile query.
+                percentile_index = PercentileIndex(UserManager.USER_DATA_FILE)
+            self.result_manager = QuizResultManager(
+                self.user_manager, leaderboard_index, percentile_index
+            )
+
+        if questions_dir:
+            from partitioned_storage import (
+                PartitionedQuizDataManager, PartitionedQuizLoader
+            )
+            self.quiz_loader = PartitionedQuizLoader(questions_dir)
+            quiz_data_manager = PartitionedQuizDataManager(questions_dir)
+            self.quiz_orchestrator = QuizOrchestrator(
+                self.user_manager, self.result_manager, self.quiz_loader,
+                quiz_data_manager=quiz_data_manager,
+                menu_renderer=menu_renderer, answer_log=answer_log,
+                question_stats=question_stats
+            )
+        else:
+            if shared_bank:
+                from shared_bank import DEFAULT_PATH, SharedBankLoader
+                self.quiz_loader = SharedBankLoader(
+                    shared_bank if isinstance(shared_bank, str) else DEFAULT_PATH,
+                    QUESTIONS_FILE
+                )
+            elif watch_questions or warm_start:
+                self.question_watcher = self._create_question_watcher()
+                from question_bank import WatchingQuizLoader
+                self.quiz_loader = WatchingQuizLoader(self.question_watcher)
+            else:
+                self.quiz_loader = QuizLoader()
+            self.quiz_orchestrator = QuizOrchestrator(
+                self.user_manager, self.result_manager, self.quiz_loader,
+                menu_renderer=menu_renderer, answer_log=answer_log,
+                question_stats=question_stats
+            )
         # self.victorine_utility = VictorineUtilityMenu()
 
+    def _create_question_watcher(self):
+        from question_bank import QuestionBank, QuestionBankWatcher
+
+        bank = None
+        if self.snapshot_cache is not None and os.path.exists(QUESTIONS_FILE):
+            bank = self.snapshot_cache.load_or_build(
+                "questions", [QUESTIONS_FILE],
+                lambda: QuestionBank.from_file(QUESTIONS_FILE)
+            )
+        return QuestionBankWatcher(QUESTIONS_FILE, bank=bank)
+
+    def save_snapshots(self):
+        """
+        Saves the current question bank, leaderboard index and percentile
+        sketches to the warm-start cache, so the next start does not rebuild
+        them.
+        """
+        if self.snapshot_cache is None:
+            return
+
+        # A daemon's result manager keeps its indexes in the daemon.
+        for name, index in (
+                ("leaderboard",
+                 getattr(self.result_manager, "leaderboard_index", None)),
+                ("percentiles",
+                 getattr(self.result_manager, "percentile_index", None))):
+            if index is not None and index.is_current():
+                self.snapshot_cache.store(
+                    name, [UserManager.USER_DATA_FILE], index,
+                    [index.fingerprint]
+                )
+
+        if self.question_watcher is not None:
+            bank = self.question_watcher.bank
+            if bank.fingerprint is not None:
+                self.snapshot_cache.store(
+                    "questions", [QUESTIONS_FILE], bank, [bank.fingerprint]
+                )
+
     def run(self):
         """
         Runs the quiz application, launching the main menu where users can log in,
         register, or exit the application.
         """
-        self.quiz_orchestrator.main_menu()
+        if self.question_watcher is not None:
+            self.question_watcher.start()
+        try:
+            if self.profile_script:
+                from profiling import PhaseProfiler, ScriptedReplay
+                with ScriptedReplay.from_file(
+                        self.profile_script, PhaseProfiler(self.profile_dir)
+                ):
+                    self.quiz_orchestrator.main_menu()
+            else:
+                self.quiz_orchestrator.main_menu()
+        finally:
+            if self.question_watcher is not None:
+                self.question_watcher.stop()
+            self.save_snapshots()
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Вікторина")
+    parser.add_argument(
+        "--questions-dir",
+        help="каталог з питаннями, розбитими за категоріями"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="перезавантажувати questions.json у фоні при зміні файлу"
+    )
+    parser.add_argument(
+        "--warm-start", action="store_true",
+        help="зберігати розібрані дані між запусками (.quiz_cache)"
+    )
+    parser.add_argument(
+        "--metrics", metavar="FILE",
+        help="збирати час операцій і записати його у FILE при виході "
+             "(.json або формат Prometheus; SIGUSR1 - записати зараз)"
+    )
+    parser.add_argument(
+        "--profile", metavar="SCRIPT",
+        help="відтворити відповіді зі сценарію та профілювати кожну фазу"
+    )
+    parser.add_argument(
+        "--profile-dir", default="profile",
+        help="каталог для звітів профілювання (за замовчуванням profile)"
+    )
+    parser.add_argument(
+        "--answer-log", metavar="DIR",
+        help="записувати кожну відповідь (час, вибір, правильність) у DIR"
+    )
+    parser.add_argument(
+        "--question-stats", metavar="FILE",
+        help="вести статистику складності питань у FILE і добирати "
+             "вікторини за складністю"
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="добирати питання за складністю (статистика у question_stats.bin)"
+    )
+    parser.add_argument(
+        "--shared-bank", nargs="?", metavar="PATH", const=True,
+        help="читати питання зі спільного для всіх процесів банку в пам'яті "
+             "(за замовчуванням .quiz_cache/questions.bank)"
+    )
+    parser.add_argument(
+        "--daemon", nargs="?", metavar="SOCKET", const=True,
+        help="брати користувачів і результати з демона кешу "
+             "(за замовчуванням .quiz_cache/daemon.sock)"
+    )
+    parser.add_argument(
+        "--plain", action="store_true",
+        help="простий текстовий вивід меню без таблиць rich"
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    app = QuizApp()
+    args = parse_args()
+    if args.metrics:
+        import metrics
+        metrics.dump_on_exit(args.metrics)
+    app = QuizApp(
+        questions_dir=args.questions_dir,
+        watch_questions=args.watch,
+        warm_start=args.warm_start,
+        plain_output=args.plain,
+        profile_script=args.profile,
+        profile_dir=args.profile_dir,
+        answer_log_dir=args.answer_log,
+        question_stats_file=args.question_stats,
+        adaptive=args.adaptive,
+        shared_bank=args.shared_bank,
+        daemon=args.daemon,
+    )
     app.run()
@@ -1,8 +1,13 @@
 import random
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 from abc import ABC, abstractmethod
 from colorama import Fore, Style
 
+if TYPE_CHECKING:
+    from question_stats import QuestionStats
+
+QUIZ_LENGTH = 20
+
 
 class IQuizCategory(ABC):
     @abstractmethod
@@ -26,14 +31,19 @@ class IQuizCategory(ABC):
 
 
 class QuizCategory(IQuizCategory):
-    def __init__(self, questions: List[Dict]):
+    def __init__(self, questions: List[Dict],
+                 question_stats: "QuestionStats" = None):
         """
         Initializes a QuizCategory with a list of questions.
 
         Args:
             questions (List[Dict]): A list of dictionaries, each representing a question.
+            question_stats (QuestionStats, optional): Per-question answer
+                statistics. If given, get_questions selects adaptively:
+                the quiz is balanced between easy, medium and hard questions.
         """
         self.questions = questions
+        self.question_stats = question_stats
 
     def load_questions(self):
         """
@@ -53,40 +63,62 @@ class QuizCategory(IQuizCategory):
         """
         pass
 
+    def _sample(self, source=None, key=None) -> List[Dict]:
+        """
+        Draws up to QUIZ_LENGTH questions: uniformly at random or, with
+        question statistics, balanced by difficulty band using the band
+        index cached for `source` and `key` (see QuestionStats.bands_for).
+        """
+        if self.question_stats is not None:
+            return self.question_stats.bands_for(
+                self.questions, source, key
+            ).sample(QUIZ_LENGTH)
+        return random.sample(self.questions,
+                             min(len(self.questions), QUIZ_LENGTH))
+
 
 class MixedCategory(QuizCategory):
-    def __init__(self, questions: List[Dict]):
+    def __init__(self, questions: List[Dict],
+                 question_stats: "QuestionStats" = None):
         """
         Initializes a MixedCategory with a list of questions.
 
         Args:
             questions (List[Dict]): A list of dictionaries, each representing a question.
+            question_stats (QuestionStats, optional): Enables adaptive selection.
         """
-        super().__init__(questions)
+        super().__init__(questions, question_stats)
 
     def load_questions(self) -> List[Dict]:
         return self.questions
 
     def get_questions(self) -> List[Dict]:
-        return random.sample(self.questions, min(len(self.questions), 20))
+        return self._sample()
 
 
 class SpecificCategory(QuizCategory):
-    def __init__(self, questions: List[Dict], category: str):
+    def __init__(self, questions: List[Dict], category: str,
+                 question_stats: "QuestionStats" = None):
         """
         Initializes a SpecificCategory with a list of questions and a category.
 
         Args:
             questions (List[Dict]): A list of dictionaries, each representing a question.
             category (str): Category name as a string.
+            question_stats (QuestionStats, optional): Enables adaptive selection.
 
         """
-        super().__init__(questions)
+        super().__init__(questions, question_stats)
         self.category = category
-        self.questions = [
-            question for question in questions
-            if question["category"].lower() == self.category
-        ]
+        self.source = questions
+        if hasattr(questions, "filter_category"):
+            # A ColumnarQuestionStore selects the category from its columns.
+            self.questions = questions.filter_category(category)
+        else:
+            self.questions = [
+                question for question in questions
+                if question["category"].lower() == self.category
+            ]
 
     def load_questions(self) -> List[Dict]:
         """
@@ -116,7 +148,7 @@ class SpecificCategory(QuizCategory):
             in the category. The length of the list is at most 20, depending
             on the number of available questions.
         """
-        return random.sample(self.questions, min(20, len(self.questions)))
+        return self._sample(self.source, self.category)
 
 
 
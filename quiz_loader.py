@@ -3,6 +3,7 @@ import os
 from typing import List, Dict
 from abc import ABC, abstractmethod
 from colorama import Fore, Style
+import metrics
 
 
 class IQuizLoader(ABC):
@@ -16,8 +17,43 @@ class IQuizLoader(ABC):
         """
         pass
 
+    def load_category_questions(self, category: str) -> List[Dict]:
+        """
+        Loads the questions of a single category.
+
+        Loaders backed by per-category storage override this to read only
+        the requested category.
+
+        Args:
+            category (str): The category to load.
+
+        Returns:
+            List[Dict]: List of questions in the category.
+        """
+        return [
+            question for question in self.load_questions()
+            if question["category"] == category
+        ]
+
+    def load_categories(self) -> List[str]:
+        """
+        Returns the categories of the questions, in no particular order.
+
+        Loaders that index or partition their questions by category
+        override this to list them without reading every question.
+
+        Returns:
+            List[str]: The distinct categories.
+        """
+        questions = self.load_questions()
+        if hasattr(questions, "categories"):
+            # Column stores and the shared bank list their categories.
+            return list(questions.categories)
+        return list({question["category"] for question in questions})
+
 
 class QuizLoader(IQuizLoader):
+    @metrics.timed("questions_load")
     def load_questions(self) -> List[Dict]:
         """
         Loads questions from a json file.
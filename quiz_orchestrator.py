@@ -1,11 +1,34 @@
-from rich.console import Console
-from rich.table import Table
+import time
+from typing import TYPE_CHECKING
 from quiz_loader import IQuizLoader
 from quiz_category import MixedCategory, SpecificCategory
 from quiz_result_manager import IQuizResultManager
 from user_manager import IUserManager
 from colorama import Fore, Style
-from victorine_utility import VictorineUtilityMenu, QuizDataManager
+import metrics
+from answer_grading import is_correct_answer
+
+from menu_renderer import IMenuRenderer
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from answer_log import AnswerLog
+    from question_stats import QuestionStats
+    from victorine_utility import IQuizDataManager, VictorineUtilityMenu
+
+MAIN_MENU = (
+    ("1", "Вхід"),
+    ("2", "Реєстрація"),
+    ("3", "Вихід"),
+)
+USER_MENU = (
+    ("1", "Стартувати нову вікторину"),
+    ("2", "Переглянути результати своїх минулих вікторин"),
+    ("3", "Подивитися топ-20 за конкретною вікториною"),
+    ("4", "Змінити налаштування (пароль, дата народження)"),
+    ("5", "Вихід"),
+)
+ADMIN_MENU = USER_MENU + (("0", "Редагування"),)
 
 
 class QuizOrchestrator:
@@ -14,25 +37,75 @@ class QuizOrchestrator:
         user_manager: IUserManager,
         result_manager: IQuizResultManager,
         quiz_loader: IQuizLoader,
-        console: Console = Console(),
-        quiz_data_manager: QuizDataManager = QuizDataManager(),
-
+        console: "Console" = None,
+        quiz_data_manager: "IQuizDataManager" = None,
+        menu_renderer: IMenuRenderer = None,
+        answer_log: "AnswerLog" = None,
+        question_stats: "QuestionStats" = None,
     ):
         """
         Initializes a QuizOrchestrator instance.
 
+        Nothing heavy is created here: the console and the admin utility
+        (with its data manager) are created on first use.
+
         Args:
             user_manager: An object implementing IUserManager, to manage users.
             result_manager: An object implementing IQuizResultManager, to handle quiz results.
             quiz_loader: An object implementing IQuizLoader, to load questions.
             console: A Console object to print tables. Defaults to Console().
             quiz_data_manager: A QuizDataManager object to manage quiz data. Defaults to QuizDataManager().
+            menu_renderer: An IMenuRenderer used to draw menus and tables.
+                Defaults to a RichMenuRenderer on `console`.
+            answer_log: An AnswerLog receiving every answer given in a quiz,
+                with its response time. Answers are not logged if omitted.
+            question_stats: QuestionStats updated with every answer and
+                saved after each quiz. If given, quizzes are balanced by
+                difficulty (see QuizCategory.get_questions).
         """
-        self.victorine_utility = VictorineUtilityMenu(quiz_data_manager)
         self.user_manager = user_manager
         self.result_manager = result_manager
         self.quiz_loader = quiz_loader
-        self.console = console
+        self._console = console
+        self._quiz_data_manager = quiz_data_manager
+        self._menu_renderer = menu_renderer
+        self.answer_log = answer_log
+        self.question_stats = question_stats
+        self._victorine_utility = None
+
+    @property
+    def console(self) -> "Console":
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    @console.setter
+    def console(self, console: "Console"):
+        self._console = console
+
+    @property
+    def menu_renderer(self) -> IMenuRenderer:
+        if self._menu_renderer is None:
+            from menu_renderer import RichMenuRenderer
+            self._menu_renderer = RichMenuRenderer(self.console)
+        return self._menu_renderer
+
+    @property
+    def victorine_utility(self) -> "VictorineUtilityMenu":
+        """
+        The admin utility menu, imported and created on first access since
+        only administrators use it.
+        """
+        if self._victorine_utility is None:
+            from victorine_utility import QuizDataManager, VictorineUtilityMenu
+            quiz_data_manager = self._quiz_data_manager
+            if quiz_data_manager is None:
+                quiz_data_manager = QuizDataManager()
+            self._victorine_utility = VictorineUtilityMenu(
+                quiz_data_manager, self.console, self.menu_renderer
+            )
+        return self._victorine_utility
 
     def display_main_menu(self):
         """
@@ -47,13 +120,7 @@ class QuizOrchestrator:
 
         :return: None
         """
-        table = Table(title="Головне меню")
-        table.add_column()
-        table.add_column()
-        table.add_row("1", f"Вхід")
-        table.add_row("2", "Реєстрація")
-        table.add_row("3", "Вихід")
-        self.console.print(table)
+        self.menu_renderer.print_menu("Головне меню", MAIN_MENU)
 
     def display_user_menu(self, is_admin: bool = False):
         """
@@ -77,33 +144,22 @@ class QuizOrchestrator:
         :param is_admin: Whether the user is an administrator. Defaults to False.
         :return: None
         """
-        table = Table(title="Меню користувача")
-        table.add_column()
-        table.add_column()
-        table.add_row("1", "Стартувати нову вікторину")
-        table.add_row("2", "Переглянути результати своїх минулих вікторин")
-        table.add_row("3", "Подивитися топ-20 за конкретною вікториною")
-        table.add_row("4", "Змінити налаштування (пароль, дата народження)")
-        table.add_row("5", "Вихід")
-        if is_admin:
-            table.add_row("0", "Редагування")
-
-        self.console.print(table)
+        self.menu_renderer.print_menu(
+            "Меню користувача", ADMIN_MENU if is_admin else USER_MENU
+        )
 
     def get_unique_categories(self):
         """Returns a sorted list of unique categories from the questions dataset."""
         try:
-            questions = self.quiz_loader.load_questions()
-            if not questions:
+            # The loader may list them without reading every question.
+            categories = self.quiz_loader.load_categories()
+            if not categories:
                 raise ValueError(
                     f"{Fore.RED}"
                     f"Немає доступних питань!"
                     f"{Style.RESET_ALL}"
                 )
-            categories = set(
-                question["category"] for question in questions
-            )
-            return sorted(categories)
+            return sorted(set(categories))
         except Exception as e:
             print(f"{Fore.RED}"
                   f"Помилка при завантаженні категорій: {str(e)}"
@@ -121,21 +177,18 @@ class QuizOrchestrator:
 
         The menu is displayed as a table with two columns: the left column contains the option number,
         and the right column contains a description of the option. The user can then enter the number
-        of the desired option to select it.
+        of the desired option to select it. The rendered menu is reused while the
+        category list stays the same.
 
         :param categories: The list of categories to display in the menu.
         :return: None
         """
-        unique_categories = self.get_unique_categories()
-
-        table = Table(title="Вибір категорії")
-        table.add_column()
-        table.add_column()
-
-        for idx, category in enumerate(unique_categories, 1):
-            table.add_row(str(idx), category.capitalize())
-        table.add_row(str(len(unique_categories) + 1), "Змішана")
-        self.console.print(table)
+        rows = [
+            (str(idx), category.capitalize())
+            for idx, category in enumerate(categories, 1)
+        ]
+        rows.append((str(len(categories) + 1), "Змішана"))
+        self.menu_renderer.print_menu("Вибір категорії", rows)
 
     def start_quiz(self, login: str, category: str):
         """
@@ -145,7 +198,8 @@ class QuizOrchestrator:
 
         The method first loads the questions for the specified category.
         If the category is "Змішана", the method loads all available questions.
-        Otherwise, it loads only the questions for the specified category.
+        Otherwise, it loads only the questions for the specified category
+        (see `IQuizLoader.load_category_questions`).
 
         Then, the method prints a message to the user to inform them that the quiz has started.
         It then iterates over the questions and prints each question to the user.
@@ -159,7 +213,10 @@ class QuizOrchestrator:
         :return: None
         """
         try:
-            questions = self.quiz_loader.load_questions()
+            if category == "Змішана":
+                questions = self.quiz_loader.load_questions()
+            else:
+                questions = self.quiz_loader.load_category_questions(category)
             if not questions:
                 raise ValueError(
                     f"{Fore.RED}"
@@ -172,9 +229,10 @@ class QuizOrchestrator:
                   f"{Style.RESET_ALL}")
 
             if category == "Змішана":
-                quiz_category = MixedCategory(questions)
+                quiz_category = MixedCategory(questions, self.question_stats)
             else:
-                quiz_category = SpecificCategory(questions, category)
+                quiz_category = SpecificCategory(questions, category,
+                                                 self.question_stats)
 
             quiz_category.load_questions()
             questions = quiz_category.get_questions()
@@ -192,19 +250,23 @@ class QuizOrchestrator:
                 for i, option in enumerate(question["options"], 1):
                     print(f"{i}. {option}")
 
-                answer = input(
-                    f"{Fore.YELLOW}"
-                    f"Виберіть правильну відповідь (або кілька, через кому): "
-                    f"{Style.RESET_ALL}"
-                )
-
-                correct_answers = set([str(i + 1) for i in
-                                       range(len(question["options"])) if
-                                       question["options"][i]
-                                       in question["correct_answers"]])
-                user_answers = set(answer.split(','))
-
-                if user_answers == correct_answers:
+                asked = time.perf_counter()
+                with metrics.span("answer_wait"):
+                    answer = input(
+                        f"{Fore.YELLOW}"
+                        f"Виберіть правильну відповідь (або кілька, через кому): "
+                        f"{Style.RESET_ALL}"
+                    )
+                response_ms = int((time.perf_counter() - asked) * 1000)
+
+                correct = is_correct_answer(question, answer)
+                if self.answer_log is not None:
+                    self.answer_log.record(login, question.get("id"), answer,
+                                           correct, response_ms)
+                if self.question_stats is not None:
+                    self.question_stats.record(question.get("id"), correct,
+                                               response_ms)
+                if correct:
                     print(f"{Fore.GREEN}"
                           f"Правильна відповідь!"
                           f"{Style.RESET_ALL}")
@@ -217,10 +279,33 @@ class QuizOrchestrator:
                   f"{Style.RESET_ALL}")
 
             self.result_manager.save_quiz_result(login, category, score)
+
+            percent = self.result_manager.get_percentile(category, score)
+            if percent is not None:
+                print(f"{Fore.BLUE}"
+                      f"Ви випередили {int(percent)}% гравців у цій категорії"
+                      f"{Style.RESET_ALL}")
         except Exception as e:
             print(f"{Fore.RED}"
                   f"Помилка під час запуску вікторини: {str(e)}"
                   f"{Style.RESET_ALL}")
+        finally:
+            self._save_answer_data()
+
+    def _save_answer_data(self):
+        """
+        Writes the answers of the last quiz to the answer log and the
+        question statistics, if they are enabled.
+        """
+        try:
+            if self.answer_log is not None:
+                self.answer_log.flush()
+            if self.question_stats is not None:
+                self.question_stats.save()
+        except OSError as e:
+            print(f"{Fore.RED}"
+                  f"Не вдалося записати статистику відповідей: {str(e)}"
+                  f"{Style.RESET_ALL}")
 
     def display_results(self, login: str):
         """
@@ -247,14 +332,10 @@ class QuizOrchestrator:
             return
 
         for category, results in quiz_results.items():
-            table = Table(title=f"Результати для категорії {category}")
-            table.add_column("Date", justify="center")
-            table.add_column("Score", justify="center")
-
-            for result in results:
-                table.add_row(result["date"], str(result["score"]))
-
-            self.console.print(table)
+            self.menu_renderer.print_table(
+                f"Результати для категорії {category}", ("Date", "Score"),
+                [(result["date"], str(result["score"])) for result in results]
+            )
 
     def display_top_20(self, category: str):
         """
@@ -276,16 +357,14 @@ class QuizOrchestrator:
 
         top_scores = self.result_manager.get_top_20(category)
 
-        table = Table(title=f"Топ-20 для категорії {category}")
-        table.add_column("Place", justify="center")
-        table.add_column("User", justify="center")
-        table.add_column("Score", justify="center")
-        table.add_column("Date", justify="center")
-
-        for idx, (user, score, date) in enumerate(top_scores, 1):
-            table.add_row(str(idx), user, str(score), date)
-
-        self.console.print(table)
+        self.menu_renderer.print_table(
+            f"Топ-20 для категорії {category}",
+            ("Place", "User", "Score", "Date"),
+            [
+                (str(idx), user, str(score), date)
+                for idx, (user, score, date) in enumerate(top_scores, 1)
+            ]
+        )
 
     def main_menu(self):
         """
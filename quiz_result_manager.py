@@ -1,7 +1,16 @@
-from typing import Dict, List, Tuple
+import bisect
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from user_manager import IUserManager
 from abc import ABC, abstractmethod
+from warm_start import file_fingerprint
+from rw_lock import RWLock
+import metrics
+
+if TYPE_CHECKING:
+    from quantile_sketch import PercentileIndex
+
+MIXED_CATEGORY = "Змішана"
 
 
 class IQuizResultManager(ABC):
@@ -9,6 +18,26 @@ class IQuizResultManager(ABC):
     def save_quiz_result(self, login: str, category: str, score: int):
         pass
 
+    def save_quiz_results(self, results: Iterable[Tuple[str, str, int, str]]) -> int:
+        """
+        Saves many quiz results at once.
+
+        Managers that can write a batch with a single save override this;
+        the default saves the results one by one, with the current date.
+
+        Args:
+            results: (login, category, score, date) tuples; a date of None
+                means now.
+
+        Returns:
+            int: The number of saved results.
+        """
+        saved = 0
+        for login, category, score, _ in results:
+            self.save_quiz_result(login, category, score)
+            saved += 1
+        return saved
+
     @abstractmethod
     def get_user_results(self, login: str) -> Dict:
         pass
@@ -17,16 +46,227 @@ class IQuizResultManager(ABC):
     def get_top_20(self, category: str) -> List[Tuple[str, int, str]]:
         pass
 
+    def get_percentile(self, category: str, score: int,
+                       window: str = None) -> Optional[float]:
+        """
+        Returns the percentage of results of a category (of all categories
+        for the mixed one) that are lower than `score`, for messages such as
+        "you beat 83% of players".
+
+        Managers able to rank scores override this; the default has no data
+        to rank against and returns None.
+
+        Args:
+            category (str): The category.
+            score (int): The score to rank.
+            window (str, optional): A time window such as "2025-01"; all
+                time if omitted.
+
+        Returns:
+            Optional[float]: The percentage, or None if unknown.
+        """
+        return None
+
+
+class LeaderboardIndex:
+    def __init__(self, source_path: str = None, size: int = 20):
+        """
+        Initializes an empty leaderboard index.
+
+        The index keeps only the best `size` results of every category and
+        of the mixed leaderboard, so reading a top list does not require
+        loading the user data.
+
+        Args:
+            source_path (str, optional): The user data file the index is
+                built from; used to detect changes made by other processes.
+            size (int): The number of results kept per leaderboard.
+        """
+        self.source_path = source_path
+        self.size = size
+        self.fingerprint = None
+        self._top = {}
+        self._counts = {}
+        self._sequence = 0
+
+    @classmethod
+    def from_users(cls, users: Dict, source_path: str = None, size: int = 20):
+        """
+        Builds an index from user data as returned by load_user_data.
+
+        Args:
+            users (Dict): The user data.
+            source_path (str, optional): The file `users` was read from.
+            size (int): The number of results kept per leaderboard.
+
+        Returns:
+            LeaderboardIndex: The built index.
+        """
+        index = cls(source_path, size)
+        index.rebuild(users)
+        return index
+
+    def rebuild(self, users: Dict, fingerprint=None):
+        """
+        Replaces the content of the index with the results in `users`.
+
+        Args:
+            users (Dict): The user data.
+            fingerprint: The fingerprint of the source file taken before
+                `users` was read. Taken now if omitted.
+        """
+        if fingerprint is None and self.source_path:
+            fingerprint = file_fingerprint(self.source_path)
+        self.fingerprint = fingerprint
+        self._top = {}
+        self._counts = {}
+        self._sequence = 0
+        for user, data in users.items():
+            for category, results in data.get("quiz_results", {}).items():
+                for result in results:
+                    self.add(user, category, result["score"], result["date"])
+
+    def _insert(self, category, entry):
+        self._counts[category] = self._counts.get(category, 0) + 1
+        top = self._top.setdefault(category, [])
+        if len(top) < self.size or entry < top[-1]:
+            bisect.insort(top, entry)
+            del top[self.size:]
+
+    def add(self, login: str, category: str, score: int, date: str):
+        """
+        Adds a result to the category leaderboard and to the mixed one.
+
+        Results with equal scores keep the order in which they were added,
+        as with a stable sort of all results.
+        """
+        entry = (-score, self._sequence, login, date)
+        self._sequence += 1
+        self._insert(category, entry)
+        if category != MIXED_CATEGORY:
+            self._insert(MIXED_CATEGORY, entry)
+
+    def top(self, category: str) -> List[Tuple[str, int, str]]:
+        """
+        Returns the best results of a category, or of all categories for
+        the mixed category.
+
+        Returns:
+            List[Tuple[str, int, str]]: Tuples of login, score and date.
+        """
+        return [
+            (login, -negative_score, date)
+            for negative_score, _, login, date in self._top.get(category, [])
+        ]
+
+    def categories(self) -> List[str]:
+        return sorted(self._top)
+
+    def count(self, category: str) -> int:
+        """
+        Returns the number of results of a category, or of all categories
+        for the mixed category.
+        """
+        return self._counts.get(category, 0)
+
+    def is_current(self) -> bool:
+        """
+        Returns True if the source file has not changed since the index was
+        last synchronized with it.
+        """
+        return (self.source_path is not None
+                and file_fingerprint(self.source_path) == self.fingerprint)
+
+    def mark_current(self):
+        """
+        Records the current state of the source file as the one the index
+        reflects; called after the index and the file were updated together.
+        """
+        if self.source_path:
+            self.fingerprint = file_fingerprint(self.source_path)
+
 
 class QuizResultManager(IQuizResultManager):
-    def __init__(self, user_manager: IUserManager):
+    def __init__(self, user_manager: IUserManager,
+                 leaderboard_index: LeaderboardIndex = None,
+                 percentile_index: "PercentileIndex" = None):
         """
         Initializes a QuizResultManager instance.
 
         Args:
             user_manager: An object implementing IUserManager, to manage users.
+            leaderboard_index: An optional LeaderboardIndex. When given,
+                get_top_20 is answered from the index as long as the user
+                data file has not been changed by someone else, and saved
+                results are added to it.
+            percentile_index: An optional PercentileIndex (see
+                quantile_sketch), kept up to date the same way; when given,
+                get_percentile is estimated from its sketches instead of
+                ranking every result.
+
+        The manager can be shared by the threads of a thread pool. Saves
+        hold the user manager's `locked_for_update` for the whole
+        read-modify-write cycle, so they are serialized; the indexes are
+        guarded by a readers-writer lock, so top lists and percentiles are
+        read by any number of threads at once and only wait while an index
+        is updated. The user manager's lock is always taken before the
+        index lock.
         """
         self.user_manager = user_manager
+        self.leaderboard_index = leaderboard_index
+        self.percentile_index = percentile_index
+        self._index_lock = RWLock()
+        self._saving = 0
+
+    def _indexes(self) -> list:
+        return [index for index in (self.leaderboard_index,
+                                    self.percentile_index)
+                if index is not None]
+
+    def _save_and_index(self, users: Dict, saved: List[Tuple[str, str, int, str]]):
+        """
+        Saves the user data and adds the saved results to the indexes.
+        An index that was already behind the file is rebuilt instead.
+        """
+        with self._index_lock.write_locked():
+            current = [index.is_current() for index in self._indexes()]
+            self._saving += 1
+        try:
+            self.user_manager.save_user_data(users)
+        except BaseException:
+            with self._index_lock.write_locked():
+                self._saving -= 1
+            raise
+
+        with self._index_lock.write_locked():
+            self._saving -= 1
+            for index, was_current in zip(self._indexes(), current):
+                if not was_current:
+                    index.rebuild(users)
+                    continue
+                for entry in saved:
+                    index.add(*entry)
+                index.mark_current()
+
+    def _refresh(self, index):
+        """
+        Rebuilds an index from the user data if the file was changed by
+        someone else. The data is loaded before the index lock is taken,
+        keeping the lock order of saves.
+
+        While a save of this manager is writing the file, the file looks
+        changed, but the index is about to be updated by the save: readers
+        use it as it is instead of waiting to rebuild it.
+        """
+        with self._index_lock.read_locked():
+            if index.is_current() or self._saving:
+                return
+        fingerprint = file_fingerprint(index.source_path)
+        users = self.user_manager.load_user_data()
+        with self._index_lock.write_locked():
+            # Another thread may have brought it up to date meanwhile.
+            if not index.is_current():
+                index.rebuild(users, fingerprint)
 
     def save_quiz_result(self, login, category, score):
         """
@@ -41,23 +281,61 @@ class QuizResultManager(IQuizResultManager):
             category (str): The category of the quiz.
             score (int): The user's score in the quiz.
         """
-        users = self.user_manager.load_user_data()
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        result = {
-            "category": category,
-            "score": score,
-            "date": now
-        }
+        with self.user_manager.locked_for_update():
+            users = self.user_manager.load_user_data()
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            result = {
+                "category": category,
+                "score": score,
+                "date": now
+            }
+
+            if "quiz_results" not in users[login]:
+                users[login]["quiz_results"] = {}
 
-        if "quiz_results" not in users[login]:
-            users[login]["quiz_results"] = {}
+            if category not in users[login]["quiz_results"]:
+                users[login]["quiz_results"][category] = []
 
-        if category not in users[login]["quiz_results"]:
-            users[login]["quiz_results"][category] = []
+            users[login]["quiz_results"][category].append(result)
 
-        users[login]["quiz_results"][category].append(result)
+            self._save_and_index(users, [(login, category, score, now)])
 
-        self.user_manager.save_user_data(users)
+    def save_quiz_results(self, results):
+        """
+        Saves many quiz results with one read and one write of the user
+        data file, e.g. the graded sheets of an offline exam.
+
+        Results of unknown users are skipped.
+
+        Args:
+            results: (login, category, score, date) tuples; a date of None
+                means now.
+
+        Returns:
+            int: The number of saved results.
+        """
+        with self.user_manager.locked_for_update():
+            users = self.user_manager.load_user_data()
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            saved = []
+            for login, category, score, date in results:
+                if login not in users:
+                    continue
+                result = {
+                    "category": category,
+                    "score": score,
+                    "date": date or now
+                }
+                users[login].setdefault("quiz_results", {}).setdefault(
+                    category, []
+                ).append(result)
+                saved.append((login, category, score, result["date"]))
+
+            if not saved:
+                return 0
+
+            self._save_and_index(users, saved)
+        return len(saved)
 
     def get_user_results(self, login):
         """
@@ -75,13 +353,27 @@ class QuizResultManager(IQuizResultManager):
         users = self.user_manager.load_user_data()
         return users.get(login, {}).get("quiz_results", {})
 
+    def get_leaderboard_index(self) -> LeaderboardIndex:
+        """
+        Returns the leaderboard index, first rebuilding it if the user data
+        file was changed by someone else. Without an index, one is built
+        from the user data for this call.
+        """
+        index = self.leaderboard_index
+        if index is None:
+            return LeaderboardIndex.from_users(self.user_manager.load_user_data())
+        self._refresh(index)
+        return index
+
+    @metrics.timed("top_20")
     def get_top_20(self, category):
         """
         Retrieve top 20 quiz results for a specific category.
 
         This method fetches the top 20 quiz results for the given category.
         If the category is "Змішана", it fetches the top 20 results from all categories.
-        It returns a list of tuples, each containing the user's login, score and date of the quiz.
+        With a leaderboard index that is up to date with the user data file, no
+        user data is loaded. It returns a list of tuples, each containing the user's login, score and date of the quiz.
 
         Args:
             category (str): The category for which to retrieve the top 20 quiz results.
@@ -89,7 +381,13 @@ class QuizResultManager(IQuizResultManager):
         Returns:
             List[Tuple[str, int, str]]: A list of tuples, each containing the user's login, score and date of the quiz.
         """
+        if self.leaderboard_index is not None:
+            self._refresh(self.leaderboard_index)
+            with self._index_lock.read_locked():
+                return self.leaderboard_index.top(category)
+
         users = self.user_manager.load_user_data()
+
         all_scores = []
 
         if category == "Змішана":
@@ -110,4 +408,42 @@ class QuizResultManager(IQuizResultManager):
                         )
 
         all_scores.sort(key=lambda x: x[1], reverse=True)
-        return all_scores[:20]
\ No newline at end of file
+        return all_scores[:20]
+
+    def get_percentile(self, category, score, window=None):
+        """
+        Returns the percentage of results of a category (of all categories
+        for the mixed one) that are lower than `score`.
+
+        With a percentile index the answer is estimated from its sketches,
+        within about 1%, after rebuilding the index if the user data file
+        was changed by someone else. Without one, every result is ranked
+        exactly.
+
+        Args:
+            category (str): The category.
+            score (int): The score to rank.
+            window (str, optional): A time window such as "2025-01" (see
+                PercentileIndex); all time if omitted.
+
+        Returns:
+            Optional[float]: The percentage, or None if there are no results.
+        """
+        index = self.percentile_index
+        if index is not None:
+            self._refresh(index)
+            with self._index_lock.read_locked():
+                return index.percentile(category, score, window)
+
+        users = self.user_manager.load_user_data()
+        total = lower = 0
+        for data in users.values():
+            for cat, results in data.get("quiz_results", {}).items():
+                if category != MIXED_CATEGORY and cat != category:
+                    continue
+                for result in results:
+                    if window is not None and not result["date"].startswith(window):
+                        continue
+                    total += 1
+                    lower += result["score"] < score
+        return 100 * lower / total if total else None
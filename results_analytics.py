@@ -0,0 +1,376 @@
+import codecs
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from colorama import Fore, Style
+
+READ_SIZE = 1 << 20
+PERCENTILES = (50, 90, 99)
+REPORTS = ("categories", "histogram", "daily")
+
+_decoder = json.JSONDecoder()
+_SEPARATOR = re.compile(r"[\s,]*")
+_COLON = re.compile(r"\s*:\s*")
+
+
+class ResultStats:
+    def __init__(self):
+        """
+        Initializes empty aggregates of quiz results.
+
+        Everything kept here is bounded by the number of categories, days
+        and distinct scores, not by the number of results:
+
+        - per category, a histogram of scores. Scores are small integers,
+          so the histogram is exact and gives exact percentiles;
+        - per day, the number of quizzes, the sum of their scores and the
+          number of players who played that day.
+
+        Aggregates of different shards are combined with `merge`.
+        """
+        self.users = 0
+        self.histograms: Dict[str, Counter] = defaultdict(Counter)
+        self.daily_quizzes: Counter = Counter()
+        self.daily_scores: Counter = Counter()
+        self.daily_players: Counter = Counter()
+
+    def add_user(self, user: Dict):
+        """
+        Adds the quiz results of one user.
+        """
+        self.users += 1
+        days = set()
+        for category, results in user.get("quiz_results", {}).items():
+            histogram = self.histograms[category]
+            for result in results:
+                score = result["score"]
+                histogram[score] += 1
+                day = result.get("date", "")[:10]
+                self.daily_quizzes[day] += 1
+                self.daily_scores[day] += score
+                days.add(day)
+        # Results are grouped by user, so a player is counted once per day
+        # without remembering who played.
+        self.daily_players.update(days)
+
+    def merge(self, other: "ResultStats"):
+        self.users += other.users
+        for category, histogram in other.histograms.items():
+            self.histograms[category].update(histogram)
+        self.daily_quizzes.update(other.daily_quizzes)
+        self.daily_scores.update(other.daily_scores)
+        self.daily_players.update(other.daily_players)
+
+    @property
+    def results(self) -> int:
+        return sum(self.daily_quizzes.values())
+
+    def category_rows(self) -> List[Dict]:
+        """
+        Returns the number of quizzes, mean, minimum, maximum and
+        percentiles of the scores of every category.
+        """
+        rows = []
+        for category in sorted(self.histograms):
+            histogram = self.histograms[category]
+            count = sum(histogram.values())
+            row = {
+                "category": category,
+                "quizzes": count,
+                "mean": round(sum(score * n for score, n in histogram.items())
+                              / count, 3),
+                "min": min(histogram),
+                "max": max(histogram),
+            }
+            for p in PERCENTILES:
+                row[f"p{p}"] = percentile(histogram, p)
+            rows.append(row)
+        return rows
+
+    def histogram_rows(self) -> List[Dict]:
+        return [
+            {"category": category, "score": score, "count": count}
+            for category in sorted(self.histograms)
+            for score, count in sorted(self.histograms[category].items())
+        ]
+
+    def daily_rows(self) -> List[Dict]:
+        return [
+            {
+                "date": day,
+                "players": self.daily_players[day],
+                "quizzes": self.daily_quizzes[day],
+                "mean_score": round(self.daily_scores[day]
+                                    / self.daily_quizzes[day], 3),
+            }
+            for day in sorted(self.daily_quizzes)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "users": self.users,
+            "results": self.results,
+            "categories": self.category_rows(),
+            "histogram": self.histogram_rows(),
+            "daily": self.daily_rows(),
+        }
+
+
+def percentile(histogram: Counter, p: float):
+    """
+    Returns the p-th percentile (nearest rank) of the values counted in a
+    histogram.
+    """
+    total = sum(histogram.values())
+    rank = max(1, math.ceil(p / 100 * total))
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+    return None
+
+
+def iter_members(file_path: str, start: int = 0, end: Optional[int] = None,
+                 read_size: int = READ_SIZE) -> Iterator[Tuple[str, Dict]]:
+    """
+    Streams the (login, user) members of the top-level object of a
+    users.json file without loading the file.
+
+    The file is read in blocks and every member is decoded with
+    JSONDecoder.raw_decode as soon as it is complete, so memory holds one
+    block and one user, whatever the size of the file.
+
+    Args:
+        file_path (str): The users file.
+        start (int): The byte offset to start at: 0, or a member boundary
+            returned by `shard_offsets`.
+        end (int, optional): The byte offset to stop at, also a member
+            boundary. Defaults to the end of the file.
+        read_size (int): The block size in bytes.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(file_path, "rb") as file:
+        if end is None:
+            end = os.fstat(file.fileno()).st_size
+        file.seek(start)
+        remaining = end - start
+
+        def read():
+            nonlocal remaining
+            block = file.read(min(read_size, remaining))
+            remaining -= len(block)
+            return decoder.decode(block, final=not remaining)
+
+        buffer = read()
+        position = 0
+        if start == 0:
+            # Skip to the opening brace of the top-level object.
+            while "{" not in buffer and remaining:
+                buffer += read()
+            position = buffer.find("{") + 1
+            if not position:
+                raise json.JSONDecodeError("Expecting '{'", buffer, 0)
+
+        while True:
+            position = _SEPARATOR.match(buffer, position).end()
+            if buffer.startswith("}", position):
+                return
+            try:
+                login, key_end = _decoder.raw_decode(buffer, position)
+                if not isinstance(login, str):
+                    raise json.JSONDecodeError(
+                        "Expecting property name", buffer, position
+                    )
+                colon = _COLON.match(buffer, key_end)
+                if colon is None:
+                    raise json.JSONDecodeError("Expecting ':'", buffer, key_end)
+                value_start = colon.end()
+                user, position = _decoder.raw_decode(buffer, value_start)
+            except json.JSONDecodeError:
+                if not remaining:
+                    if position < len(buffer):
+                        raise
+                    return
+                buffer = buffer[position:] + read()
+                position = 0
+                continue
+            yield login, user
+
+
+def _member_indent(file_path: str) -> Optional[bytes]:
+    """
+    Returns the indentation of the top-level members of a users file, or
+    None if a member does not start a line (e.g. a single-line file).
+    """
+    with open(file_path, "rb") as file:
+        head = file.read(READ_SIZE)
+    brace = head.find(b"{")
+    match = re.compile(rb"[ \t]*\r?\n([ \t]*)\"[^\n]*\n").match(head, brace + 1)
+    if brace < 0 or match is None:
+        return None
+    indent = match.group(1)
+    # Without indentation, nested lines could look like members too: the
+    # file is split only if each member takes one line.
+    if not indent and not match.group(0).rstrip().endswith((b"}", b"},")):
+        return None
+    return indent
+
+
+def shard_offsets(file_path: str, shards: int) -> List[Tuple[int, int]]:
+    """
+    Splits a users file into byte ranges that each hold whole members.
+
+    JSON strings cannot contain a newline, so in a file with one member
+    per line (as written by generate_data.py) or pretty-printed with
+    json.dump(indent=...) (as written by UserManager), a line starting
+    with the members' indentation and a quote starts a member; deeper
+    lines are indented further. Each split point is moved forward to the
+    next such line. Files of another layout are not split.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) byte ranges covering the file.
+    """
+    size = os.path.getsize(file_path)
+    indent = _member_indent(file_path) if shards > 1 else None
+    if indent is None:
+        return [(0, size)]
+
+    boundaries = [0]
+    member_start = indent + b"\""
+    with open(file_path, "rb") as file:
+        for shard in range(1, shards):
+            offset = max(size * shard // shards, boundaries[-1])
+            file.seek(offset)
+            file.readline()
+            while True:
+                line_start = file.tell()
+                line = file.readline()
+                if not line:
+                    line_start = size
+                    break
+                if line.startswith(member_start):
+                    break
+            # The member's line is the start of the next shard.
+            if line_start > boundaries[-1]:
+                boundaries.append(line_start)
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:])
+        if end > start
+    ]
+
+
+def analyze_shard(task: Tuple[str, int, int]) -> ResultStats:
+    """
+    Aggregates the results of the users in one byte range of a file.
+    """
+    file_path, start, end = task
+    stats = ResultStats()
+    for _, user in iter_members(file_path, start, end):
+        stats.add_user(user)
+    return stats
+
+
+def analyze(file_paths: List[str], workers: int = 1) -> ResultStats:
+    """
+    Aggregates the quiz results of one or more users files.
+
+    Every file is split into up to `workers` shards (see shard_offsets);
+    with more than one worker the shards are aggregated in a process pool
+    and the partial aggregates merged.
+
+    Args:
+        file_paths (List[str]): The users files, e.g. users.json of several
+            servers.
+        workers (int): The number of processes.
+    """
+    tasks = [
+        (file_path, start, end)
+        for file_path in file_paths
+        for start, end in shard_offsets(file_path, workers)
+    ]
+    stats = ResultStats()
+    if workers <= 1 or len(tasks) == 1:
+        for task in tasks:
+            stats.merge(analyze_shard(task))
+        return stats
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(analyze_shard, tasks):
+            stats.merge(partial)
+    return stats
+
+
+def write_report(stats: ResultStats, output, output_format: str = "json",
+                 report: str = "categories"):
+    """
+    Writes the aggregates as JSON (all reports) or as CSV (one report).
+
+    Args:
+        stats (ResultStats): The aggregates.
+        output: A text file object.
+        output_format (str): "json" or "csv".
+        report (str): For CSV, one of REPORTS.
+    """
+    if output_format == "json":
+        json.dump(stats.to_dict(), output, indent=4, ensure_ascii=False)
+        output.write("\n")
+        return
+
+    import csv
+
+    rows = getattr(stats, f"{report}_rows")()
+    fields = list(rows[0]) if rows else []
+    writer = csv.DictWriter(output, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Статистика результатів вікторин за один прохід по users.json."
+    )
+    parser.add_argument("files", nargs="*", default=["users.json"],
+                        help="файли користувачів (за замовчуванням users.json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="кількість процесів; файли діляться на частини")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--report", choices=REPORTS, default="categories",
+                        help="звіт для CSV: categories, histogram або daily")
+    parser.add_argument("-o", "--output", help="файл звіту (за замовчуванням stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        stats = analyze(args.files, args.workers)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"{Fore.RED}Не вдалося прочитати результати: {e}{Style.RESET_ALL}",
+              file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            write_report(stats, output, args.format, args.report)
+        print(f"{Fore.GREEN}Оброблено результатів: {stats.results} "
+              f"({stats.users} користувачів){Style.RESET_ALL}")
+    else:
+        write_report(stats, sys.stdout, args.format, args.report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
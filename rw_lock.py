@@ -0,0 +1,85 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class RWLock:
+    def __init__(self):
+        """
+        Initializes a readers-writer lock.
+
+        Any number of threads may hold the lock for reading at once, while
+        a writer holds it alone. Waiting writers go first: a new reader
+        waits while a writer is waiting, so a steady stream of reads cannot
+        starve the writes.
+
+        The lock is reentrant for the thread holding it: a writer may take
+        it again for reading or writing (a manager's `locked_for_update`
+        cycle calls its own load and save methods), and a reader may read
+        again. A reader asking to write gets a RuntimeError, since two
+        threads upgrading at once would wait for each other forever.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._condition:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("a read lock cannot be upgraded to a write lock")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        with self._condition:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,413 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional
+from colorama import Fore, Style
+
+import metrics
+from question_store import QuestionStoreView
+from quiz_loader import IQuizLoader
+from warm_start import file_fingerprint, is_trusted_file
+
+MAGIC = b"QBNK"
+VERSION = 1
+NO_ID = 0xFFFFFFFF
+SECTIONS = (
+    "string_offsets", "question_category", "question_text", "question_id",
+    "option_offsets", "option_column", "answer_offsets", "answer_column",
+    "category_table", "category_positions", "string_bytes",
+)
+# magic, version, generation, questions, strings, source size, source
+# mtime_ns, then the byte offset of each section and of the end.
+HEADER = struct.Struct(f"<4sIQIIqq{len(SECTIONS) + 1}Q")
+# In the app's data directory rather than a world-writable one such as
+# /dev/shm, where another user could plant a bank under the fixed name.
+# Mapped pages of a file are shared through the page cache all the same.
+DEFAULT_PATH = os.path.join(".quiz_cache", "questions.bank")
+
+
+def _source_stamp(source_path: Optional[str]):
+    try:
+        stat = os.stat(source_path)
+    except (OSError, TypeError):
+        return -1, -1
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_generation(bank_path: str) -> int:
+    """
+    Returns the generation of a published bank, or 0 if there is none.
+    """
+    try:
+        with open(bank_path, "rb") as file:
+            header = file.read(HEADER.size)
+        magic, version, generation = HEADER.unpack(header)[:3]
+    except (OSError, struct.error):
+        return 0
+    return generation if magic == MAGIC else 0
+
+
+def publish(questions: Iterable[Dict], bank_path: str = DEFAULT_PATH,
+            source_stamp=(-1, -1)) -> int:
+    """
+    Compiles a question bank and publishes it at `bank_path`.
+
+    Every string (category, question, option, answer, id) is stored once
+    in a UTF-8 pool; questions refer to strings by number through flat
+    arrays, and the positions of each category's questions are stored
+    too, so readers select a category without scanning. The arrays are in
+    native byte order: the file is meant for processes of one host.
+
+    The bank is written to a temporary file and moved into place, so a
+    process still reading the previous bank keeps its mapping intact and
+    new readers see a complete file. Each publication gets the next
+    generation number.
+
+    Args:
+        questions (Iterable[Dict]): The questions, as in questions.json.
+        bank_path (str): Where to publish, by default in .quiz_cache;
+            the directory is created if needed.
+        source_stamp: The size and modification time of the file the
+            questions came from, recorded so loaders can tell when it has
+            changed.
+
+    Returns:
+        int: The generation of the published bank.
+    """
+    import tempfile
+
+    strings: Dict[str, int] = {}
+    pool = bytearray()
+    string_offsets = array("I", [0])
+
+    def intern(text: str) -> int:
+        number = strings.get(text)
+        if number is None:
+            number = strings[text] = len(string_offsets) - 1
+            pool.extend(text.encode("utf-8"))
+            string_offsets.append(len(pool))
+        return number
+
+    question_category = array("I")
+    question_text = array("I")
+    question_id = array("I")
+    option_offsets = array("I", [0])
+    option_column = array("I")
+    answer_offsets = array("I", [0])
+    answer_column = array("I")
+    by_category: Dict[int, array] = {}
+
+    for position, question in enumerate(questions):
+        category = intern(question["category"])
+        question_category.append(category)
+        by_category.setdefault(category, array("I")).append(position)
+        question_text.append(intern(question["question"]))
+        question_id.append(intern(question["id"]) if question.get("id") else NO_ID)
+        option_column.extend(intern(option) for option in question["options"])
+        option_offsets.append(len(option_column))
+        answer_column.extend(
+            intern(answer) for answer in question["correct_answers"]
+        )
+        answer_offsets.append(len(answer_column))
+
+    category_table = array("I")
+    category_positions = array("I")
+    for category, positions in by_category.items():
+        category_table.extend(
+            (category, len(category_positions),
+             len(category_positions) + len(positions))
+        )
+        category_positions.extend(positions)
+
+    sections = [
+        string_offsets.tobytes(), question_category.tobytes(),
+        question_text.tobytes(), question_id.tobytes(),
+        option_offsets.tobytes(), option_column.tobytes(),
+        answer_offsets.tobytes(), answer_column.tobytes(),
+        category_table.tobytes(), category_positions.tobytes(), bytes(pool),
+    ]
+    offsets = [HEADER.size]
+    for section in sections:
+        offsets.append(offsets[-1] + len(section))
+
+    generation = read_generation(bank_path) + 1
+    header = HEADER.pack(
+        MAGIC, VERSION, generation, len(question_text),
+        len(string_offsets) - 1, *source_stamp, *offsets
+    )
+
+    directory = os.path.dirname(os.path.abspath(bank_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(bank_path)}-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(header)
+            for section in sections:
+                file.write(section)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, bank_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return generation
+
+
+def publish_file(source_path: str = "questions.json",
+                 bank_path: str = DEFAULT_PATH) -> int:
+    """
+    Publishes the questions of a questions.json file.
+    """
+    # Taken before reading, so a change made while the file is read is
+    # noticed by the next load.
+    stamp = _source_stamp(source_path)
+    with open(source_path, "r", encoding="utf-8") as file:
+        questions = json.load(file)["questions"]
+    return publish(questions, bank_path, stamp)
+
+
+class SharedQuestionBank(Sequence):
+    def __init__(self, bank_path: str = DEFAULT_PATH):
+        """
+        Maps a published bank (see `publish`) read-only into memory.
+
+        All processes mapping the same file share its pages, so the bank
+        takes memory once per host instead of once per process. Nothing is
+        parsed: the arrays are memoryviews of the mapping, and a question
+        dict is only built when an item is accessed.
+
+        The bank is a read-only Sequence of question dicts, like
+        ColumnarQuestionStore, and supports `filter_category` and
+        `categories`, so QuizCategory subclasses and the orchestrator use
+        it without building every dict.
+
+        Only a file owned by this process's user or by root, and not
+        writable by others, is mapped: anyone able to write the bank could
+        change the questions and answers of every quiz.
+
+        Raises:
+            FileNotFoundError: If no bank is published at `bank_path`.
+            PermissionError: If the file's owner or mode is not trusted.
+            ValueError: If the file is not a question bank.
+        """
+        self.path = bank_path
+        with open(bank_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            if not is_trusted_file(stat):
+                raise PermissionError(
+                    f"{bank_path} may be changed by another user"
+                )
+            # The fingerprint of the mapped file, as file_fingerprint gives.
+            self.fingerprint = stat.st_ino, stat.st_size, stat.st_mtime_ns
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{bank_path} is not a question bank")
+        (magic, version, self.generation, self._count, _,
+         source_size, source_mtime, *offsets) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or offsets[-1] != len(self._mmap):
+            raise ValueError(f"{bank_path} is not a question bank")
+        self.source_stamp = (source_size, source_mtime)
+
+        view = memoryview(self._mmap)
+        sections = {
+            name: view[start:end]
+            for name, start, end in zip(SECTIONS, offsets, offsets[1:])
+        }
+        self._strings = sections.pop("string_bytes")
+        for name, section in sections.items():
+            setattr(self, f"_{name}", section.cast("I"))
+
+    def _string(self, number: int) -> str:
+        return str(self._strings[
+            self._string_offsets[number]:self._string_offsets[number + 1]
+        ], "utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+
+        options = self._option_column[
+            self._option_offsets[index]:self._option_offsets[index + 1]
+        ]
+        answers = self._answer_column[
+            self._answer_offsets[index]:self._answer_offsets[index + 1]
+        ]
+        question = {
+            "category": self._string(self._question_category[index]),
+            "question": self._string(self._question_text[index]),
+            "options": [self._string(number) for number in options],
+            "correct_answers": [self._string(number) for number in answers],
+        }
+        if self._question_id[index] != NO_ID:
+            question["id"] = self._string(self._question_id[index])
+        return question
+
+    @property
+    def categories(self) -> List[str]:
+        table = self._category_table
+        return [self._string(table[i]) for i in range(0, len(table), 3)]
+
+    def filter_category(self, category: str) -> QuestionStoreView:
+        """
+        Returns the questions whose lower-cased category equals `category`,
+        as SpecificCategory selects them, from the stored category index.
+        """
+        table = self._category_table
+        ranges = [
+            (table[i + 1], table[i + 2]) for i in range(0, len(table), 3)
+            if self._string(table[i]).lower() == category
+        ]
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            return QuestionStoreView(self, self._category_positions[start:end])
+        # Spellings differing only in case are merged in bank order.
+        return QuestionStoreView(self, array("I", sorted(
+            position for start, end in ranges
+            for position in self._category_positions[start:end]
+        )))
+
+
+class SharedBankLoader(IQuizLoader):
+    def __init__(self, bank_path: str = DEFAULT_PATH,
+                 source_path: Optional[str] = "questions.json"):
+        """
+        Initializes a loader returning the shared bank at `bank_path`.
+
+        Each call checks, with one stat, whether a new generation was
+        published and maps it if so. With a `source_path`, the bank is
+        republished from it when it is missing or the source file has
+        changed since the bank was compiled (e.g. after an admin edit), so
+        the first process to notice publishes for all of them. If it cannot
+        (e.g. the bank belongs to another user), the current bank is kept
+        and the same source is not tried again.
+
+        Args:
+            bank_path (str): The published bank.
+            source_path (str, optional): The questions.json the bank is
+                compiled from; None to only read what others publish.
+        """
+        self.bank_path = bank_path
+        self.source_path = source_path
+        self.bank: Optional[SharedQuestionBank] = None
+        self._failed_stamp = None
+        # Category views of self.bank, see load_category_questions.
+        self._views: Dict[str, QuestionStoreView] = {}
+        self._views_bank: Optional[SharedQuestionBank] = None
+
+    def _needs_publishing(self, bank: Optional[SharedQuestionBank]) -> bool:
+        if self.source_path is None or not os.path.exists(self.source_path):
+            return False
+        stamp = _source_stamp(self.source_path)
+        return stamp != self._failed_stamp and (
+            bank is None or stamp != bank.source_stamp
+        )
+
+    def _is_stale(self) -> bool:
+        if self.bank is None or file_fingerprint(self.bank_path) != self.bank.fingerprint:
+            return True
+        return self._needs_publishing(self.bank)
+
+    @metrics.timed("questions_load")
+    def load_questions(self) -> Sequence:
+        """
+        Returns the current shared bank, or an empty list if there is none.
+        """
+        if not self._is_stale():
+            return self.bank
+        if self.bank is not None and (
+                file_fingerprint(self.bank_path) == self.bank.fingerprint):
+            bank = self.bank
+        else:
+            try:
+                bank = SharedQuestionBank(self.bank_path)
+            except (OSError, ValueError):
+                bank = None
+        if self._needs_publishing(bank):
+            stamp = _source_stamp(self.source_path)
+            try:
+                publish_file(self.source_path, self.bank_path)
+                bank = SharedQuestionBank(self.bank_path)
+            except (OSError, ValueError, KeyError) as e:
+                self._failed_stamp = stamp
+                print(f"{Fore.YELLOW}Не вдалося оновити банк питань: {e}"
+                      f"{Style.RESET_ALL}")
+                bank = bank or self.bank
+        if bank is None:
+            print(f"{Fore.RED}Банк питань не опубліковано!{Style.RESET_ALL}")
+            return []
+        self.bank = bank
+        return bank
+
+
+    def load_category_questions(self, category: str) -> Sequence:
+        """
+        Returns the questions of a category as a view of the shared bank,
+        selected from its category index without decoding any question.
+
+        The view is kept until a new bank is mapped, so every quiz on the
+        category gets the same object and reuses what was cached for it
+        (see QuestionStats.bands_for).
+        """
+        bank = self.load_questions()
+        if not isinstance(bank, SharedQuestionBank):
+            return []
+        if bank is not self._views_bank:
+            self._views = {}
+            self._views_bank = bank
+        view = self._views.get(category)
+        if view is None:
+            view = self._views[category] = bank.filter_category(
+                category.lower()
+            )
+        return view
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Спільний банк питань у пам'яті для всіх процесів вікторини."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish_parser = subparsers.add_parser(
+        "publish", help="скомпілювати questions.json і опублікувати банк"
+    )
+    publish_parser.add_argument("source", nargs="?", default="questions.json")
+    publish_parser.add_argument("--bank", default=DEFAULT_PATH)
+    info = subparsers.add_parser("info", help="показати опублікований банк")
+    info.add_argument("--bank", default=DEFAULT_PATH)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.command == "publish":
+            generation = publish_file(args.source, args.bank)
+            print(f"{Fore.GREEN}Опубліковано покоління {generation}: "
+                  f"{args.bank}{Style.RESET_ALL}")
+            return 0
+        bank = SharedQuestionBank(args.bank)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{Fore.RED}Помилка: {e}{Style.RESET_ALL}", file=sys.stderr)
+        return 1
+    print(f"{args.bank}: покоління {bank.generation}, питань {len(bank)}, "
+          f"категорій {len(bank.categories)}, "
+          f"{os.path.getsize(args.bank) / 1024:.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
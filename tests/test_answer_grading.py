@@ -0,0 +1,18 @@
+from answer_grading import correct_option_numbers, is_correct_answer
+
+QUESTIONS = [
+    {"id": "q1", "category": "Math", "question": "2 + 2 = ?",
+     "options": ["3", "4"], "correct_answers": ["4"]},
+    {"id": "q2", "category": "Math", "question": "Even numbers?",
+     "options": ["1", "2", "4"], "correct_answers": ["2", "4"]},
+]
+
+
+def test_correct_option_numbers():
+    assert correct_option_numbers(QUESTIONS[1]) == {"2", "3"}
+
+
+def test_is_correct_answer():
+    assert is_correct_answer(QUESTIONS[0], "2")
+    assert is_correct_answer(QUESTIONS[1], "3,2")
+    assert not is_correct_answer(QUESTIONS[1], "2")
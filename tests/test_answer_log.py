@@ -0,0 +1,146 @@
+import os
+import pytest
+from answer_log import AnswerLog, chosen_mask, decode_question_id, encode_question_id
+
+QUESTION_ID = "0123456789abcdef0123456789abcdef"
+
+
+@pytest.fixture
+def log(tmp_path):
+    return AnswerLog(str(tmp_path / "answers"))
+
+
+def test_chosen_mask():
+    assert chosen_mask("1") == 0b1
+    assert chosen_mask("1,3") == 0b101
+    assert chosen_mask(" 2 , x, 0, 65") == 0b10
+    assert chosen_mask("") == 0
+
+
+def test_question_id_encoding():
+    assert decode_question_id(encode_question_id(QUESTION_ID)) == QUESTION_ID
+    assert len(encode_question_id("q1")) == 16
+    assert decode_question_id(encode_question_id(None)) is None
+
+
+def test_record_and_read_back(log):
+    log.record("alice", QUESTION_ID, "1,2", True, 1500, timestamp_ms=1000)
+    log.record("bob", None, "3", False, 700, timestamp_ms=2000)
+    log.record("alice", QUESTION_ID, "2", False, 300, timestamp_ms=3000)
+    assert len(log) == 0
+    log.flush()
+
+    assert len(log) == 3
+    events = list(AnswerLog(log.directory).iter_events())
+    assert events[0] == {
+        "timestamp_ms": 1000, "login": "alice", "question_id": QUESTION_ID,
+        "chosen": 0b11, "correct": True, "response_ms": 1500,
+    }
+    assert events[1]["login"] == "bob"
+    assert events[1]["question_id"] is None
+    assert [event["login"] for event in events] == ["alice", "bob", "alice"]
+
+    columns = log.read_columns(["correct", "response_ms"])
+    assert list(columns["correct"]) == [1, 0, 0]
+    assert sum(columns["response_ms"]) == 2500
+
+
+def test_columns_are_fixed_width(log):
+    for i in range(10):
+        log.record("alice", QUESTION_ID, "1", True, i)
+    log.flush()
+    assert os.path.getsize(os.path.join(log.directory, "user.bin")) == 40
+    assert os.path.getsize(os.path.join(log.directory, "question.bin")) == 160
+    assert os.path.exists(os.path.join(log.directory, "schema.json"))
+
+
+def test_appends_across_instances(log):
+    log.record("alice", QUESTION_ID, "1", True, 10)
+    log.flush()
+    other = AnswerLog(log.directory)
+    other.record("bob", QUESTION_ID, "2", False, 20)
+    other.record("alice", QUESTION_ID, "2", False, 30)
+    other.flush()
+
+    assert len(other) == 3
+    assert other.logins == ["alice", "bob"]
+    assert [e["login"] for e in AnswerLog(log.directory).iter_events()] == [
+        "alice", "bob", "alice"
+    ]
+
+
+def test_half_written_events_are_cut_off(log):
+    log.record("alice", QUESTION_ID, "1", True, 10)
+    log.flush()
+    with open(os.path.join(log.directory, "chosen.bin"), "ab") as file:
+        file.write(b"\x01" * 8)
+    assert len(log) == 1
+
+    other = AnswerLog(log.directory)
+    other.record("alice", QUESTION_ID, "2", True, 20)
+    other.flush()
+    assert [e["chosen"] for e in other.iter_events()] == [0b1, 0b10]
+
+
+def test_empty_log(log):
+    assert len(log) == 0
+    assert list(log.iter_events()) == []
+    log.flush()
+    assert not os.path.exists(log.directory)
+
+
+def test_writers_number_new_logins_against_the_file(log):
+    # Both writers opened the log before either wrote a login.
+    other = AnswerLog(log.directory)
+    log.record("alice", QUESTION_ID, "1", True, 10)
+    other.record("bob", QUESTION_ID, "2", False, 20)
+    log.flush()
+    other.flush()
+
+    assert AnswerLog(log.directory).logins == ["alice", "bob"]
+    assert [e["login"] for e in AnswerLog(log.directory).iter_events()] == [
+        "alice", "bob"
+    ]
+
+
+def _write_events(directory, login):
+    writer = AnswerLog(directory)
+    for round_ in range(5):
+        for i in range(20):
+            writer.record(login, QUESTION_ID, "1", True, round_ * 20 + i)
+        writer.flush()
+
+
+def test_concurrent_processes(log):
+    import multiprocessing
+
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=_write_events, args=(log.directory, f"user{i}"))
+        for i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    reader = AnswerLog(log.directory)
+    assert len(reader) == 400
+    assert sorted(reader.logins) == ["user0", "user1", "user2", "user3"]
+    events = list(reader.iter_events())
+    for i in range(4):
+        # Every process's events are whole and in order.
+        assert [e["response_ms"] for e in events
+                if e["login"] == f"user{i}"] == list(range(100))
+
+
+def test_memmap_columns(log):
+    pytest.importorskip("numpy")
+    log.record("alice", QUESTION_ID, "1,2", True, 1500, timestamp_ms=1000)
+    log.record("bob", None, "3", False, 700, timestamp_ms=2000)
+    log.flush()
+
+    columns = log.memmap_columns(["user", "chosen", "question"])
+    assert list(columns["user"]) == [0, 1]
+    assert list(columns["chosen"]) == [0b11, 0b100]
+    assert columns["question"][0] == bytes.fromhex(QUESTION_ID)
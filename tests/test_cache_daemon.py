@@ -0,0 +1,226 @@
+import json
+import os
+import stat
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from cache_daemon import (
+    FRAME, CacheDaemon, DaemonClient, DaemonError, DaemonResultManager,
+    DaemonUserManager, LostRequestError, connect
+)
+
+
+@pytest.fixture
+def users_file(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps({
+        "user1": {
+            "password": "password123",
+            "birth_date": "1990-01-01",
+            "quiz_results": {
+                "Історія": [{"category": "Історія", "score": 7,
+                             "date": "2025-01-05 10:00:00"}]
+            }
+        }
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def daemon(tmp_path, users_file):
+    daemon = CacheDaemon(str(tmp_path / "daemon.sock"), str(users_file))
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+    daemon.server_close()
+
+
+@pytest.fixture
+def client(daemon):
+    client = DaemonClient(daemon.socket_path)
+    yield client
+    client.close()
+
+
+def test_socket_is_private(daemon):
+    assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+
+
+def test_pipelined_requests_are_answered_in_order(client):
+    first = client.send("has_user", "user1")
+    second = client.send("has_user", "nobody")
+    assert client.wait(second) is False
+    assert client.wait(first) is True
+    assert client.pipeline([("ping",), ("top_20", "Історія")]) == [
+        "pong", [["user1", 7, "2025-01-05 10:00:00"]]
+    ]
+
+
+def test_requests_split_across_reads(client):
+    # A frame arriving in pieces is answered once complete.
+    request_id, frame = client._frame("ping", [])
+    sock = client._connect()
+    sock.sendall(frame[:FRAME.size - 2])
+    sock.sendall(frame[FRAME.size - 2:])
+    client._in_flight.append(request_id)
+    assert client.wait(request_id) == "pong"
+
+
+def test_error_keeps_connection_usable(client):
+    with pytest.raises(DaemonError, match="KeyError"):
+        client.call("save_result", "nobody", "Історія", 3)
+    assert client.call("ping") == "pong"
+
+
+def test_register_and_login(daemon, users_file):
+    user_manager, _ = connect(daemon.socket_path)
+    with patch("builtins.input", side_effect=["new_user", "pass", "2000-01-01"]):
+        assert user_manager.register_user() == "new_user"
+    with patch("builtins.input", side_effect=["user1"]):
+        assert user_manager.register_user() is None
+    with patch("builtins.input", side_effect=["new_user", "wrong"]):
+        assert user_manager.login_user() is None
+    with patch("builtins.input", side_effect=["new_user", "pass"]):
+        assert user_manager.login_user() == "new_user"
+
+    saved = json.loads(users_file.read_text(encoding="utf-8"))
+    assert saved["new_user"]["birth_date"] == "2000-01-01"
+    user_manager.client.close()
+
+
+def test_results_are_saved_and_indexed(daemon, users_file):
+    user_manager, result_manager = connect(daemon.socket_path)
+    assert isinstance(user_manager, DaemonUserManager)
+    assert isinstance(result_manager, DaemonResultManager)
+
+    result_manager.save_quiz_result("user1", "Історія", 9)
+    assert result_manager.get_percentile("Історія", 9) == 50.0
+    assert result_manager.get_top_20("Історія")[0][:2] == ("user1", 9)
+    assert len(result_manager.get_user_results("user1")["Історія"]) == 2
+    assert result_manager.save_quiz_results([
+        ("user1", "Географія", 4, "2025-02-01 09:00:00"),
+        ("nobody", "Географія", 5, None),
+    ]) == 1
+
+    saved = json.loads(users_file.read_text(encoding="utf-8"))
+    assert len(saved["user1"]["quiz_results"]["Історія"]) == 2
+    assert saved["user1"]["quiz_results"]["Географія"][0]["score"] == 4
+    user_manager.client.close()
+
+
+def test_failed_save_is_raised_by_next_request(client):
+    result_manager = DaemonResultManager(client)
+    result_manager.save_quiz_result("nobody", "Історія", 3)
+    with pytest.raises(DaemonError):
+        result_manager.get_top_20("Історія")
+    assert result_manager.get_top_20("Історія")[0][0] == "user1"
+
+
+def test_external_changes_are_reloaded(client, users_file):
+    assert client.call("top_20", "Історія")[0][1] == 7
+    users = json.loads(users_file.read_text(encoding="utf-8"))
+    users["user1"]["quiz_results"]["Історія"][0]["score"] = 10
+    users_file.write_text(json.dumps(users) + " ", encoding="utf-8")
+    assert client.call("top_20", "Історія")[0][1] == 10
+
+
+def test_second_daemon_is_refused(daemon, users_file):
+    with pytest.raises(OSError):
+        CacheDaemon(daemon.socket_path, str(users_file))
+
+
+def test_stale_socket_is_replaced(tmp_path, users_file):
+    path = str(tmp_path / "daemon.sock")
+    CacheDaemon(path, str(users_file))._listener.close()
+    assert os.path.exists(path)
+    with CacheDaemon(path, str(users_file)) as daemon:
+        assert daemon.socket_path == path
+
+
+def test_connect_without_daemon(tmp_path):
+    with pytest.raises(OSError):
+        connect(str(tmp_path / "missing.sock"))
+
+
+def test_passwords_stay_in_the_daemon(client, users_file):
+    users = client.call("load_users")
+    assert "password" not in users["user1"]
+    users["user1"]["birth_date"] = "1991-02-02"
+    client.call("save_users", users)
+
+    saved = json.loads(users_file.read_text(encoding="utf-8"))
+    assert saved["user1"]["password"] == "password123"
+    assert saved["user1"]["birth_date"] == "1991-02-02"
+    assert client.call("check_password", "user1", "password123")
+
+
+def test_save_lost_with_connection_is_reported(client):
+    result_manager = DaemonResultManager(client)
+    result_manager.save_quiz_result("user1", "Історія", 3)
+    client.close()
+    with pytest.raises(LostRequestError, match="1 quiz result"):
+        result_manager.get_percentile("Історія", 3)
+    assert result_manager.get_top_20("Історія")[0][0] == "user1"
+
+
+def test_client_reconnects_to_restarted_daemon(tmp_path, users_file):
+    path = str(tmp_path / "daemon.sock")
+
+    def start():
+        daemon = CacheDaemon(path, str(users_file))
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        return daemon, thread
+
+    def stop(daemon, thread):
+        daemon.shutdown()
+        thread.join(timeout=5)
+        daemon.server_close()
+
+    client = DaemonClient(path)
+    daemon, thread = start()
+    assert client.call("ping") == "pong"
+    stop(daemon, thread)
+    daemon, thread = start()
+    try:
+        assert client.call("ping") == "pong"
+    finally:
+        client.close()
+        stop(daemon, thread)
+
+
+def test_managers_fall_back_to_file_when_daemon_stops(tmp_path, users_file, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    daemon = CacheDaemon(str(tmp_path / "daemon.sock"), str(users_file))
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    user_manager, result_manager = connect(daemon.socket_path)
+    assert result_manager.get_top_20("Історія")[0][0] == "user1"
+    result_manager.save_quiz_result("user1", "Історія", 3)
+    daemon.shutdown()
+    thread.join(timeout=5)
+    daemon.server_close()
+
+    with patch("builtins.print") as mock_print:
+        assert result_manager.get_top_20("Історія")[0][:2] == ("user1", 7)
+    assert "Демон кешу недоступний" in mock_print.call_args_list[0].args[0]
+    assert result_manager.fallback is user_manager.fallback
+    with patch("builtins.input", side_effect=["user1", "password123"]):
+        assert user_manager.login_user() == "user1"
+    result_manager.save_quiz_result("user1", "Історія", 8)
+
+    saved = json.loads(users_file.read_text(encoding="utf-8"))
+    assert [r["score"] for r in saved["user1"]["quiz_results"]["Історія"]][-1] == 8
+
+
+def test_user_manager_falls_back_mid_prompt(tmp_path, users_file, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    user_manager = DaemonUserManager(DaemonClient(str(tmp_path / "missing.sock")))
+    with patch("builtins.input", side_effect=["user1", "user1", "password123"]), \
+            patch("builtins.print"):
+        assert user_manager.login_user() == "user1"
+    assert user_manager.fallback.active
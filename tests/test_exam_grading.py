@@ -0,0 +1,89 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from exam_grading import (
+    compile_answer_keys, grade_exam, grade_lines, grade_submission
+)
+
+
+@pytest.fixture
+def questions():
+    return [
+        {"id": "q1", "category": "Math", "question": "2 + 2 = ?",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+        {"id": "q2", "category": "Math", "question": "Even numbers?",
+         "options": ["1", "2", "4"], "correct_answers": ["2", "4"]},
+    ]
+
+
+@pytest.fixture
+def submissions(tmp_path):
+    path = tmp_path / "submissions.jsonl"
+    lines = [
+        {"login": "user1", "category": "Math",
+         "question_ids": ["q1", "q2"], "answers": ["2", "2,3"]},
+        {"login": "user2", "category": "Math",
+         "question_ids": ["q1", "q2", "q9"], "answers": ["1", "3,2", "1"],
+         "date": "2025-01-10 09:00:00"},
+        {"login": "user3", "category": "Math",
+         "question_ids": ["q1"], "answers": []},
+    ]
+    path.write_text(
+        "\n".join(json.dumps(line) for line in lines) + "\n{broken\n",
+        encoding="utf-8"
+    )
+    return str(path)
+
+
+def test_grade_submission_counts_unknown_questions(questions):
+    keys = compile_answer_keys(questions)
+    record = {"login": "u", "category": "Math",
+              "question_ids": ["q1", "q9"], "answers": ["2", "1"]}
+    assert grade_submission(record, keys) == (1, 1)
+
+
+def test_malformed_fields_are_rejected(questions):
+    keys = compile_answer_keys(questions)
+    sheet = {"login": "u", "category": "Math",
+             "question_ids": ["q1"], "answers": ["2"]}
+    lines = [
+        dict(sheet, question_ids=[["q1"]]),
+        dict(sheet, answers=[{"option": 2}]),
+        dict(sheet, date="yesterday"),
+        dict(sheet, date=20250110),
+        dict(sheet, answers=[2], date="2025-01-10 09:00:00"),
+    ]
+    graded = grade_lines(
+        [(number, json.dumps(line)) for number, line in enumerate(lines, 1)],
+        keys
+    )
+    assert [entry[0] for entry in graded] == [
+        "error", "error", "error", "error", "ok"
+    ]
+    assert graded[-1][4] == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_grade_exam_saves_one_batch(questions, submissions, workers):
+    result_manager = MagicMock()
+    result_manager.save_quiz_results.return_value = 2
+
+    report = grade_exam(result_manager, submissions, questions,
+                        workers=workers, chunk_size=1)
+
+    result_manager.save_quiz_results.assert_called_once_with([
+        ("user1", "Math", 2, None),
+        ("user2", "Math", 1, "2025-01-10 09:00:00"),
+    ])
+    assert report["graded"] == 2
+    assert report["saved"] == 2
+    assert report["unknown_questions"] == 1
+    assert report["invalid"] == 2
+    assert report["errors"][0].startswith("рядок 3:")
+
+
+def test_dry_run_does_not_save(questions, submissions):
+    result_manager = MagicMock()
+    grade_exam(result_manager, submissions, questions, workers=1,
+               dry_run=True)
+    result_manager.save_quiz_results.assert_not_called()
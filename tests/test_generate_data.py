@@ -0,0 +1,52 @@
+import json
+from benchmarks.generate_data import (
+    iter_questions, iter_users, main, write_questions, write_users
+)
+from question_transfer import validate_question
+
+
+def test_questions_are_valid_and_deterministic():
+    questions = list(iter_questions(200, categories=3, multi_answer_ratio=0.5))
+
+    assert questions == list(
+        iter_questions(200, categories=3, multi_answer_ratio=0.5)
+    )
+    assert questions != list(iter_questions(200, categories=3, seed=2))
+    for question in questions:
+        validate_question(question)
+    assert len({question["category"] for question in questions}) == 3
+    assert any(len(question["correct_answers"]) > 1 for question in questions)
+
+
+def test_users_have_sorted_results_per_category():
+    users = dict(iter_users(5, results=4, categories=2))
+
+    assert len(users) == 5
+    for user in users.values():
+        assert len(user["quiz_results"]) == 3
+        for category, results in user["quiz_results"].items():
+            dates = [result["date"] for result in results]
+            assert len(results) == 4
+            assert dates == sorted(dates)
+            assert all(result["category"] == category for result in results)
+            assert all(0 <= result["score"] <= 20 for result in results)
+
+
+def test_written_files_load_as_json(tmp_path):
+    questions_path = tmp_path / "questions.json"
+    users_path = tmp_path / "users.json"
+
+    assert write_questions(str(questions_path), iter_questions(10)) == 10
+    assert write_users(str(users_path), iter_users(3, results=1)) == 33
+
+    questions = json.loads(questions_path.read_text(encoding="utf-8"))
+    assert len(questions["questions"]) == 10
+    assert list(json.loads(users_path.read_text(encoding="utf-8"))) == [
+        "user0000000", "user0000001", "user0000002"
+    ]
+
+
+def test_empty_outputs_are_valid(tmp_path):
+    target = tmp_path / "out" / "questions.json"
+    main(["questions", "--count", "0", "-o", str(target)])
+    assert json.loads(target.read_text(encoding="utf-8")) == {"questions": []}
@@ -0,0 +1,32 @@
+import os
+from benchmarks.hot_paths import (
+    BENCHMARKS, compare, load_baseline, run_benchmarks, save_baseline
+)
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    rows = compare(
+        {"a[small]": 1.2, "b[small]": 1.6, "c[small]": 1.0},
+        {"a[small]": 1.0, "b[small]": 1.0},
+        threshold=0.5
+    )
+    assert rows == [
+        ("a[small]", 1.2, 1.0, False),
+        ("b[small]", 1.6, 1.0, True),
+        ("c[small]", 1.0, None, False),
+    ]
+
+
+def test_save_baseline_merges(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, {"a[small]": 1.0})
+    save_baseline(path, {"b[small]": 2.0})
+    assert load_baseline(path) == {"a[small]": 1.0, "b[small]": 2.0}
+
+
+def test_every_benchmark_runs_on_tiny_data():
+    cwd = os.getcwd()
+    results = run_benchmarks({"tiny": (30, 3)}, repeat=1, min_time=0)
+    assert os.getcwd() == cwd
+    assert set(results) == {f"{name}[tiny]" for name in BENCHMARKS}
+    assert all(seconds > 0 for seconds in results.values())
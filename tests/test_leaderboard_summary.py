@@ -0,0 +1,100 @@
+import json
+import random
+import pytest
+from leaderboard_summary import (
+    build_summary, export_summary, main, merge_summaries, top
+)
+from quiz_result_manager import LeaderboardIndex, QuizResultManager
+from unittest.mock import MagicMock
+
+
+def make_users(node, count, rng):
+    return {
+        f"{node}-user{i}": {"quiz_results": {
+            category: [
+                {"category": category, "score": rng.randint(0, 1000),
+                 "date": "2025-01-01 10:00:00"}
+                for _ in range(3)
+            ]
+            for category in ("math", "history")
+        }}
+        for i in range(count)
+    }
+
+
+@pytest.fixture
+def nodes():
+    rng = random.Random(3)
+    return {node: make_users(node, 30, rng) for node in ("a", "b", "c")}
+
+
+def test_merge_matches_a_single_index(nodes):
+    summaries = [
+        build_summary(LeaderboardIndex.from_users(users), node)
+        for node, users in nodes.items()
+    ]
+    merged = merge_summaries(summaries)
+
+    union = {}
+    for users in nodes.values():
+        union.update(users)
+    expected = LeaderboardIndex.from_users(union)
+    for category in ("math", "history", "Змішана"):
+        assert [score for _, score, _ in top(merged, category)] == [
+            score for _, score, _ in expected.top(category)
+        ]
+        assert merged["categories"][category]["count"] == expected.count(category)
+    assert merged["nodes"] == ["a", "b", "c"]
+    assert len(merged["categories"]["math"]["top"]) == 20
+
+
+def test_merged_summaries_merge_again(nodes):
+    summaries = [
+        build_summary(LeaderboardIndex.from_users(users), node)
+        for node, users in nodes.items()
+    ]
+    regional = merge_summaries(summaries[:2])
+    assert merge_summaries([regional, summaries[2]])["categories"] == (
+        merge_summaries(summaries)["categories"]
+    )
+
+
+def test_entries_record_their_node():
+    users = {"alice": {"quiz_results": {"math": [
+        {"category": "math", "score": 5, "date": "2025-01-01 10:00:00"}
+    ]}}}
+    first = build_summary(LeaderboardIndex.from_users(users), "a")
+    second = build_summary(LeaderboardIndex.from_users(users), "b")
+    merged = merge_summaries([first, second])
+    assert [entry[3] for entry in merged["categories"]["math"]["top"]] == ["a", "b"]
+    assert top(merged, "math") == [("alice", 5, "2025-01-01 10:00:00")] * 2
+    assert top(merged, "geography") == []
+
+
+def test_export_uses_the_manager_index(nodes):
+    user_manager = MagicMock()
+    user_manager.load_user_data.return_value = nodes["a"]
+    summary = export_summary(QuizResultManager(user_manager), "a")
+    assert summary["categories"]["math"]["count"] == 90
+    assert summary["nodes"] == ["a"]
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        merge_summaries([{"version": 99}])
+
+
+def test_cli_merge_and_top(nodes, tmp_path, capsys):
+    paths = []
+    for node, users in nodes.items():
+        path = tmp_path / f"{node}.json"
+        path.write_text(json.dumps(
+            build_summary(LeaderboardIndex.from_users(users), node)
+        ), encoding="utf-8")
+        paths.append(str(path))
+    output = str(tmp_path / "global.json")
+
+    assert main(["merge", *paths, "--size", "5", "-o", output]) == 0
+    assert main(["top", output, "--category", "math"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-1].startswith(" 5.")
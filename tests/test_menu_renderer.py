@@ -0,0 +1,59 @@
+import io
+import subprocess
+import sys
+from unittest.mock import patch
+from rich.console import Console
+from menu_renderer import PlainMenuRenderer, RichMenuRenderer
+
+ROWS = (("1", "Вхід"), ("2", "Реєстрація"), ("3", "Вихід"))
+
+
+def test_rich_menu_rendered_once():
+    console = Console(file=io.StringIO(), force_terminal=True, width=80)
+    renderer = RichMenuRenderer(console)
+
+    with patch.object(renderer, "render_table",
+                      wraps=renderer.render_table) as mock_render:
+        renderer.print_menu("Головне меню", ROWS)
+        renderer.print_menu("Головне меню", list(ROWS))
+
+    assert mock_render.call_count == 1
+    output = console.file.getvalue()
+    assert output.count("Реєстрація") == 2
+
+
+def test_rich_menu_rerendered_when_width_changes():
+    console = Console(file=io.StringIO(), force_terminal=True, width=80)
+    renderer = RichMenuRenderer(console)
+    renderer.render_menu("Головне меню", ROWS)
+    console.width = 40
+
+    with patch.object(renderer, "render_table",
+                      wraps=renderer.render_table) as mock_render:
+        renderer.render_menu("Головне меню", ROWS)
+
+    assert mock_render.call_count == 1
+
+
+def test_plain_table_aligns_columns():
+    output = io.StringIO()
+    renderer = PlainMenuRenderer(output)
+    renderer.print_table("Топ", ("Place", "User"), [("1", "admin"), ("10", "u")])
+
+    lines = output.getvalue().splitlines()
+    assert "Топ" in lines[0]
+    assert lines[2] == "  1      admin"
+    assert lines[3] == "  10     u"
+
+
+def test_plain_mode_does_not_import_rich():
+    code = (
+        "import io, sys; from menu_renderer import PlainMenuRenderer; "
+        "PlainMenuRenderer(io.StringIO()).print_menu('M', [('1', 'A')]); "
+        "print('rich' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        check=True
+    )
+    assert result.stdout.strip() == "False"
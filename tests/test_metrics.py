@@ -0,0 +1,92 @@
+import json
+import os
+import signal
+import time
+
+import pytest
+import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+@metrics.timed("work")
+def work(value):
+    return value * 2
+
+
+def test_disabled_by_default_records_nothing():
+    assert work(2) == 4
+    with metrics.span("block"):
+        pass
+    assert metrics.snapshot() == {}
+
+
+def test_timed_and_span_record_histograms():
+    metrics.enable()
+    work(1)
+    work(2)
+    with metrics.span("block"):
+        pass
+
+    data = metrics.snapshot()
+    assert data["work"]["count"] == 2
+    assert data["work"]["buckets"]["+Inf"] == 2
+    assert data["block"]["count"] == 1
+
+
+def test_failing_call_is_timed():
+    metrics.enable()
+
+    @metrics.timed("failing")
+    def failing():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        failing()
+    assert metrics.snapshot()["failing"]["count"] == 1
+
+
+def test_prometheus_format():
+    metrics.enable()
+    metrics.observe("user_data_load", 0.003)
+
+    text = metrics.format_prometheus()
+    assert "# TYPE quiz_user_data_load_seconds histogram" in text
+    assert 'quiz_user_data_load_seconds_bucket{le="0.0025"} 0' in text
+    assert 'quiz_user_data_load_seconds_bucket{le="0.005"} 1' in text
+    assert "quiz_user_data_load_seconds_count 1" in text
+
+
+def test_dump_json(tmp_path):
+    metrics.enable()
+    metrics.observe("top_20", 0.2)
+    target = tmp_path / "metrics.json"
+
+    metrics.dump(str(target))
+
+    assert json.loads(target.read_text())["top_20"]["count"] == 1
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="POSIX only")
+def test_signal_while_lock_is_held_dumps_later(tmp_path, monkeypatch):
+    monkeypatch.setattr("atexit.register", lambda *args: None)
+    previous = signal.getsignal(signal.SIGUSR1)
+    target = tmp_path / "metrics.json"
+    try:
+        metrics.dump_on_exit(str(target))
+        metrics.observe("top_20", 0.2)
+        with metrics._lock:
+            os.kill(os.getpid(), signal.SIGUSR1)  # Must not deadlock.
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not (
+                target.exists() and target.stat().st_size):
+            time.sleep(0.01)
+        assert json.loads(target.read_text())["top_20"]["count"] == 1
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
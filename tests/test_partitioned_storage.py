@@ -0,0 +1,139 @@
+import json
+import os
+import pytest
+from partitioned_storage import (
+    PartitionedQuizDataManager, PartitionedQuizLoader, convert_questions_file
+)
+
+
+@pytest.fixture
+def sample_questions():
+    return [
+        {"category": "Math", "question": "2 + 2 = ?",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+        {"category": "History", "question": "First president of Ukraine?",
+         "options": ["Kravchuk", "Kuchma"], "correct_answers": ["Kravchuk"]},
+        {"category": "Math", "question": "3 * 3 = ?",
+         "options": ["9", "6"], "correct_answers": ["9"]},
+    ]
+
+
+@pytest.fixture
+def store(tmp_path, sample_questions):
+    manager = PartitionedQuizDataManager(str(tmp_path / "questions"))
+    manager.save_questions(sample_questions)
+    return manager
+
+
+def partition_path(manager, category):
+    for entry in manager.load_manifest()["partitions"]:
+        if entry["category"] == category:
+            return os.path.join(manager.directory, entry["file"])
+
+
+def test_save_creates_partition_per_category(store):
+    manifest = store.load_manifest()
+    assert [entry["category"] for entry in manifest["partitions"]] == [
+        "Math", "History"
+    ]
+    assert [entry["count"] for entry in manifest["partitions"]] == [2, 1]
+
+
+def test_get_questions_and_category(store):
+    assert len(store.get_questions()) == 3
+    math = store.get_category_questions("Math")
+    assert [q["question"] for q in math] == ["2 + 2 = ?", "3 * 3 = ?"]
+    assert store.get_category_questions("Missing") == []
+
+
+def test_ids_assigned_on_save(tmp_path, sample_questions):
+    manager = PartitionedQuizDataManager(str(tmp_path / "questions"))
+    manager.save_questions(sample_questions)
+
+    math = manager.get_category_questions("Math")
+    assert all(question["id"] for question in math)
+    assert [q["id"] for q in manager.get_questions()[:2]] == [
+        q["id"] for q in math
+    ]
+
+
+def test_edit_rewrites_only_affected_partition(store):
+    history_path = partition_path(store, "History")
+    history_mtime = os.stat(history_path).st_mtime_ns
+    os.utime(history_path, ns=(history_mtime - 10**9, history_mtime - 10**9))
+    history_mtime = os.stat(history_path).st_mtime_ns
+
+    with store.transaction() as transaction:
+        transaction.replace_question("2 + 2 = ?", "Math", {
+            "category": "Math", "question": "2 + 3 = ?",
+            "options": ["5", "6"], "correct_answers": ["5"]
+        })
+
+    assert os.stat(history_path).st_mtime_ns == history_mtime
+    assert store.get_category_questions("Math")[0]["question"] == "2 + 3 = ?"
+
+
+def test_append_rewrites_only_affected_partitions(store):
+    history_path = partition_path(store, "History")
+    history_mtime = os.stat(history_path).st_mtime_ns
+    os.utime(history_path, ns=(history_mtime - 10**9, history_mtime - 10**9))
+    history_mtime = os.stat(history_path).st_mtime_ns
+
+    store.append_questions([
+        {"id": "m3", "category": "Math", "question": "5 - 1 = ?",
+         "options": ["4", "3"], "correct_answers": ["4"]},
+        {"id": "g1", "category": "Geography", "question": "Capital?",
+         "options": ["Kyiv", "Lviv"], "correct_answers": ["Kyiv"]},
+    ])
+
+    assert os.stat(history_path).st_mtime_ns == history_mtime
+    assert [entry["count"] for entry in store.load_manifest()["partitions"]] \
+        == [3, 1, 1]
+    assert store.get_category_questions("Geography")[0]["id"] == "g1"
+    assert len(store.get_questions()) == 5
+
+
+def test_remove_category_deletes_partition(store):
+    history_path = partition_path(store, "History")
+    with store.transaction() as transaction:
+        transaction.remove_category("History")
+    assert not os.path.exists(history_path)
+    assert store.get_categories() == ["Math"]
+
+
+def test_loader_reads_single_partition(store):
+    loader = PartitionedQuizLoader(store.directory)
+    assert len(loader.load_questions()) == 3
+    history = loader.load_category_questions("History")
+    assert history[0]["question"] == "First president of Ukraine?"
+
+
+def test_loader_lists_categories_from_manifest(store, monkeypatch):
+    loader = PartitionedQuizLoader(store.directory)
+    monkeypatch.setattr(store.__class__, "_read_partition", None)
+    assert sorted(loader.load_categories()) == ["History", "Math"]
+
+
+def test_damaged_manifest(store, capsys):
+    with open(store.manifest_path, "w", encoding="utf-8") as file:
+        file.write("{broken")
+    assert store.get_categories() == []
+    assert store.get_category_questions("Math") == []
+    assert "Помилка при читанні файлу." in capsys.readouterr().out
+
+
+def test_loader_missing_store(tmp_path, capsys):
+    loader = PartitionedQuizLoader(str(tmp_path / "missing"))
+    assert loader.load_questions() == []
+    assert "Файл з запитаннями не знайдено!" in capsys.readouterr().out
+
+
+def test_convert_questions_file(tmp_path, sample_questions):
+    source = tmp_path / "questions.json"
+    source.write_text(
+        json.dumps({"questions": sample_questions}), encoding="utf-8"
+    )
+    count = convert_questions_file(str(source), str(tmp_path / "out"))
+    assert count == 3
+    manager = PartitionedQuizDataManager(str(tmp_path / "out"))
+    assert len(manager.get_category_questions("Math")) == 2
@@ -0,0 +1,49 @@
+from profiling import PhaseProfiler, ScriptedReplay, parse_script
+
+
+def test_parse_script():
+    phases = parse_script(
+        "# comment\n"
+        "[login]\n1\nuser\n\n"
+        "[menu]\n<enter>\n5\n"
+    )
+    assert phases == [("login", ["1", "user"]), ("menu", ["", "5"])]
+
+
+def test_answers_before_first_phase_belong_to_startup():
+    assert parse_script("1\n[exit]\n3\n") == [
+        ("startup", ["1"]), ("exit", ["3"])
+    ]
+
+
+def test_replay_feeds_input_and_stops_when_exhausted(capsys):
+    answers = []
+    with ScriptedReplay([("menu", ["1", "2"])]):
+        while True:
+            answers.append(input("> "))
+
+    assert answers == ["1", "2"]
+    assert capsys.readouterr().out == "> 1\n> 2\n"
+
+
+def test_replay_profiles_each_phase(tmp_path):
+    profiler = PhaseProfiler(str(tmp_path), top=5)
+    phases = [("login", ["kuzya"]), ("quiz", ["1", "2"])]
+
+    with ScriptedReplay(phases, profiler):
+        for _ in range(3):
+            input()
+            sorted(range(1000))
+
+    reports = sorted(path.name for path in tmp_path.iterdir())
+    assert reports == [
+        "01-startup.prof", "01-startup.txt", "02-login.prof", "02-login.txt",
+        "03-quiz.prof", "03-quiz.txt", "summary.txt",
+    ]
+    report = (tmp_path / "03-quiz.txt").read_text(encoding="utf-8")
+    assert "phase: quiz" in report
+    assert "allocations by growth" in report
+    summary = (tmp_path / "summary.txt").read_text(encoding="utf-8")
+    assert [line.split()[0] for line in summary.splitlines()[1:]] == [
+        "startup", "login", "quiz"
+    ]
@@ -0,0 +1,94 @@
+import json
+import pickle
+import random
+import pytest
+from quantile_sketch import KLLSketch, PercentileIndex
+
+
+@pytest.fixture
+def scores():
+    rng = random.Random(7)
+    return [rng.randint(0, 20) for _ in range(50000)]
+
+
+def exact_percentile(values, value):
+    return 100 * sum(v < value for v in values) / len(values)
+
+
+def test_small_sketch_is_exact():
+    sketch = KLLSketch()
+    for value in [5, 1, 3, 3, 9]:
+        sketch.update(value)
+    assert sketch.rank(3) == 1
+    assert sketch.rank(4) == 3
+    assert sketch.quantile(0.5) == 3
+    assert KLLSketch().quantile(0.5) is None
+
+
+def test_rank_error_and_bounded_size(scores):
+    sketch = KLLSketch(k=200, seed=1)
+    for score in scores:
+        sketch.update(score)
+
+    assert sketch.count == len(scores)
+    assert sum(map(len, sketch.levels)) < 3 * 200
+    for value in (5, 10, 15):
+        estimate = 100 * sketch.rank(value) / sketch.count
+        assert abs(estimate - exact_percentile(scores, value)) < 2
+
+
+def test_merged_shards_match_one_sketch(scores):
+    shards = [KLLSketch(seed=i) for i in range(4)]
+    for i, score in enumerate(scores):
+        shards[i % 4].update(score)
+    merged = shards[0]
+    for shard in shards[1:]:
+        merged.merge(KLLSketch.from_dict(json.loads(json.dumps(shard.to_dict()))))
+
+    assert merged.count == len(scores)
+    assert sum(map(len, merged.levels)) < 3 * 200
+    estimate = 100 * merged.rank(10) / merged.count
+    assert abs(estimate - exact_percentile(scores, 10)) < 2
+
+
+@pytest.fixture
+def users():
+    return {
+        "alice": {"quiz_results": {
+            "math": [{"category": "math", "score": 10, "date": "2025-01-05 10:00:00"},
+                     {"category": "math", "score": 20, "date": "2025-02-05 10:00:00"}],
+            "Змішана": [{"category": "Змішана", "score": 5, "date": "2025-02-06 10:00:00"}],
+        }},
+        "bob": {"quiz_results": {
+            "history": [{"category": "history", "score": 15, "date": "2025-02-07 10:00:00"}],
+        }},
+    }
+
+
+def test_percentile_index(users):
+    index = PercentileIndex.from_users(users)
+    assert index.percentile("math", 15) == 50.0
+    assert index.percentile("math", 15, "2025-02") == 0.0
+    assert index.percentile("math", 15, "2025-01") == 100.0
+    assert index.percentile("Змішана", 12) == 50.0
+    assert index.percentile("history", 1, "2025-01") is None
+    assert index.percentile("geography", 1) is None
+
+
+def test_old_windows_are_dropped(users):
+    index = PercentileIndex.from_users(users, window="day", windows=2)
+    assert index.percentile("Змішана", 100, "2025-02-07") == 100.0
+    assert index.percentile("Змішана", 100, "2025-02-06") == 100.0
+    assert index.percentile("Змішана", 100, "2025-01-05") is None
+    assert index.percentile("Змішана", 100) == 100.0
+
+
+def test_index_merge_and_serialization(users):
+    first = PercentileIndex.from_users({"alice": users["alice"]})
+    second = PercentileIndex.from_users({"bob": users["bob"]})
+    first.merge(PercentileIndex.from_dict(json.loads(json.dumps(second.to_dict()))))
+
+    whole = PercentileIndex.from_users(users)
+    for category in ("math", "history", "Змішана"):
+        assert first.percentile(category, 12) == whole.percentile(category, 12)
+    assert pickle.loads(pickle.dumps(first)).percentile("Змішана", 12) == 50.0
@@ -0,0 +1,74 @@
+import json
+import time
+import pytest
+from question_bank import QuestionBank, QuestionBankWatcher, WatchingQuizLoader
+
+
+def write_questions(path, questions):
+    path.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+
+
+def make_question(text, category="math"):
+    return {"category": category, "question": text,
+            "options": ["A", "B"], "correct_answers": ["A"]}
+
+
+@pytest.fixture
+def questions_file(tmp_path):
+    path = tmp_path / "questions.json"
+    write_questions(path, [make_question("Q1"), make_question("Q2", "art")])
+    return path
+
+
+def test_bank_indexes_categories(questions_file):
+    bank = QuestionBank.from_file(str(questions_file))
+    assert bank.categories == ["art", "math"]
+    assert [q["question"] for q in bank.by_category["math"]] == ["Q1"]
+
+
+def test_check_swaps_bank_and_keeps_old_snapshot(questions_file):
+    watcher = QuestionBankWatcher(str(questions_file))
+    loader = WatchingQuizLoader(watcher)
+    snapshot = loader.load_questions()
+
+    assert not watcher.check()
+    write_questions(questions_file, [make_question("Q3")])
+    assert watcher.check()
+
+    assert [q["question"] for q in loader.load_questions()] == ["Q3"]
+    assert [q["question"] for q in snapshot] == ["Q1", "Q2"]
+    assert loader.load_category_questions("art") == []
+
+
+def test_invalid_file_keeps_current_bank(questions_file):
+    watcher = QuestionBankWatcher(str(questions_file))
+    questions_file.write_text("{broken", encoding="utf-8")
+    assert not watcher.check()
+    assert len(watcher.bank.questions) == 2
+
+
+def test_unreadable_file_keeps_current_bank(questions_file):
+    watcher = QuestionBankWatcher(str(questions_file))
+    questions_file.unlink()
+    questions_file.mkdir()  # open() now fails with IsADirectoryError.
+    assert not watcher.check()
+    assert len(watcher.bank.questions) == 2
+
+
+def test_missing_file_gives_empty_bank(tmp_path):
+    watcher = QuestionBankWatcher(str(tmp_path / "missing.json"))
+    assert watcher.bank.questions == []
+
+
+def test_background_reload(questions_file):
+    watcher = QuestionBankWatcher(str(questions_file), interval=0.05)
+    watcher.start()
+    try:
+        write_questions(questions_file, [make_question("Q9")])
+        deadline = time.monotonic() + 5
+        while (watcher.bank.questions[0]["question"] != "Q9"
+               and time.monotonic() < deadline):
+            time.sleep(0.02)
+        assert watcher.bank.questions[0]["question"] == "Q9"
+    finally:
+        watcher.stop()
@@ -0,0 +1,47 @@
+from question_dedup import (
+    DuplicateDetector, exact_fingerprint, find_category_variants,
+    find_duplicate_clusters, normalize_question_text
+)
+
+
+def make_question(text, category="гeографія"):
+    return {"category": category, "question": text,
+            "options": ["A", "B"], "correct_answers": ["A"]}
+
+
+def test_normalize_folds_mixed_script_words_only():
+    assert normalize_question_text("гeографія") == "географія"
+    assert normalize_question_text("Paris, France!") == "paris france"
+
+
+def test_exact_fingerprint_ignores_case_and_punctuation():
+    assert (exact_fingerprint("Яка столиця Франції?")
+            == exact_fingerprint("  яка столиця франції "))
+    assert (exact_fingerprint("Яка столиця Франції?")
+            != exact_fingerprint("Яка столиця Італії?"))
+
+
+def test_detector_finds_near_duplicates():
+    detector = DuplicateDetector()
+    assert detector.add(1, "Яка найбільша країна за площею?") == []
+    assert detector.add(2, "Яка столиця Італії?") == []
+    matches = detector.add(3, "Яка найбільша за площею країна?")
+    assert [key for key, _ in matches] == [1]
+    assert detector.add(4, "яка найбільша країна за площею")[0] == (1, 1.0)
+
+
+def test_find_duplicate_clusters():
+    questions = [
+        make_question("Яка найбільша країна за площею?"),
+        make_question("Яка столиця Франції?"),
+        make_question("Яка столиця Італії?"),
+        make_question("Яка найбільша за площею країна?", "географія"),
+        make_question("ЯКА СТОЛИЦЯ ФРАНЦІЇ"),
+    ]
+    assert find_duplicate_clusters(questions) == [[0, 3], [1, 4]]
+
+
+def test_find_category_variants():
+    assert find_category_variants(
+        ["гeографія", "географія", "історія", "спорт"]
+    ) == [sorted(["гeографія", "географія"])]
@@ -0,0 +1,31 @@
+import json
+
+from question_ids import assign_question_ids, build_id_index, main
+
+
+def test_assign_keeps_existing_and_replaces_repeated_ids():
+    questions = [{"id": "a"}, {}, {"id": "a"}, {"id": ""}]
+
+    assert assign_question_ids(questions)
+    ids = [question["id"] for question in questions]
+    assert ids[0] == "a"
+    assert len(set(ids)) == 4
+    assert not assign_question_ids(questions)
+
+
+def test_build_id_index_skips_removed():
+    assert build_id_index([{"id": "a"}, None, {"id": "b"}, {}]) == {
+        "a": 0, "b": 2
+    }
+
+
+def test_migration_cli(tmp_path, capsys):
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps({"questions": [
+        {"category": "Math", "question": "2 + 2 = ?",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+    ]}), encoding="utf-8")
+
+    assert main([str(path)]) == 0
+    assert "1 питанням" in capsys.readouterr().out
+    assert json.loads(path.read_text(encoding="utf-8"))["questions"][0]["id"]
@@ -0,0 +1,69 @@
+import pytest
+from question_search import QuestionSearchIndex, tokenize
+
+
+@pytest.fixture
+def sample_questions():
+    return [
+        {"id": "q1", "category": "гeографія", "question": "Яка столиця Франції?",
+         "options": ["Париж", "Ліон"], "correct_answers": ["Париж"]},
+        {"id": "q2", "category": "гeографія", "question": "Яка столиця Італії?",
+         "options": ["Рим", "Мілан"], "correct_answers": ["Рим"]},
+        {"id": "q3", "category": "історія", "question": "Хто написав «М’ятну» поему?",
+         "options": ["Франко", "Шевченко"], "correct_answers": ["Франко"]},
+    ]
+
+
+@pytest.fixture
+def index(sample_questions):
+    return QuestionSearchIndex(sample_questions)
+
+
+def test_tokenize_normalizes_case_and_apostrophes():
+    assert tokenize("М’ятна ПОЕМА") == ["м'ятна", "поема"]
+    assert tokenize("мʼятна") == tokenize("м'ятна")
+
+
+def test_search_term_and_substring(index):
+    assert len(index.search("столиця")) == 2
+    assert [q["question"] for q in index.search("франц")] == [
+        "Яка столиця Франції?"
+    ]
+    assert len(index.search("м'ят")) == 1
+
+
+def test_search_matches_options(index):
+    assert index.search("франко")[0]["category"] == "історія"
+    # "Франц" is a substring of "Франції" and "Франко"
+    assert len(index.search("фран")) == 2
+
+
+def test_search_requires_every_word(index):
+    assert len(index.search("столиця рим")) == 1
+    assert index.search("столиця франко") == []
+    assert index.search("   ") == []
+
+
+def test_incremental_updates(index):
+    index.add({"category": "спорт", "question": "Скільки гравців у футболі?",
+               "options": ["11", "9"], "correct_answers": ["11"]})
+    assert len(index.search("футбол")) == 1
+
+    assert index.replace("q2", {
+        "id": "q2", "category": "гeографія", "question": "Яка столиця Іспанії?",
+        "options": ["Мадрид", "Барселона"], "correct_answers": ["Мадрид"]
+    })
+    assert index.search("рим") == []
+    assert len(index.search("мадрид")) == 1
+
+    assert not index.replace("missing", {})
+    assert index.remove_question("q3")
+    assert index.search("франко") == []
+
+    assert index.remove_category("гeографія") == 2
+    assert index.search("столиця") == []
+    assert len(index) == 1
+
+
+def test_search_limit(index):
+    assert len(index.search("яка", limit=1)) == 1
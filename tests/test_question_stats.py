@@ -0,0 +1,164 @@
+import pytest
+from question_stats import EASY, HARD, MEDIUM, QuestionStats
+from quiz_category import SpecificCategory
+
+
+@pytest.fixture
+def questions():
+    return [
+        {"id": f"q{i}", "category": "math" if i % 2 else "history",
+         "question": f"Q{i}", "options": ["A", "B"], "correct_answers": ["A"]}
+        for i in range(60)
+    ]
+
+
+def answer(stats, question_id, correct, times):
+    for _ in range(times):
+        stats.record(question_id, correct, 1000)
+
+
+def test_record_updates_counters():
+    stats = QuestionStats()
+    stats.record("q1", True, 1000)
+    stats.record("q1", False, 3000)
+    stats.record(None, True, 500)
+    assert stats.get("q1") == (2, 1, 2000.0)
+    assert stats.get("q2") == (0, 0, 0.0)
+    assert len(stats) == 1
+
+
+def test_bands_follow_error_rate():
+    stats = QuestionStats()
+    answer(stats, "easy", True, 5)
+    answer(stats, "hard", False, 5)
+    answer(stats, "medium", True, 1)
+    answer(stats, "medium", False, 1)
+    assert stats.band("easy") == EASY
+    assert stats.band("hard") == HARD
+    assert stats.band("medium") == MEDIUM
+    assert stats.band("never_answered") == MEDIUM
+    assert stats.difficulty("never_answered") == 0.5
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "stats.bin")
+    stats = QuestionStats(path)
+    answer(stats, "q1", True, 3)
+    stats.record("0123456789abcdef0123456789abcdef", False, 250)
+    stats.save()
+
+    loaded = QuestionStats.load(path)
+    assert loaded.get("q1") == (3, 3, 1000.0)
+    assert loaded.get("0123456789abcdef0123456789abcdef") == (1, 0, 250.0)
+    assert (tmp_path / "stats.bin").stat().st_size == 8 + 2 * 32
+
+
+def test_load_missing_and_invalid_file(tmp_path):
+    assert len(QuestionStats.load(str(tmp_path / "missing.bin"))) == 0
+    (tmp_path / "bad.bin").write_bytes(b"not stats")
+    with pytest.raises(ValueError):
+        QuestionStats.load(str(tmp_path / "bad.bin"))
+
+
+def test_sample_balances_bands(questions):
+    stats = QuestionStats()
+    for question in questions[:20]:
+        answer(stats, question["id"], True, 4)
+    for question in questions[20:40]:
+        answer(stats, question["id"], False, 4)
+
+    bands = stats.bands_for(questions)
+    assert bands.sizes() == (20, 20, 20)
+    selected = bands.sample(20)
+    assert len(selected) == 20
+    assert len({question["id"] for question in selected}) == 20
+    counts = [0, 0, 0]
+    for question in selected:
+        counts[stats.band(question["id"])] += 1
+    assert counts == [6, 8, 6]
+
+
+def test_quotas_fill_from_other_bands(questions):
+    stats = QuestionStats()
+    bands = stats.bands_for(questions[:10])
+    assert bands.sizes() == (0, 10, 0)
+    assert bands.quotas(20) == [0, 10, 0]
+    assert len(bands.sample(20)) == 10
+
+
+def test_cached_index_follows_records(questions):
+    stats = QuestionStats()
+    bands = stats.bands_for(questions)
+    assert stats.bands_for(questions) is bands
+
+    answer(stats, "q3", True, 3)
+    answer(stats, "q7", False, 3)
+    assert bands.sizes() == (1, 58, 1)
+    assert [questions[p]["id"] for p in bands.bands[EASY]] == ["q3"]
+    assert [questions[p]["id"] for p in bands.bands[HARD]] == ["q7"]
+    assert sorted(bands.bands[MEDIUM]) == [
+        i for i in range(60) if i not in (3, 7)
+    ]
+
+
+def test_new_source_drops_cached_indexes(questions):
+    stats = QuestionStats()
+    bands = stats.bands_for(questions)
+    assert stats.bands_for(list(questions)) is not bands
+
+
+def test_alternating_categories_keep_their_indexes(questions):
+    stats = QuestionStats()
+    math = [q for q in questions if q["category"] == "math"]
+    history = [q for q in questions if q["category"] == "history"]
+    indexes = []
+    for _ in range(3):
+        for selection in (math, history):
+            category = SpecificCategory(selection, selection[0]["category"],
+                                        stats)
+            category.get_questions()
+            indexes.append(stats.bands_for(selection, selection,
+                                           selection[0]["category"]))
+    assert len(set(map(id, indexes))) == 2
+
+    # A reloaded category replaces only its own index.
+    assert stats.bands_for(list(math), key="math") is not indexes[0]
+    assert stats.bands_for(history, key="history") is indexes[1]
+
+
+def test_save_merges_answers_of_other_processes(tmp_path):
+    path = str(tmp_path / "stats.bin")
+    first = QuestionStats.load(path)
+    second = QuestionStats.load(path)
+    answer(first, "q1", True, 2)
+    answer(second, "q1", False, 3)
+    answer(second, "q2", True, 1)
+    first.save()
+    second.save()
+    first.save()  # Nothing new: the file is left as it is.
+
+    loaded = QuestionStats.load(path)
+    assert loaded.get("q1")[:2] == (5, 2)
+    assert loaded.get("q2")[:2] == (1, 1)
+    # The second process now sees the first one's answers too.
+    assert second.get("q1")[:2] == (5, 2)
+
+    answer(first, "q2", True, 1)
+    first.save()
+    assert QuestionStats.load(path).get("q2")[:2] == (2, 2)
+
+
+def test_merged_counts_move_cached_bands(tmp_path):
+    path = str(tmp_path / "stats.bin")
+    questions = [{"id": "q1"}, {"id": "q2"}]
+    first = QuestionStats.load(path)
+    bands = first.bands_for(questions)
+    assert bands.sizes() == (0, 2, 0)
+
+    other = QuestionStats.load(path)
+    answer(other, "q1", False, 6)
+    other.save()
+    answer(first, "q2", True, 6)
+    first.save()
+    assert first.band("q1") == HARD
+    assert bands.sizes() == (1, 0, 1)
@@ -0,0 +1,81 @@
+import random
+import pytest
+from question_store import ColumnarQuestionStore
+from quiz_category import MixedCategory, SpecificCategory
+
+
+@pytest.fixture
+def sample_questions():
+    return [
+        {"category": "geography", "question": "Capital of France?",
+         "options": ["Paris", "Berlin"], "correct_answers": ["Paris"]},
+        {"category": "math", "question": "2 + 2 = ?",
+         "options": ["Так", "Ні"], "correct_answers": ["Так"]},
+        {"category": "Geography", "question": "Capital of Germany?",
+         "options": ["Paris", "Berlin"], "correct_answers": ["Berlin"]},
+        {"category": "спорт", "question": "wwwwww",
+         "options": ["aaaaa", "sssss"], "correct_answers": ["eeeee"]},
+    ]
+
+
+@pytest.fixture
+def store(sample_questions):
+    return ColumnarQuestionStore.from_questions(sample_questions)
+
+
+def test_items_match_source_questions(store, sample_questions):
+    assert len(store) == len(sample_questions)
+    assert list(store) == sample_questions
+    assert store[-1] == sample_questions[-1]
+    assert store[1:3] == sample_questions[1:3]
+
+
+def test_options_are_stored_once(store):
+    assert store.options.count("Paris") == 1
+    assert store.categories == ["geography", "math", "Geography", "спорт"]
+
+
+def test_filter_category_matches_specific_category(store, sample_questions):
+    expected = SpecificCategory(sample_questions, "geography").questions
+
+    assert list(store.filter_category("geography")) == expected
+    assert list(SpecificCategory(store, "geography").questions) == expected
+    assert len(store.filter_category("history")) == 0
+
+
+def test_view_filters_category(store, sample_questions):
+    view = store.filter_category("geography")
+    expected = SpecificCategory(sample_questions, "geography").questions
+    assert list(view.filter_category("geography")) == expected
+    assert list(SpecificCategory(view, "geography").questions) == expected
+    assert len(view.filter_category("math")) == 0
+
+
+def test_random_sample_from_store(store, sample_questions):
+    questions = MixedCategory(store).get_questions()
+    assert len(questions) == len(sample_questions)
+    assert all(question in sample_questions for question in questions)
+    assert random.sample(store.filter_category("geography"), 1)[0][
+        "category"].lower() == "geography"
+
+
+def test_filter_cache_reset_on_append(store):
+    store.filter_category("math")
+    store.append({"category": "math", "question": "3 + 3 = ?",
+                  "options": ["6"], "correct_answers": ["6"]})
+    assert len(store.filter_category("math")) == 2
+
+
+def test_index_out_of_range(store):
+    with pytest.raises(IndexError):
+        store[len(store)]
+
+
+def test_lookup_by_id(sample_questions):
+    sample_questions[2]["id"] = "abc"
+    store = ColumnarQuestionStore.from_questions(sample_questions)
+
+    assert store.position_of("abc") == 2
+    assert store.get_by_id("abc") == sample_questions[2]
+    assert store.get_by_id("missing") is None
+    assert "id" not in store[0]
@@ -0,0 +1,147 @@
+import csv
+import json
+import pytest
+from unittest.mock import patch
+from question_transfer import (
+    export_questions, import_questions, validate_question
+)
+from victorine_utility import QuizDataManager
+
+
+@pytest.fixture
+def quiz_data_manager(tmp_path):
+    file_path = tmp_path / "questions.json"
+    file_path.write_text(json.dumps({"questions": [
+        {"category": "Math", "question": "2 + 2 = ?",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+    ]}), encoding="utf-8")
+    return QuizDataManager(str(file_path))
+
+
+def write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as file:
+        for record in records:
+            file.write(record if isinstance(record, str)
+                       else json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+
+
+def test_validate_question_rejects_unknown_answer():
+    with pytest.raises(ValueError):
+        validate_question({"category": "A", "question": "Q",
+                           "options": ["1", "2"], "correct_answers": ["3"]})
+
+
+def test_validate_question_rejects_list_answers():
+    with pytest.raises(ValueError):
+        validate_question({"category": "A", "question": "Q",
+                           "options": ["1", "2"], "correct_answers": [["1"]]})
+
+
+def test_import_jsonl_validates_and_deduplicates(quiz_data_manager, tmp_path):
+    source = tmp_path / "bank.jsonl"
+    write_jsonl(source, [
+        {"category": "Math", "question": "3 + 3 = ?",
+         "options": ["6", "7"], "correct_answers": ["6"]},
+        {"category": "math", "question": " 2 + 2 = ? ",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+        {"category": "Math", "question": "3 + 3 = ?",
+         "options": ["6", "7"], "correct_answers": ["6"]},
+        {"category": "Math", "question": "No options"},
+        {"category": "Math", "question": "Nested",
+         "options": ["1", "2"], "correct_answers": [["1"]]},
+        "{broken",
+    ])
+
+    report = import_questions(quiz_data_manager, str(source))
+
+    assert report["imported"] == 1
+    assert report["duplicates"] == 2
+    assert report["invalid"] == 3
+    questions = quiz_data_manager.get_questions()
+    assert len(questions) == 2
+    assert questions[1]["id"]
+
+
+def test_import_reports_near_duplicates(quiz_data_manager, tmp_path):
+    source = tmp_path / "bank.jsonl"
+    write_jsonl(source, [
+        {"category": "Arithmetic", "question": "2 + 2 = ?!",
+         "options": ["3", "4"], "correct_answers": ["4"]},
+        {"category": "Math", "question": "Скільки буде 7 * 8?",
+         "options": ["56", "54"], "correct_answers": ["56"]},
+    ])
+
+    report = import_questions(quiz_data_manager, str(source))
+
+    assert report["imported"] == 2
+    assert report["near_duplicates"] == 1
+    assert report["warnings"][0].startswith("рядок 1:")
+    assert report["warnings"][0].endswith("схоже на питання №1 у сховищі")
+
+
+def test_import_reports_near_duplicates_by_line(quiz_data_manager, tmp_path):
+    source = tmp_path / "bank.jsonl"
+    write_jsonl(source, [
+        {"category": "Math", "question": "Скільки буде 7 * 8?",
+         "options": ["56", "54"], "correct_answers": ["56"]},
+        {"category": "Arithmetic", "question": "Скільки буде 7 * 8?!",
+         "options": ["56", "54"], "correct_answers": ["56"]},
+    ])
+
+    report = import_questions(quiz_data_manager, str(source))
+
+    assert report["near_duplicates"] == 1
+    assert report["warnings"][0].endswith("схоже на рядок 1")
+
+
+def test_import_commits_in_batches(quiz_data_manager, tmp_path):
+    source = tmp_path / "bank.jsonl"
+    write_jsonl(source, [
+        {"category": "Bulk", "question": f"Q{i}",
+         "options": ["A", "B"], "correct_answers": ["A"]}
+        for i in range(25)
+    ])
+
+    with patch.object(
+        quiz_data_manager, "save_questions",
+        wraps=quiz_data_manager.save_questions
+    ) as mock_save:
+        report = import_questions(quiz_data_manager, str(source), batch_size=10)
+
+    assert report["imported"] == 25
+    assert mock_save.call_count == 3
+    assert len(quiz_data_manager.get_questions()) == 26
+
+
+def test_csv_round_trip(quiz_data_manager, tmp_path):
+    target = tmp_path / "bank.csv"
+    assert export_questions(quiz_data_manager, str(target)) == 1
+
+    with open(target, encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["options"] == "3|4"
+
+    other = QuizDataManager(str(tmp_path / "other.json"))
+    report = import_questions(other, str(target))
+    assert report["imported"] == 1
+    assert other.get_questions()[0]["options"] == ["3", "4"]
+
+
+def test_csv_list_items_may_hold_the_separator(quiz_data_manager, tmp_path):
+    source = QuizDataManager(str(tmp_path / "source.json"))
+    source.save_questions([
+        {"id": "a1", "category": "Shell", "question": "Pipe?",
+         "options": ["a | b", "c\\|d", "e\\"], "correct_answers": ["a | b"]},
+    ])
+    target = tmp_path / "bank.csv"
+    export_questions(source, str(target))
+
+    other = QuizDataManager(str(tmp_path / "other.json"))
+    assert import_questions(other, str(target))["imported"] == 1
+    assert other.get_questions()[0]["options"] == ["a | b", "c\\|d", "e\\"]
+
+
+def test_unsupported_format(quiz_data_manager, tmp_path):
+    with pytest.raises(ValueError):
+        export_questions(quiz_data_manager, str(tmp_path / "bank.xml"))
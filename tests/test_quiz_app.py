@@ -0,0 +1,27 @@
+import subprocess
+import sys
+from benchmarks.import_time import parse_importtime
+
+
+def test_import_does_not_load_rich_or_admin_tools():
+    code = (
+        "import sys, quiz_app; "
+        "print(','.join(m for m in ('rich', 'victorine_utility', "
+        "'question_dedup', 'exam_grading', 'pickle', 'argparse') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   os\n"
+        "import time:      3363 |      12450 | quiz_app\n"
+    )
+    assert parse_importtime(stderr) == [
+        ("os", 120, 120), ("quiz_app", 3363, 12450)
+    ]
@@ -50,3 +50,21 @@ def test_specific_category_warning_on_few_questions(capfd, sample_questions):
     category.load_questions()
     captured = capfd.readouterr()
     assert "У категорії literature недостатньо питань." in captured.out
+
+
+def test_adaptive_selection():
+    from question_stats import QuestionStats
+
+    questions = [
+        {"id": f"q{i}", "question": f"Q{i}", "category": "math"}
+        for i in range(40)
+    ]
+    stats = QuestionStats()
+    for question in questions[:30]:
+        for _ in range(4):
+            stats.record(question["id"], True)
+
+    selected = SpecificCategory(questions, "math", stats).get_questions()
+    assert len(selected) == 20
+    assert sum(stats.band(question["id"]) == 0 for question in selected) == 12
+    assert MixedCategory(questions, stats).get_questions()
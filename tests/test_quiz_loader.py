@@ -18,6 +18,17 @@ def test_load_questions_file_exists(quiz_loader):
             assert questions == mock_data["questions"]
 
 
+def test_load_categories(quiz_loader):
+    mock_data = {"questions": [
+        {"category": "math", "question": "Q1"},
+        {"category": "art", "question": "Q2"},
+        {"category": "math", "question": "Q3"},
+    ]}
+    with patch("builtins.open", mock_open(read_data=json.dumps(mock_data))):
+        with patch("os.path.exists", return_value=True):
+            assert sorted(quiz_loader.load_categories()) == ["art", "math"]
+
+
 def test_load_questions_file_not_found(quiz_loader):
     with patch("os.path.exists", return_value=False):
         with patch("builtins.print") as mock_print:
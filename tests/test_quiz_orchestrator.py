@@ -64,16 +64,16 @@ def test_display_user_menu(orchestrator, capsys):
 
 
 def test_get_unique_categories(orchestrator, mock_dependencies):
-    mock_dependencies["quiz_loader"].load_questions.return_value = [
-        {"category": "math", "question": "Q1", "options": ["A", "B"], "correct_answers": ["A"]},
-        {"category": "science", "question": "Q2", "options": ["C", "D"], "correct_answers": ["C"]},
+    mock_dependencies["quiz_loader"].load_categories.return_value = [
+        "science", "math"
     ]
     categories = orchestrator.get_unique_categories()
     assert categories == ["math", "science"]
+    mock_dependencies["quiz_loader"].load_questions.assert_not_called()
 
 
 def test_start_quiz(orchestrator, mock_dependencies, monkeypatch):
-    mock_dependencies["quiz_loader"].load_questions.return_value = [
+    mock_dependencies["quiz_loader"].load_category_questions.return_value = [
         {"category": "math", "question": "Q1", "options": ["A", "B"], "correct_answers": ["A"]},
     ]
 
@@ -82,6 +82,8 @@ def test_start_quiz(orchestrator, mock_dependencies, monkeypatch):
 
     orchestrator.start_quiz("test_user", "math")
     mock_dependencies["result_manager"].save_quiz_result.assert_called_once_with("test_user", "math", 1)
+    mock_dependencies["quiz_loader"].load_category_questions.assert_called_once_with("math")
+    mock_dependencies["quiz_loader"].load_questions.assert_not_called()
 
 
 def test_display_results(orchestrator, mock_dependencies, capsys):
@@ -128,3 +130,45 @@ def test_user_menu_exit(orchestrator, monkeypatch, capsys):
     orchestrator.user_menu("test_user")
     captured = capsys.readouterr()
     assert "Вихід із програми" in captured.out
+
+
+def test_victorine_utility_created_on_first_use(orchestrator, mock_dependencies):
+    assert orchestrator._victorine_utility is None
+    utility = orchestrator.victorine_utility
+    assert utility.quiz_data_manager is mock_dependencies["quiz_data_manager"]
+    assert orchestrator.victorine_utility is utility
+
+
+def test_start_quiz_logs_answers(mock_dependencies, monkeypatch):
+    answer_log = MagicMock()
+    orchestrator = QuizOrchestrator(
+        user_manager=mock_dependencies["user_manager"],
+        result_manager=mock_dependencies["result_manager"],
+        quiz_loader=mock_dependencies["quiz_loader"],
+        answer_log=answer_log,
+    )
+    mock_dependencies["quiz_loader"].load_category_questions.return_value = [
+        {"id": "q1", "category": "math", "question": "Q1", "options": ["A", "B"], "correct_answers": ["A"]},
+    ]
+    inputs = iter(["2"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    orchestrator.start_quiz("test_user", "math")
+
+    login, question_id, answer, correct, response_ms = answer_log.record.call_args.args
+    assert (login, question_id, answer, correct) == ("test_user", "q1", "2", False)
+    assert response_ms >= 0
+    answer_log.flush.assert_called_once()
+
+
+def test_start_quiz_reports_percentile(orchestrator, mock_dependencies, monkeypatch, capsys):
+    mock_dependencies["quiz_loader"].load_category_questions.return_value = [
+        {"category": "math", "question": "Q1", "options": ["A", "B"], "correct_answers": ["A"]},
+    ]
+    mock_dependencies["result_manager"].get_percentile.return_value = 83.7
+    monkeypatch.setattr("builtins.input", lambda _: "1")
+
+    orchestrator.start_quiz("test_user", "math")
+
+    mock_dependencies["result_manager"].get_percentile.assert_called_once_with("math", 1)
+    assert "Ви випередили 83% гравців" in capsys.readouterr().out
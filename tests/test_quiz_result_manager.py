@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
-from quiz_result_manager import QuizResultManager
+from quiz_result_manager import LeaderboardIndex, QuizResultManager
 
 
 @pytest.fixture
@@ -77,3 +77,108 @@ def test_save_quiz_result_existing_category(mock_user_manager, quiz_result_manag
     updated_data = mock_user_manager.save_user_data.call_args[0][0]
     assert len(updated_data["user1"]["quiz_results"]["math"]) == 3
     assert updated_data["user1"]["quiz_results"]["math"][-1]["score"] == 95
+
+
+def test_leaderboard_index_matches_full_scan(mock_user_manager, quiz_result_manager):
+    users = mock_user_manager.load_user_data.return_value
+    index = LeaderboardIndex.from_users(users)
+    for category in ("math", "science", "Змішана", "missing"):
+        assert index.top(category) == quiz_result_manager.get_top_20(category)
+
+
+def test_leaderboard_index_keeps_top_size():
+    index = LeaderboardIndex(size=3)
+    for score in [5, 9, 1, 7, 9, 3]:
+        index.add("user", "math", score, f"date-{score}")
+    assert [score for _, score, _ in index.top("math")] == [9, 9, 7]
+    assert len(index.top("Змішана")) == 3
+
+
+def test_get_top_20_uses_current_index(tmp_path, mock_user_manager):
+    users_file = tmp_path / "users.json"
+    users_file.write_text("{}", encoding="utf-8")
+    index = LeaderboardIndex.from_users(
+        mock_user_manager.load_user_data.return_value, str(users_file)
+    )
+    manager = QuizResultManager(mock_user_manager, index)
+    mock_user_manager.load_user_data.reset_mock()
+
+    assert manager.get_top_20("math")[0][1] == 90
+    mock_user_manager.load_user_data.assert_not_called()
+
+    users_file.write_text("{ }", encoding="utf-8")
+    manager.get_top_20("math")
+    mock_user_manager.load_user_data.assert_called_once()
+
+
+def test_save_quiz_results_writes_once(mock_user_manager, quiz_result_manager):
+    saved = quiz_result_manager.save_quiz_results([
+        ("user1", "math", 70, "2025-01-10 09:00:00"),
+        ("user2", "math", 60, None),
+        ("ghost", "math", 99, None),
+    ])
+
+    assert saved == 2
+    mock_user_manager.load_user_data.assert_called_once()
+    mock_user_manager.save_user_data.assert_called_once()
+    users = mock_user_manager.save_user_data.call_args[0][0]
+    assert users["user1"]["quiz_results"]["math"][-1]["date"] == (
+        "2025-01-10 09:00:00"
+    )
+    assert users["user2"]["quiz_results"]["math"][0]["score"] == 60
+    assert "ghost" not in users
+
+
+def test_get_percentile_exact(quiz_result_manager):
+    assert quiz_result_manager.get_percentile("math", 85) == 50.0
+    assert quiz_result_manager.get_percentile("math", 80) == 0.0
+    assert quiz_result_manager.get_percentile("Змішана", 86) == 200 / 3
+    assert quiz_result_manager.get_percentile("math", 95, "2024-12") == 100.0
+    assert quiz_result_manager.get_percentile("history", 50) is None
+
+
+def test_get_percentile_from_sketches(tmp_path, mock_user_manager):
+    from quantile_sketch import PercentileIndex
+
+    users_file = tmp_path / "users.json"
+    users_file.write_text("{}", encoding="utf-8")
+    index = PercentileIndex(str(users_file))
+    manager = QuizResultManager(mock_user_manager, percentile_index=index)
+
+    assert manager.get_percentile("math", 85) == 50.0
+    mock_user_manager.load_user_data.reset_mock()
+
+    manager.save_quiz_result("user2", "math", 10)
+    assert manager.get_percentile("math", 85) == 200 / 3
+    assert manager.get_percentile("Змішана", 86) == 75.0
+    mock_user_manager.load_user_data.assert_called_once()
+
+
+def test_concurrent_saves_are_not_lost(tmp_path, monkeypatch):
+    import json
+    import threading
+    from user_manager import UserManager
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "users.json").write_text(json.dumps({
+        f"user{i}": {"password": "", "birth_date": "", "quiz_results": {}}
+        for i in range(4)
+    }), encoding="utf-8")
+    manager = QuizResultManager(UserManager(), LeaderboardIndex("users.json"))
+
+    def play(login):
+        for score in range(10):
+            manager.save_quiz_result(login, "math", score)
+            manager.get_top_20("math")
+
+    threads = [threading.Thread(target=play, args=(f"user{i}",))
+               for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    users = json.loads((tmp_path / "users.json").read_text(encoding="utf-8"))
+    assert all(len(user["quiz_results"]["math"]) == 10
+               for user in users.values())
+    assert [score for _, score, _ in manager.get_top_20("math")][:4] == [9] * 4
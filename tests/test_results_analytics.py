@@ -0,0 +1,111 @@
+import io
+import json
+import pytest
+from results_analytics import (
+    ResultStats, analyze, iter_members, main, percentile, shard_offsets,
+    write_report
+)
+
+
+def result(category, score, date):
+    return {"category": category, "score": score, "date": date}
+
+
+@pytest.fixture
+def users():
+    return {
+        "alice": {"password": "1", "birth_date": "2000-01-01", "quiz_results": {
+            "math": [result("math", 10, "2025-01-01 10:00:00"),
+                     result("math", 20, "2025-01-01 12:00:00")],
+            "history": [result("history", 5, "2025-01-02 09:00:00")],
+        }},
+        "bob": {"password": "2", "birth_date": "2000-01-01", "quiz_results": {
+            "math": [result("math", 15, "2025-01-01 11:00:00")],
+        }},
+        "іван": {"password": "3", "birth_date": "2000-01-01", "quiz_results": {}},
+        "carol": {"password": "4", "birth_date": "2000-01-01", "quiz_results": {
+            "history": [result("history", 7, "2025-01-02 10:00:00")],
+        }},
+    }
+
+
+@pytest.fixture(params=["pretty", "lines", "compact"])
+def users_file(request, tmp_path, users):
+    path = tmp_path / "users.json"
+    if request.param == "pretty":
+        text = json.dumps(users, indent=4)
+    elif request.param == "lines":
+        text = "{" + ",".join(
+            f"\n{json.dumps(login, ensure_ascii=False)}: "
+            f"{json.dumps(user, ensure_ascii=False)}"
+            for login, user in users.items()
+        ) + "\n}\n"
+    else:
+        text = json.dumps(users, ensure_ascii=False, separators=(",", ":"))
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_iter_members_streams_small_blocks(users_file, users):
+    assert dict(iter_members(users_file, read_size=7)) == users
+
+
+def test_shards_hold_whole_members(users_file, users):
+    members = {}
+    for start, end in shard_offsets(users_file, 3):
+        members.update(iter_members(users_file, start, end, read_size=16))
+    assert members == users
+
+
+def test_iter_members_rejects_invalid_json(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text('{"alice": {"quiz_results": }', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_members(str(path)))
+
+
+def test_analyze(users_file):
+    stats = analyze([users_file])
+    assert (stats.users, stats.results) == (4, 5)
+
+    categories = {row["category"]: row for row in stats.category_rows()}
+    assert categories["math"] == {
+        "category": "math", "quizzes": 3, "mean": 15.0, "min": 10, "max": 20,
+        "p50": 15, "p90": 20, "p99": 20,
+    }
+    assert stats.daily_rows() == [
+        {"date": "2025-01-01", "players": 2, "quizzes": 3, "mean_score": 15.0},
+        {"date": "2025-01-02", "players": 2, "quizzes": 2, "mean_score": 6.0},
+    ]
+
+
+def test_workers_give_the_same_result(users_file):
+    assert analyze([users_file], workers=2).to_dict() == analyze([users_file]).to_dict()
+
+
+def test_percentile():
+    histogram = {1: 1, 2: 1, 3: 1, 4: 1}
+    assert percentile(histogram, 50) == 2
+    assert percentile(histogram, 100) == 4
+    assert percentile(histogram, 0) == 1
+
+
+def test_csv_report(users_file):
+    output = io.StringIO()
+    write_report(analyze([users_file]), output, "csv", "histogram")
+    assert output.getvalue().splitlines() == [
+        "category,score,count", "history,5,1", "history,7,1",
+        "math,10,1", "math,15,1", "math,20,1",
+    ]
+
+
+def test_main_writes_json(users_file, tmp_path):
+    report = tmp_path / "report.json"
+    assert main([users_file, "-o", str(report)]) == 0
+    data = json.loads(report.read_text(encoding="utf-8"))
+    assert data["results"] == 5
+    assert [row["category"] for row in data["categories"]] == ["history", "math"]
+
+
+def test_empty_stats():
+    assert ResultStats().to_dict()["categories"] == []
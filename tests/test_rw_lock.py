@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from rw_lock import RWLock
+
+
+def test_readers_share_the_lock():
+    lock = RWLock()
+    inside = threading.Barrier(3, timeout=5)
+
+    def read():
+        with lock.read_locked():
+            inside.wait()  # Only passes if all three hold the lock at once.
+
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not inside.broken
+
+
+def test_writer_excludes_readers():
+    lock = RWLock()
+    events = []
+    writing = threading.Event()
+
+    def write():
+        with lock.write_locked():
+            writing.set()
+            time.sleep(0.05)
+            events.append("write done")
+
+    def read():
+        writing.wait()
+        with lock.read_locked():
+            events.append("read")
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert events == ["write done", "read"]
+
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = RWLock()
+    events = []
+    lock.acquire_read()
+
+    writer = threading.Thread(target=lambda: (
+        lock.acquire_write(), events.append("write"), lock.release_write()
+    ))
+    writer.start()
+    while not lock._waiting_writers:
+        time.sleep(0.001)
+    reader = threading.Thread(target=lambda: (
+        lock.acquire_read(), events.append("read"), lock.release_read()
+    ))
+    reader.start()
+    time.sleep(0.02)
+    assert events == []
+
+    lock.release_read()
+    writer.join()
+    reader.join()
+    assert events == ["write", "read"]
+
+
+def test_writer_may_reenter():
+    lock = RWLock()
+    with lock.write_locked():
+        with lock.read_locked():
+            with lock.write_locked():
+                pass
+    # Fully released: another thread can write.
+    thread = threading.Thread(target=lambda: lock.write_locked().__enter__())
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_read_lock_cannot_be_upgraded():
+    lock = RWLock()
+    with lock.read_locked():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
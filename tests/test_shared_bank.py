@@ -0,0 +1,147 @@
+import json
+import os
+import pytest
+from shared_bank import (
+    SharedBankLoader, SharedQuestionBank, main, publish, read_generation
+)
+from quiz_category import MixedCategory, SpecificCategory
+
+
+@pytest.fixture
+def questions():
+    return [
+        {"id": "a1", "category": "geography", "question": "Capital of France?",
+         "options": ["Paris", "Berlin"], "correct_answers": ["Paris"]},
+        {"category": "math", "question": "2 + 2 = ?",
+         "options": ["Так", "Ні"], "correct_answers": ["Так"]},
+        {"id": "a3", "category": "Geography", "question": "Capital of Germany?",
+         "options": ["Paris", "Berlin", "Бонн"], "correct_answers": ["Berlin", "Бонн"]},
+        {"id": "a4", "category": "спорт", "question": "wwwwww",
+         "options": ["aaaaa", "sssss"], "correct_answers": ["eeeee"]},
+    ]
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    return str(tmp_path / "questions.bank")
+
+
+def test_items_match_source_questions(questions, bank_path):
+    assert publish(questions, bank_path) == 1
+    bank = SharedQuestionBank(bank_path)
+    assert len(bank) == 4
+    assert list(bank) == questions
+    assert bank[-1] == questions[-1]
+    assert bank[1:3] == questions[1:3]
+    with pytest.raises(IndexError):
+        bank[4]
+
+
+def test_category_selection(questions, bank_path):
+    publish(questions, bank_path)
+    bank = SharedQuestionBank(bank_path)
+    assert sorted(bank.categories) == ["Geography", "geography", "math", "спорт"]
+    expected = SpecificCategory(questions, "geography").questions
+    assert list(SpecificCategory(bank, "geography").questions) == expected
+    assert list(bank.filter_category("math")) == [questions[1]]
+    assert all(q in questions for q in MixedCategory(bank).get_questions())
+
+
+def test_generations(questions, bank_path):
+    assert read_generation(bank_path) == 0
+    publish(questions, bank_path)
+    old = SharedQuestionBank(bank_path)
+    assert publish(questions[:1], bank_path) == 2
+    assert SharedQuestionBank(bank_path).generation == 2
+    # A process still holding the old generation keeps reading it.
+    assert len(old) == 4 and old[2] == questions[2]
+
+
+def test_invalid_file(bank_path):
+    with open(bank_path, "wb") as file:
+        file.write(b"x" * 200)
+    with pytest.raises(ValueError):
+        SharedQuestionBank(bank_path)
+
+
+def test_loader_publishes_and_follows_the_source(questions, bank_path, tmp_path):
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+    loader = SharedBankLoader(bank_path, str(source))
+
+    bank = loader.load_questions()
+    assert bank.generation == 1 and len(bank) == 4
+    assert loader.load_questions() is bank
+
+    source.write_text(json.dumps({"questions": questions[:2]}), encoding="utf-8")
+    os.utime(source, ns=(1, 1))
+    bank = loader.load_questions()
+    assert bank.generation == 2 and len(bank) == 2
+
+    publish(questions, bank_path)
+    assert len(SharedBankLoader(bank_path, None).load_questions()) == 4
+
+
+def test_bank_writable_by_others_is_refused(questions, bank_path):
+    publish(questions, bank_path)
+    os.chmod(bank_path, 0o666)
+    with pytest.raises(PermissionError):
+        SharedQuestionBank(bank_path)
+
+
+def test_failed_republish_keeps_the_current_bank(
+        questions, bank_path, tmp_path, monkeypatch, capsys):
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+    loader = SharedBankLoader(bank_path, str(source))
+    bank = loader.load_questions()
+
+    def refuse(*args):
+        raise PermissionError("bank owned by another user")
+
+    monkeypatch.setattr("shared_bank.publish_file", refuse)
+    source.write_text(json.dumps({"questions": questions[:1]}), encoding="utf-8")
+    os.utime(source, ns=(1, 1))
+    assert loader.load_questions() is bank
+    assert "Не вдалося оновити" in capsys.readouterr().out
+    # The same source is not tried again on every read.
+    assert loader.load_questions() is bank
+    assert capsys.readouterr().out == ""
+
+
+def test_category_quiz_decodes_only_its_questions(bank_path, tmp_path,
+                                                  monkeypatch):
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps({"questions": [
+        {"id": f"q{i}", "category": f"c{i % 10}", "question": f"Q{i}",
+         "options": ["A", "B"], "correct_answers": ["A"]}
+        for i in range(1000)
+    ]}), encoding="utf-8")
+    loader = SharedBankLoader(bank_path, str(source))
+    loader.load_questions()
+
+    decoded = []
+    getitem = SharedQuestionBank.__getitem__
+    monkeypatch.setattr(SharedQuestionBank, "__getitem__",
+                        lambda bank, index: decoded.append(index)
+                        or getitem(bank, index))
+    questions = loader.load_category_questions("c3")
+    assert loader.load_category_questions("c3") is questions
+    assert decoded == []
+
+    quiz = SpecificCategory(questions, "c3").get_questions()
+    assert len(quiz) == 20 and len(decoded) == 20
+    assert all(question["category"] == "c3" for question in quiz)
+
+
+def test_loader_without_bank(bank_path, capsys):
+    assert SharedBankLoader(bank_path, None).load_questions() == []
+    assert "не опубліковано" in capsys.readouterr().out
+
+
+def test_cli(questions, bank_path, tmp_path, capsys):
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+    assert main(["publish", str(source), "--bank", bank_path]) == 0
+    assert main(["info", "--bank", bank_path]) == 0
+    assert "питань 4" in capsys.readouterr().out
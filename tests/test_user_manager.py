@@ -39,16 +39,29 @@ def test_load_user_data_corrupted_file(user_manager):
         data = user_manager.load_user_data()
         assert data == {}
         mock_print.assert_called_once()
-        mock_save.assert_called_once_with({})
+        mock_save.assert_not_called()
 
 
-def test_save_user_data(user_manager, mock_user_data):
-    with patch("user_manager.open", mock_open()) as mock_file:
-        user_manager.save_user_data(mock_user_data)
+def test_save_user_data(user_manager, mock_user_data, tmp_path, monkeypatch):
+    file_path = tmp_path / "users.json"
+    monkeypatch.setattr(user_manager, "USER_DATA_FILE", str(file_path))
 
-        written_data = "".join(call.args[0] for call in mock_file().write.call_args_list)
+    user_manager.save_user_data(mock_user_data)
 
-        assert written_data == json.dumps(mock_user_data, indent=4, ensure_ascii=False)
+    assert json.loads(file_path.read_text(encoding="utf-8")) == mock_user_data
+    assert [path.name for path in tmp_path.iterdir()] == ["users.json"]
+
+
+def test_save_user_data_keeps_file_on_failure(user_manager, mock_user_data, tmp_path, monkeypatch):
+    file_path = tmp_path / "users.json"
+    file_path.write_text(json.dumps(mock_user_data), encoding="utf-8")
+    monkeypatch.setattr(user_manager, "USER_DATA_FILE", str(file_path))
+
+    with pytest.raises(TypeError):
+        user_manager.save_user_data({"user2": object()})
+
+    assert json.loads(file_path.read_text(encoding="utf-8")) == mock_user_data
+    assert [path.name for path in tmp_path.iterdir()] == ["users.json"]
 
 
 def test_register_user_success(user_manager, mock_user_data):
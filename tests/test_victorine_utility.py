@@ -4,6 +4,8 @@ import os
 from unittest.mock import Mock, patch
 from rich.console import Console
 from rich.table import Table
+from question_ids import migrate_question_ids
+from menu_renderer import PlainMenuRenderer
 from victorine_utility import QuizDataManager, VictorineUtilityMenu
 
 
@@ -69,6 +71,205 @@ class TestQuizDataManager:
             assert saved_data["questions"][0]["category"] == "Science"
 
 
+class TestQuizTransaction:
+    def test_commit_writes_once(self, quiz_data_manager):
+        with patch.object(
+            quiz_data_manager, "save_questions",
+            wraps=quiz_data_manager.save_questions
+        ) as mock_save:
+            with quiz_data_manager.transaction() as transaction:
+                for i in range(50):
+                    transaction.add_question({
+                        "category": "Bulk",
+                        "question": f"Q{i}",
+                        "options": ["A", "B"],
+                        "correct_answers": ["A"]
+                    })
+            mock_save.assert_called_once()
+        assert len(quiz_data_manager.get_questions()) == 52
+
+    def test_no_changes_no_write(self, quiz_data_manager):
+        with patch.object(quiz_data_manager, "save_questions") as mock_save:
+            with quiz_data_manager.transaction():
+                pass
+            mock_save.assert_not_called()
+
+    def test_exception_rolls_back(self, quiz_data_manager):
+        with pytest.raises(RuntimeError):
+            with quiz_data_manager.transaction() as transaction:
+                transaction.remove_category("Math")
+                raise RuntimeError("boom")
+        assert len(quiz_data_manager.get_questions()) == 2
+
+    def test_replace_question(self, quiz_data_manager):
+        with quiz_data_manager.transaction() as transaction:
+            replaced = transaction.replace_question("2 + 2 = ?", "Math", {
+                "category": "Math",
+                "question": "3 + 3 = ?",
+                "options": ["5", "6"],
+                "correct_answers": ["6"]
+            })
+        assert replaced
+        questions = quiz_data_manager.get_questions()
+        assert questions[0]["question"] == "3 + 3 = ?"
+
+    def test_save_leaves_no_temp_files(self, quiz_data_manager, tmp_path):
+        quiz_data_manager.save_questions([])
+        assert os.listdir(tmp_path) == ["test_questions.json"]
+
+    def test_save_keeps_file_mode(self, quiz_data_manager, temp_json_file,
+                                  tmp_path):
+        os.chmod(temp_json_file, 0o640)
+        quiz_data_manager.save_questions([])
+        assert os.stat(temp_json_file).st_mode & 0o777 == 0o640
+
+        umask = os.umask(0o022)
+        os.umask(umask)
+        new_file = tmp_path / "new.json"
+        QuizDataManager(str(new_file)).save_questions([])
+        assert os.stat(new_file).st_mode & 0o777 == 0o666 & ~umask
+
+    def test_update_and_remove_by_id(self, quiz_data_manager):
+        migrate_question_ids(quiz_data_manager)
+        first, second = quiz_data_manager.get_questions()
+        with quiz_data_manager.transaction() as transaction:
+            assert transaction.get_question(second["id"]) == second
+            assert transaction.update_question(first["id"], {
+                "category": "Math", "question": "3 + 3 = ?",
+                "options": ["5", "6"], "correct_answers": ["6"]
+            })
+            assert transaction.remove_question(second["id"])
+            assert not transaction.remove_question(second["id"])
+            transaction.add_question(dict(first))
+
+        questions = quiz_data_manager.get_questions()
+        assert [q["question"] for q in questions] == ["3 + 3 = ?", "2 + 2 = ?"]
+        assert questions[0]["id"] == first["id"]
+        assert questions[1]["id"] != first["id"]
+
+
+class TestQuestionIds:
+    def test_reading_does_not_write(self, quiz_data_manager, temp_json_file):
+        before = temp_json_file.read_bytes()
+        assert all("id" not in q for q in quiz_data_manager.get_questions())
+        assert temp_json_file.read_bytes() == before
+
+    def test_ids_assigned_on_save(self, tmp_path):
+        manager = QuizDataManager(str(tmp_path / "questions.json"))
+        manager.save_questions([
+            {"category": "Math", "question": "2 + 2 = ?",
+             "options": ["3", "4"], "correct_answers": ["4"]}
+        ])
+        assert manager.get_questions()[0]["id"]
+
+    def test_migration_assigns_ids_once(self, quiz_data_manager, temp_json_file):
+        assert migrate_question_ids(quiz_data_manager) == 2
+        ids = [q["id"] for q in quiz_data_manager.get_questions()]
+
+        assert len(set(ids)) == 2
+        with open(temp_json_file, "r", encoding="utf-8") as f:
+            saved = json.load(f)["questions"]
+        assert [q["id"] for q in saved] == ids
+        assert migrate_question_ids(quiz_data_manager) == 0
+
+    @patch('builtins.input')
+    def test_edit_question_without_id(self, mock_input, quiz_data_manager):
+        menu = VictorineUtilityMenu(quiz_data_manager, Console())
+        question = menu.get_questions_by_category("History")[0]
+        assert "id" not in question
+        mock_input.side_effect = ["Edited", "", ""]
+
+        with quiz_data_manager.transaction() as transaction:
+            menu.edit_question(question, transaction)
+
+        questions = quiz_data_manager.get_questions()
+        assert [q["question"] for q in questions] == ["2 + 2 = ?", "Edited"]
+        assert questions[1]["category"] == "History"
+
+    @patch('builtins.input')
+    def test_edit_question_with_duplicate_text(self, mock_input, tmp_path):
+        manager = QuizDataManager(str(tmp_path / "questions.json"))
+        manager.save_questions([
+            {"category": "Math", "question": "2 + 2 = ?",
+             "options": ["3", "4"], "correct_answers": ["4"]}
+            for _ in range(2)
+        ])
+        menu = VictorineUtilityMenu(manager, Console())
+        second = manager.get_questions()[1]
+        mock_input.side_effect = ["Edited", "", ""]
+
+        with manager.transaction() as transaction:
+            menu.edit_question(second, transaction)
+
+        assert [q["question"] for q in manager.get_questions()] == [
+            "2 + 2 = ?", "Edited"
+        ]
+
+
+@pytest.fixture
+def large_menu(tmp_path):
+    manager = QuizDataManager(str(tmp_path / "large.json"))
+    manager.save_questions([
+        {"category": "Bulk", "question": f"Question {i}",
+         "options": ["A", "B"], "correct_answers": ["A"]}
+        for i in range(1, 46)
+    ])
+    return VictorineUtilityMenu(manager, Console(width=200))
+
+
+class TestPagination:
+    def test_navigate_page(self):
+        navigate = VictorineUtilityMenu.navigate_page
+        assert navigate("n", 0, 3) == 1
+        assert navigate("n", 2, 3) == 2
+        assert navigate("p", 0, 3) == 0
+        assert navigate("g3", 0, 3) == 2
+        assert navigate("g9", 0, 3) == 2
+        assert navigate("5", 0, 3) is None
+        assert navigate("n", 0, 1) is None
+
+    @patch('builtins.input')
+    def test_view_quizzes_renders_one_page_at_a_time(
+            self, mock_input, large_menu, capsys
+    ):
+        mock_input.side_effect = ["q"]
+        large_menu.view_quizzes()
+        output = capsys.readouterr().out
+        assert "сторінка 1/3" in output
+        assert "Question 20 " in output
+        assert "Question 21 " not in output
+
+        mock_input.side_effect = ["g3", ""]
+        large_menu.view_quizzes()
+        output = capsys.readouterr().out
+        assert "сторінка 3/3" in output
+        assert "Question 45 " in output
+
+    def test_view_quizzes_reads_one_category_at_a_time(self, capsys):
+        manager = Mock()
+        manager.get_categories.return_value = ["Math", "History"]
+        manager.get_category_questions.side_effect = lambda category: [
+            {"category": category, "question": f"{category} question",
+             "options": ["A", "B"], "correct_answers": ["A"]}
+        ]
+        VictorineUtilityMenu(manager, Console(width=200)).view_quizzes()
+
+        manager.get_questions.assert_not_called()
+        assert [c.args for c in manager.get_category_questions.call_args_list] \
+            == [("History",), ("Math",)]
+        assert "Math question" in capsys.readouterr().out
+
+    @patch('builtins.input')
+    def test_edit_question_on_later_page(self, mock_input, large_menu, capsys):
+        mock_input.side_effect = ["n", "25", "Edited", "", ""]
+        large_menu.display_questions_for_editing(
+            large_menu.get_questions_by_category("Bulk")
+        )
+        assert "сторінка 2/3" in capsys.readouterr().out
+        questions = large_menu.quiz_data_manager.get_questions()
+        assert questions[24]["question"] == "Edited"
+
+
 class TestVictorineUtilityMenu:
     def test_get_unique_categories(self, victorine_menu):
         categories = victorine_menu.get_unique_categories()
@@ -98,10 +299,69 @@ class TestVictorineUtilityMenu:
         assert len(science_questions) == 1
         assert science_questions[0]["question"] == "What is gravity?"
 
+    @patch('builtins.input')
+    def test_add_quiz_several_questions_single_write(
+            self, mock_input, victorine_menu
+    ):
+        mock_input.side_effect = [
+            "Science",
+            "Q1", "A,B", "A", "y",
+            "Q2", "A,B", "B", "y",
+            "Q3", "A,B", "A", "n"
+        ]
+        manager = victorine_menu.quiz_data_manager
+        with patch.object(
+            manager, "save_questions", wraps=manager.save_questions
+        ) as mock_save:
+            victorine_menu.add_quiz()
+            mock_save.assert_called_once()
+        assert len(victorine_menu.get_questions_by_category("Science")) == 3
+
+    def test_remove_category_questions(self, victorine_menu):
+        victorine_menu.remove_category_questions("Math")
+        assert victorine_menu.get_unique_categories() == ["History"]
+
+    @patch('builtins.input')
+    def test_export_then_import_quiz(self, mock_input, victorine_menu, tmp_path):
+        target = tmp_path / "bank.jsonl"
+        mock_input.return_value = str(target)
+        victorine_menu.export_quiz()
+        victorine_menu.remove_category_questions("Math")
+
+        victorine_menu.import_quiz()
+        assert victorine_menu.get_unique_categories() == ["History", "Math"]
+
+    @patch('builtins.input')
+    def test_search_index_follows_edits(self, mock_input, victorine_menu, capsys):
+        mock_input.return_value = "president"
+        victorine_menu.search_quizzes()
+        assert "First president of Ukraine?" in capsys.readouterr().out
+
+        victorine_menu.remove_category_questions("History")
+        victorine_menu.search_quizzes()
+        assert "Нічого не знайдено." in capsys.readouterr().out
+
     def test_display_menu(self, victorine_menu):
         victorine_menu.display_menu()
         assert True
 
+    @patch('builtins.input')
+    def test_tables_use_the_menu_renderer(
+            self, mock_input, quiz_data_manager, capsys):
+        menu = VictorineUtilityMenu(
+            quiz_data_manager, Console(), PlainMenuRenderer()
+        )
+        mock_input.side_effect = ["0", "2 + 2"]
+        menu.delete_quiz()
+        menu.search_quizzes()
+        menu.view_quizzes()
+
+        output = capsys.readouterr().out
+        assert "Оберіть категорію для видалення" in output
+        assert "Результати пошуку: 2 + 2" in output
+        assert "Kravchuk, Kuchma, Yushchenko" in output
+        assert not any(char in output for char in "┃━│─")
+
 
 if __name__ == "__main__":
     pytest.main(["-v"])
\ No newline at end of file
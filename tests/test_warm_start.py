@@ -0,0 +1,71 @@
+import os
+import pytest
+from warm_start import SnapshotCache, file_fingerprint
+
+
+def test_file_fingerprint_missing(tmp_path):
+    assert file_fingerprint(str(tmp_path / "missing.json")) is None
+
+
+def test_load_or_build_uses_snapshot_until_source_changes(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1", encoding="utf-8")
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"value": source.read_text(encoding="utf-8")}
+
+    assert cache.load_or_build("data", [str(source)], build) == {"value": "1"}
+    assert cache.load_or_build("data", [str(source)], build) == {"value": "1"}
+    assert len(builds) == 1
+
+    source.write_text("22", encoding="utf-8")
+    assert cache.load_or_build("data", [str(source)], build) == {"value": "22"}
+    assert len(builds) == 2
+
+
+def test_corrupted_snapshot_is_rebuilt(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1", encoding="utf-8")
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    cache.store("data", [str(source)], "cached")
+
+    with open(os.path.join(cache.directory, "data.pickle"), "wb") as file:
+        file.write(b"garbage")
+    assert cache.load("data", [str(source)]) is None
+    assert cache.load_or_build("data", [str(source)], lambda: "fresh") == "fresh"
+
+
+def test_store_with_stale_fingerprints_is_ignored(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1", encoding="utf-8")
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    cache.store("data", [str(source)], "old", [("stale", 0, 0)])
+    assert cache.load("data", [str(source)]) is None
+
+
+def test_snapshot_writable_by_others_is_discarded(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1", encoding="utf-8")
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    cache.store("data", [str(source)], "cached")
+    path = os.path.join(cache.directory, "data.pickle")
+
+    os.chmod(path, 0o666)
+    assert cache.load("data", [str(source)]) is None
+    assert not os.path.exists(path)
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="needs root to chown")
+def test_snapshot_of_another_user_is_discarded(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text("1", encoding="utf-8")
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    cache.store("data", [str(source)], "cached")
+    path = os.path.join(cache.directory, "data.pickle")
+
+    os.chown(path, 4321, 4321)
+    assert cache.load("data", [str(source)]) is None
+    assert not os.path.exists(path)
@@ -1,9 +1,12 @@
 import json
 import os
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, Optional
+from typing import ContextManager, Dict, Optional
 from abc import ABC, abstractmethod
 from colorama import Fore, Style
+import metrics
+from rw_lock import RWLock
 
 
 class IUserManager(ABC):
@@ -29,6 +32,17 @@ class IUserManager(ABC):
     def save_user_data(self, data: Dict):
         pass
 
+    def locked_for_update(self) -> ContextManager:
+        """
+        Returns a context manager during which no other thread of this
+        process reads or writes the user data, for a load, modify and save
+        cycle that must not interleave with another one.
+
+        Managers shared between threads override this; the default does
+        not lock.
+        """
+        return nullcontext()
+
 
 class UserManager(IUserManager):
     USER_DATA_FILE = "users.json"
@@ -36,15 +50,25 @@ class UserManager(IUserManager):
     def __init__(self):
         """
         Initializes the UserManager instance by calling the initialize_user_data method, which
-        checks if the user data file exists and if not, creates it. If the file is corrupted, it
-        is rewritten.
+        checks if the user data file exists and if not, creates it.
+
+        The manager can be shared by the threads of a thread pool: loads run
+        concurrently, saves one at a time and never while a load reads the
+        file, and read-modify-write cycles hold `locked_for_update`.
         """
+        self._lock = RWLock()
         self.initialize_user_data()
 
+    def locked_for_update(self):
+        """
+        Holds the user data write lock: loads and saves of other threads
+        wait until the block ends, while this thread's own calls go through.
+        """
+        return self._lock.write_locked()
+
     def initialize_user_data(self):
         """
-        Checks if the user data file exists and if not, creates it. If the file is corrupted, it
-        is rewritten.
+        Checks if the user data file exists and if not, creates it.
 
         This method is called in the constructor of the UserManager class and is used to
         initialize the user data file on the first run of the application.
@@ -55,16 +79,18 @@ class UserManager(IUserManager):
             with open(self.USER_DATA_FILE, 'w') as file:
                 json.dump({}, file)
 
+    @metrics.timed("user_data_load")
     def load_user_data(self):
         """
         Loads user data from the file specified in USER_DATA_FILE.
 
-        If the file is corrupted, it is rewritten and an empty dictionary is returned.
+        If the file is corrupted, an empty dictionary is returned and the file
+        is left as it is, so it can be repaired by hand.
 
         :return: A dictionary with user data
         """
         try:
-            with open(self.USER_DATA_FILE, 'r') as file:
+            with self._lock.read_locked(), open(self.USER_DATA_FILE, 'r') as file:
                 data = json.load(file)
                 if not isinstance(data, dict):
                     raise ValueError(
@@ -76,10 +102,9 @@ class UserManager(IUserManager):
         except (json.JSONDecodeError, ValueError):
             print(
                 f"{Fore.RED}"
-                f"Файл користувачів пошкоджений. Перезаписуємо файл."
+                f"Файл користувачів пошкоджений. Файл не змінено."
                 f"{Style.RESET_ALL}"
             )
-            self.save_user_data({})
             return {}
         except Exception as e:
             print(
@@ -90,17 +115,21 @@ class UserManager(IUserManager):
             )
             return {}
 
+    @metrics.timed("user_data_save")
     def save_user_data(self, data):
         """
         Saves user data to the file specified in USER_DATA_FILE.
 
-        This method is used to save user data to the file. If the file is corrupted, it is rewritten.
+        The file is replaced atomically (see victorine_utility.write_json_atomic),
+        so processes reading it concurrently never see a half-written file.
 
         :param data: A dictionary with user data
         :return: None
         """
-        with open(self.USER_DATA_FILE, 'w') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+        from victorine_utility import write_json_atomic
+
+        with self._lock.write_locked():
+            write_json_atomic(self.USER_DATA_FILE, data)
 
     def register_user(self):
         """
@@ -136,13 +165,21 @@ class UserManager(IUserManager):
             f"{Style.RESET_ALL}"
         )
 
-        users[login] = {
-            "password": password,
-            "birth_date": birth_date,
-            "quiz_results": {}
-        }
-
-        self.save_user_data(users)
+        with self.locked_for_update():
+            # Re-read: other threads may have saved while the user typed.
+            users = self.load_user_data()
+            if login in users:
+                print(
+                    f"{Fore.LIGHTRED_EX}Логін вже існує. Спробуйте інший."
+                    f"{Style.RESET_ALL}"
+                )
+                return None
+            users[login] = {
+                "password": password,
+                "birth_date": birth_date,
+                "quiz_results": {}
+            }
+            self.save_user_data(users)
         print(f"{Fore.GREEN}"
               f"Реєстрація успішна!"
               f"{Style.RESET_ALL}")
@@ -211,18 +248,19 @@ class UserManager(IUserManager):
         Returns:
             None
         """
-        users = self.load_user_data()
+        with self.locked_for_update():
+            users = self.load_user_data()
 
-        if login not in users:
-            print(f"{Fore.RED}"
-                  f"Користувача з таким логіном не існує."
-                  f"{Style.RESET_ALL}")
-            return
+            if login not in users:
+                print(f"{Fore.RED}"
+                      f"Користувача з таким логіном не існує."
+                      f"{Style.RESET_ALL}")
+                return
 
-        users[login]["password"] = new_password
-        users[login]["birth_date"] = new_birth_date
+            users[login]["password"] = new_password
+            users[login]["birth_date"] = new_birth_date
 
-        self.save_user_data(users)
+            self.save_user_data(users)
         print(f"{Fore.GREEN}"
               f"Налаштування успішно оновлено!"
               f"{Style.RESET_ALL}")
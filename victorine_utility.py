@@ -1,7 +1,54 @@
 import json
+import os
+from contextlib import nullcontext
 from rich.console import Console
-from rich.table import Table
 from abc import ABC, abstractmethod
+import metrics
+from menu_renderer import RichMenuRenderer
+from question_dedup import find_category_variants, find_duplicate_clusters
+from question_ids import assign_question_ids, build_id_index, new_question_id
+from question_search import QuestionSearchIndex
+from question_transfer import export_questions, import_questions
+from rw_lock import RWLock
+
+PAGE_SIZE = 20
+
+
+def write_json_atomic(file_path, data):
+    """
+    Writes `data` as JSON to `file_path` atomically.
+
+    The data is written to a temporary file in the same directory which
+    then replaces the original, so readers never see a half-written file.
+    The file keeps the original's permissions; a new file gets the usual
+    0666 less the umask (tempfile.mkstemp would make it 0600).
+
+    Args:
+        file_path (str): The destination file.
+        data: Any JSON-serializable object.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        temp_path = os.path.join(
+            directory, f".{os.path.basename(file_path)}-{os.urandom(6).hex()}.tmp"
+        )
+        try:
+            # The kernel applies the umask to 0666, as for any new file.
+            fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
 
 
 class IQuizDataManager(ABC):
@@ -9,10 +56,242 @@ class IQuizDataManager(ABC):
     def get_questions(self):
         pass
 
+    def get_categories(self):
+        """
+        Returns the categories of the stored questions, in the order they
+        first appear.
+
+        Stores that keep categories apart override this to avoid reading
+        the whole bank.
+        """
+        return list(dict.fromkeys(
+            question["category"] for question in self.get_questions()
+            if "category" in question
+        ))
+
+    def get_category_questions(self, category):
+        """
+        Retrieves the questions of a single category.
+
+        Stores that keep categories apart override this to avoid reading
+        the whole bank.
+
+        Args:
+            category (str): The category to retrieve.
+
+        Returns:
+            list: The questions whose category equals `category`.
+        """
+        return [q for q in self.get_questions() if q["category"] == category]
+
     @abstractmethod
     def save_questions(self, questions):
         pass
 
+    def append_questions(self, questions):
+        """
+        Adds questions to the end of the store, e.g. one batch of a bulk
+        import. The questions must already have unique ids.
+
+        Stores that can write part of the bank override this; the default
+        reads and saves the whole bank.
+
+        Args:
+            questions (list): The questions to add.
+        """
+        with self.locked_for_update():
+            self.save_questions(self.get_questions() + list(questions))
+
+    def locked_for_update(self):
+        """
+        Returns a context manager during which no other thread of this
+        process reads or writes the questions, e.g. around a non-interactive
+        transaction. Stores shared between threads override this; the
+        default does not lock.
+        """
+        return nullcontext()
+
+    def transaction(self):
+        """
+        Opens an edit session over the stored questions.
+
+        Returns:
+            QuizTransaction: A session that stages changes in memory and
+            writes them with a single `save_questions` call on commit.
+        """
+        return QuizTransaction(self)
+
+
+class QuizTransaction:
+    def __init__(self, quiz_data_manager: IQuizDataManager):
+        """
+        Initializes a QuizTransaction over the given data manager.
+
+        The questions are read once when the session is opened; every
+        staged change is applied to this in-memory copy only, so a batch
+        of any size costs exactly one write on commit.
+
+        Questions are addressed by their id through an id -> position
+        index, so getting, updating or removing one question does not scan
+        the bank. Removed questions leave a hole that is compacted when
+        the full list is next read or committed.
+
+        Args:
+            quiz_data_manager (IQuizDataManager): The store to edit.
+        """
+        self.quiz_data_manager = quiz_data_manager
+        self._load()
+
+    def _load(self):
+        self._questions = self.quiz_data_manager.get_questions()
+        self._positions = None
+        self._removed = 0
+        self.changed = False
+
+    @property
+    def questions(self):
+        """
+        The staged questions, without removed ones.
+        """
+        if self._removed:
+            self._questions = [q for q in self._questions if q is not None]
+            self._positions = None
+            self._removed = 0
+        return self._questions
+
+    @property
+    def positions(self):
+        """
+        The id -> position index of the staged questions, built on first use.
+        """
+        if self._positions is None:
+            self._positions = build_id_index(self._questions)
+        return self._positions
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def add_question(self, question):
+        """
+        Stages a new question to be appended to the store. A question
+        without an id, or with an id already in the store, gets a new id.
+
+        Args:
+            question (dict): The question to add.
+        """
+        if not question.get("id") or question["id"] in self.positions:
+            question["id"] = new_question_id()
+        self.positions[question["id"]] = len(self._questions)
+        self._questions.append(question)
+        self.changed = True
+
+    def get_question(self, question_id):
+        """
+        Returns the staged question with the given id, or None.
+        """
+        position = self.positions.get(question_id)
+        return None if position is None else self._questions[position]
+
+    def update_question(self, question_id, question):
+        """
+        Stages the replacement of the question with the given id. The new
+        version keeps the id.
+
+        Args:
+            question_id (str): The id of the question to replace.
+            question (dict): The new version of the question.
+
+        Returns:
+            bool: True if a question with this id exists.
+        """
+        position = self.positions.get(question_id)
+        if position is None:
+            return False
+        question["id"] = question_id
+        self._questions[position] = question
+        self.changed = True
+        return True
+
+    def remove_question(self, question_id):
+        """
+        Stages the removal of the question with the given id.
+
+        Returns:
+            bool: True if a question with this id existed.
+        """
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return False
+        self._questions[position] = None
+        self._removed += 1
+        self.changed = True
+        return True
+
+    def replace_question(self, original_question, original_category, question):
+        """
+        Stages the replacement of the first question matching the given
+        text and category. Prefer `update_question`, which finds the
+        question by id without a scan.
+
+        Args:
+            original_question (str): Text of the question to replace.
+            original_category (str): Category of the question to replace.
+            question (dict): The new version of the question.
+
+        Returns:
+            bool: True if a matching question was found.
+        """
+        for idx, q in enumerate(self.questions):
+            if (q['question'] == original_question
+                    and q['category'] == original_category):
+                if q.get("id"):
+                    question["id"] = q["id"]
+                self._questions[idx] = question
+                self.changed = True
+                return True
+        return False
+
+    def remove_category(self, category):
+        """
+        Stages the removal of all questions from the given category.
+
+        Args:
+            category (str): The category to remove.
+
+        Returns:
+            int: The number of questions removed.
+        """
+        questions = self.questions
+        remaining = [q for q in questions if q["category"] != category]
+        removed = len(questions) - len(remaining)
+        if removed:
+            self._questions = remaining
+            self._positions = None
+            self.changed = True
+        return removed
+
+    def commit(self):
+        """
+        Writes all staged changes with a single save. Does nothing if no
+        changes were staged.
+        """
+        if self.changed:
+            self.quiz_data_manager.save_questions(self.questions)
+            self.changed = False
+
+    def rollback(self):
+        """
+        Discards all staged changes by re-reading the store.
+        """
+        self._load()
+
 
 class QuizDataManager(IQuizDataManager):
     def __init__(self, file_path='questions.json'):
@@ -22,13 +301,30 @@ class QuizDataManager(IQuizDataManager):
         Args:
             file_path (str): The path to the JSON file where questions
             are stored. Defaults to 'questions.json'.
+
+        Reads run concurrently and writes one at a time, so the manager can
+        be shared by the threads of a thread pool.
         """
         self.file_path = file_path
+        self._lock = RWLock()
 
+    def locked_for_update(self):
+        return self._lock.write_locked()
+
+    def _read_questions(self):
+        with self._lock.read_locked():
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                return json.load(file).get("questions", [])
+
+    @metrics.timed("question_data_load")
     def get_questions(self):
         """
         Reads the questions from the JSON file specified by `file_path`.
 
+        Reading never writes: ids are assigned when questions are saved,
+        and files from before the ids are converted once with
+        `python question_ids.py`.
+
         Returns:
             list: A list of questions from the JSON file. If the file
             is not found or if there is a JSON decode error, an empty
@@ -40,19 +336,22 @@ class QuizDataManager(IQuizDataManager):
             JSON file.
         """
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                return data.get("questions", [])
+            return self._read_questions()
         except FileNotFoundError:
             return []
         except json.JSONDecodeError:
             print("Помилка при читанні файлу.")
             return []
 
+    @metrics.timed("question_data_save")
     def save_questions(self, questions):
         """
         Writes the questions to the JSON file specified by `file_path`.
 
+        Questions without an id, or repeating another one's, are given a
+        new id first (see `assign_question_ids`). The file is replaced
+        atomically (see `write_json_atomic`).
+
         Args:
             questions (list): A list of questions to be written to the file.
 
@@ -60,10 +359,11 @@ class QuizDataManager(IQuizDataManager):
             FileNotFoundError: If the specified file does not exist.
             json.JSONDecodeError: If there is an error in encoding the JSON file.
         """
+        assign_question_ids(questions)
         data = {"questions": questions}
         try:
-            with open(self.file_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=4, ensure_ascii=False)
+            with self._lock.write_locked():
+                write_json_atomic(self.file_path, data)
         except FileNotFoundError:
             print("Помилка при збереженні файлу.")
         except json.JSONDecodeError:
@@ -83,7 +383,7 @@ class IVictorineUtility(ABC):
 class VictorineUtilityMenu(IVictorineUtility):
     def __init__(
             self, quiz_data_manager: IQuizDataManager,
-            console: Console = Console()
+            console: Console = None, menu_renderer=None
     ):
         """
         Initializes a VictorineUtilityMenu instance.
@@ -91,16 +391,25 @@ class VictorineUtilityMenu(IVictorineUtility):
         Args:
             quiz_data_manager (IQuizDataManager): An object to manage quiz data.
             console (Console, optional): A Console object for displaying output. Defaults to a new Console instance.
+            menu_renderer (IMenuRenderer, optional): Renders the utility menu.
+                Defaults to a RichMenuRenderer on `console`.
         """
 
-        self.console = console
+        self.console = console if console is not None else Console()
+        self.menu_renderer = (menu_renderer if menu_renderer is not None
+                              else RichMenuRenderer(self.console))
         self.quiz_data_manager = quiz_data_manager
+        self.search_index = None
         self.menu = {
             "1": "Додати вікторину",
             "2": "Видалити вікторину",
             "3": "Змінити вікторину",
             "4": "Переглянути вікторини",
-            "5": "Вихід",
+            "5": "Імпортувати питання (JSONL/CSV)",
+            "6": "Експортувати питання (JSONL/CSV)",
+            "7": "Пошук питань",
+            "8": "Пошук дублікатів",
+            "9": "Вихід",
         }
 
     def display_menu(self):
@@ -114,33 +423,18 @@ class VictorineUtilityMenu(IVictorineUtility):
 
         :return: None
         """
-        table = Table(title="Меню вікторин")
-        table.add_column()
-        table.add_column()
-
-        for key, value in self.menu.items():
-            table.add_row(key, value)
-
-        self.console.print(table)
+        self.menu_renderer.print_menu("Меню вікторин", self.menu.items())
 
     def get_unique_categories(self):
         """
         Retrieves a sorted list of unique categories from the questions dataset.
 
-        This method queries the QuizDataManager for all questions and extracts
-        the category from each question. The categories are stored in a set and
-        then converted to a sorted list before being returned.
+        This method asks the QuizDataManager for the categories (see
+        `IQuizDataManager.get_categories`) and sorts them.
 
         :return: A sorted list of strings, each representing a unique category.
         """
-        questions = self.quiz_data_manager.get_questions()
-        categories = set()
-
-        for question in questions:
-            if "category" in question:
-                categories.add(question["category"])
-
-        return sorted(categories)
+        return sorted(self.quiz_data_manager.get_categories())
 
     def get_questions_by_category(self, category):
         """
@@ -155,8 +449,7 @@ class VictorineUtilityMenu(IVictorineUtility):
         Returns:
             list: A list of questions that belong to the specified category.
         """
-        questions = self.quiz_data_manager.get_questions()
-        return [q for q in questions if q["category"] == category]
+        return self.quiz_data_manager.get_category_questions(category)
 
     def delete_quiz(self):
         """
@@ -173,14 +466,10 @@ class VictorineUtilityMenu(IVictorineUtility):
             print("Немає доступних категорій для видалення.")
             return
 
-        table = Table(title="Оберіть категорію для видалення")
-        table.add_column("№", justify="center")
-        table.add_column("Категорія", justify="center")
-
-        for idx, category in enumerate(categories, 1):
-            table.add_row(str(idx), category)
-
-        self.console.print(table)
+        self.menu_renderer.print_table(
+            "Оберіть категорію для видалення", ("№", "Категорія"),
+            [(str(idx), category) for idx, category in enumerate(categories, 1)]
+        )
 
         category_choice = input(
             f"Оберіть категорію для видалення (1-{len(categories)}): "
@@ -207,12 +496,11 @@ class VictorineUtilityMenu(IVictorineUtility):
         Args:
             category (str): The category from which questions should be removed.
         """
-        questions = self.quiz_data_manager.get_questions()
-        filtered_questions = [
-            q for q in questions if q["category"] != category
-        ]
-
-        self.quiz_data_manager.save_questions(filtered_questions)
+        with self.quiz_data_manager.locked_for_update(), \
+                self.quiz_data_manager.transaction() as transaction:
+            transaction.remove_category(category)
+        if self.search_index is not None:
+            self.search_index.remove_category(category)
         print(f"Усі запитання з категорії '{category}' були видалені.")
 
     def add_quiz(self):
@@ -229,13 +517,13 @@ class VictorineUtilityMenu(IVictorineUtility):
         3. A comma-separated list of correct answers
 
         For each question, the entered information is stored in a dictionary
-        and added to the list of all questions. The updated list of questions
-        is then saved to the dataset.
+        and staged in a transaction. All entered questions are saved to the
+        dataset with a single write once the user stops adding.
 
         :return: None
         """
         category = input("Введіть категорію для вікторини: ")
-        questions = self.quiz_data_manager.get_questions()
+        transaction = self.quiz_data_manager.transaction()
 
         while True:
             question_text = input("Введіть запитання: ")
@@ -253,14 +541,17 @@ class VictorineUtilityMenu(IVictorineUtility):
                 "correct_answers": correct_answers,
             }
 
-            questions.append(new_question)
-            self.quiz_data_manager.save_questions(questions)
+            transaction.add_question(new_question)
+            if self.search_index is not None:
+                self.search_index.add(new_question)
 
             print("Запитання додано.")
             continue_choice = input("Додати ще одне питання? (y/n): ")
             if continue_choice.lower() != "y":
                 break
 
+        transaction.commit()
+
     def edit_quiz(self):
         """
         Edits questions within a specified category.
@@ -277,14 +568,10 @@ class VictorineUtilityMenu(IVictorineUtility):
             print("Немає доступних категорій для редагування.")
             return
 
-        table = Table(title="Оберіть категорію для редагування")
-        table.add_column("№", justify="center")
-        table.add_column("Категорія", justify="center")
-
-        for idx, category in enumerate(categories, 1):
-            table.add_row(str(idx), category)
-
-        self.console.print(table)
+        self.menu_renderer.print_table(
+            "Оберіть категорію для редагування", ("№", "Категорія"),
+            [(str(idx), category) for idx, category in enumerate(categories, 1)]
+        )
 
         category_choice = input(
             f"Оберіть категорію для редагування (1-{len(categories)}): "
@@ -305,8 +592,9 @@ class VictorineUtilityMenu(IVictorineUtility):
         """
         Displays the questions in a given category for editing.
 
-        This method displays a table of questions within a given category and
-        allows the user to select a question to edit. Once a question is selected,
+        This method displays the questions within a given category one page
+        at a time and allows the user to move between pages and select a
+        question to edit. Once a question is selected,
         the user is prompted to edit the question, and the edited question is
         saved to the dataset.
 
@@ -317,43 +605,124 @@ class VictorineUtilityMenu(IVictorineUtility):
             print("Немає запитань у цій категорії.")
             return
 
-        table = Table(title="Оберіть запитання для редагування")
-        table.add_column("№", justify="center")
-        table.add_column("Запитання", justify="center")
-
-        for idx, question in enumerate(questions_in_category, 1):
-            table.add_row(str(idx), question["question"])
+        pages = self.page_count(len(questions_in_category))
+        page = 0
+        prompt = (
+            f"Оберіть запитання для редагування "
+            f"(1-{len(questions_in_category)}): "
+        )
+        if pages > 1:
+            prompt = (
+                f"Оберіть запитання для редагування "
+                f"(1-{len(questions_in_category)}), n/p - наступна/попередня "
+                f"сторінка, g<номер> - перейти на сторінку: "
+            )
 
-        self.console.print(table)
+        while True:
+            self.print_question_page(
+                "Оберіть запитання для редагування",
+                questions_in_category, page
+            )
+            question_choice = input(prompt)
+            new_page = self.navigate_page(
+                question_choice.strip().lower(), page, pages
+            )
+            if new_page is None:
+                break
+            page = new_page
 
-        question_choice = input(
-            f"Оберіть запитання для редагування (1-{len(questions_in_category)}): "
-        )
         try:
             question_choice = int(question_choice)
             if 1 <= question_choice <= len(questions_in_category):
                 selected_question = questions_in_category[question_choice - 1]
-                all_questions = self.quiz_data_manager.get_questions()
-                self.edit_question(selected_question, all_questions)
+                with self.quiz_data_manager.transaction() as transaction:
+                    self.edit_question(selected_question, transaction)
             else:
                 print("Невірний вибір питання.")
         except ValueError:
             print("Невірний вибір.")
 
-    def edit_question(self, question, all_questions):
+    @staticmethod
+    def page_count(total):
+        """
+        Returns the number of pages needed to show `total` rows.
+        """
+        return max(1, -(-total // PAGE_SIZE))
+
+    @staticmethod
+    def navigate_page(command, page, pages):
+        """
+        Interprets a page navigation command.
+
+        Supported commands are 'n' (next page), 'p' (previous page) and
+        'g<number>' (jump to a page, counted from 1). Out-of-range moves
+        stay on the first or last page.
+
+        :param command: The lowercased user input.
+        :param page: The current page, counted from 0.
+        :param pages: The number of pages.
+        :return: The new page, or None if `command` is not a navigation command.
+        """
+        if pages <= 1:
+            return None
+        if command == "n":
+            return min(page + 1, pages - 1)
+        if command == "p":
+            return max(page - 1, 0)
+        if command.startswith("g") and command[1:].strip().isdigit():
+            return min(max(int(command[1:]) - 1, 0), pages - 1)
+        return None
+
+    def print_question_page(self, title, questions, page, detailed=False):
+        """
+        Renders a single page of questions as a table.
+
+        Only the rows of the requested page are added to the table, so the
+        rendering cost does not depend on the size of the category. Rows
+        keep their numbers within the whole list.
+
+        :param title: The table title.
+        :param questions: All questions of the list being paged.
+        :param page: The page to render, counted from 0.
+        :param detailed: Whether to include options and correct answers.
+        :return: None
+        """
+        pages = self.page_count(len(questions))
+        if pages > 1:
+            title = f"{title} (сторінка {page + 1}/{pages})"
+
+        columns = ["№", "Запитання"]
+        if detailed:
+            columns += ["Варіанти відповідей", "Правильні відповіді"]
+
+        rows = []
+        start = page * PAGE_SIZE
+        for idx, question in enumerate(
+                questions[start:start + PAGE_SIZE], start + 1):
+            if detailed:
+                rows.append((
+                    str(idx), question["question"],
+                    ", ".join(question["options"]),
+                    ", ".join(question["correct_answers"])
+                ))
+            else:
+                rows.append((str(idx), question["question"]))
+
+        self.menu_renderer.print_table(title, columns, rows)
+
+    def edit_question(self, question, transaction):
         """
         Edits a given question within the dataset.
 
         This method allows the user to modify the text, options, and correct answers
-        of a specified question. The updated question is then saved back into the
-        overall list of questions.
+        of a specified question. The updated question is staged in the given
+        transaction and written when the transaction is committed.
 
         :param question: The question dictionary to be edited.
-        :param all_questions: The list of all questions from the file.
+        :param transaction: The QuizTransaction the change is staged in.
         :return: None
         """
         print(f"Редагуємо питання: {question['question']}")
-
         original_question = question['question']
         original_category = question['category']
 
@@ -369,43 +738,178 @@ class VictorineUtilityMenu(IVictorineUtility):
         if new_answers:
             question['correct_answers'] = new_answers.split(',')
 
-        for idx, q in enumerate(all_questions):
-            if q['question'] == original_question and q['category'] == original_category:
-                all_questions[idx] = question
-                break
-
-        self.quiz_data_manager.save_questions(all_questions)
+        question_id = question.get("id")
+        if question_id:
+            found = transaction.update_question(question_id, question)
+        else:
+            # A bank edited by hand may have questions without an id.
+            found = transaction.replace_question(
+                original_question, original_category, question
+            )
+        if not found:
+            print("Питання не знайдено, можливо, його вже видалено.")
+            return
+        if self.search_index is not None:
+            if question_id:
+                self.search_index.replace(question_id, question)
+            else:
+                # Rebuilt on the next search: it is found by id only.
+                self.search_index = None
         print("Питання було успішно змінено.")
 
     def view_quizzes(self):
-        questions = self.quiz_data_manager.get_questions()
-        if not questions:
-            print("Немає запитань для перегляду.")
-            return
+        """
+        Displays all questions grouped by category, one page at a time.
+
+        Only the list of categories is read up front; the questions of a
+        category are read when the user gets to it (see
+        `get_questions_by_category`), and only the rows of the current page
+        are rendered. For categories with more than one page the user can
+        move between pages.
 
+        :return: None
+        """
         categories = self.get_unique_categories()
         if not categories:
-            print("Немає доступних категорій для перегляду.")
+            print("Немає запитань для перегляду.")
             return
 
         for category in categories:
-            print(f"\nКатегорія: {category}")
             questions_in_category = self.get_questions_by_category(category)
+            if not questions_in_category:
+                continue
+            print(f"\nКатегорія: {category}")
+            pages = self.page_count(len(questions_in_category))
+            page = 0
+
+            while True:
+                self.print_question_page(
+                    f"Запитання у категорії: {category}",
+                    questions_in_category, page, detailed=True
+                )
+                if pages == 1:
+                    break
+                command = input(
+                    "Enter/n - наступна сторінка, p - попередня, "
+                    "g<номер> - перейти, q - наступна категорія: "
+                ).strip().lower()
+                if command in ("", "n") and page == pages - 1:
+                    break
+                if command == "q":
+                    break
+                new_page = self.navigate_page(command or "n", page, pages)
+                if new_page is None:
+                    print("Невірний вибір.")
+                else:
+                    page = new_page
+
+    def import_quiz(self):
+        """
+        Imports questions from a JSONL or CSV file.
 
-            table = Table(title=f"Запитання у категорії: {category}")
-            table.add_column("№", justify="center")
-            table.add_column("Запитання", justify="center")
-            table.add_column("Варіанти відповідей", justify="center")
-            table.add_column("Правильні відповіді", justify="center")
+        The file is streamed record by record; invalid records and
+        duplicates of existing questions are skipped and reported.
 
-            for idx, question in enumerate(questions_in_category, 1):
-                table.add_row(
-                    str(idx), question["question"],
-                    ", ".join(question["options"]),
-                    ", ".join(question["correct_answers"])
+        :return: None
+        """
+        file_path = input("Введіть шлях до файлу (.jsonl або .csv): ")
+        try:
+            report = import_questions(self.quiz_data_manager, file_path)
+        except (OSError, ValueError) as e:
+            print(f"Помилка імпорту: {e}")
+            return
+        if report["imported"]:
+            self.search_index = None
+
+        print(f"Імпортовано: {report['imported']}, "
+              f"дублікатів: {report['duplicates']}, "
+              f"схожих: {report['near_duplicates']}, "
+              f"помилок: {report['invalid']}.")
+        for message in report["errors"] + report["warnings"]:
+            print(f"  {message}")
+
+    def export_quiz(self):
+        """
+        Exports all questions to a JSONL or CSV file.
+
+        :return: None
+        """
+        file_path = input("Введіть шлях до файлу (.jsonl або .csv): ")
+        try:
+            count = export_questions(self.quiz_data_manager, file_path)
+        except (OSError, ValueError) as e:
+            print(f"Помилка експорту: {e}")
+            return
+        print(f"Експортовано {count} питань.")
+
+    def get_search_index(self):
+        """
+        Returns the search index over all questions, building it on first use.
+
+        The index is kept up to date by the add, edit, delete and import
+        actions of this menu, so it is built only once per session.
+
+        :return: A QuestionSearchIndex.
+        """
+        if self.search_index is None:
+            self.search_index = QuestionSearchIndex(
+                self.quiz_data_manager.get_questions()
+            )
+        return self.search_index
+
+    def search_quizzes(self):
+        """
+        Searches questions by words from their text or answer options.
+
+        Every word of the query must occur (also as part of a longer word)
+        in the question or its options. At most 50 matches are shown.
+
+        :return: None
+        """
+        query = input("Введіть текст для пошуку: ")
+        results = self.get_search_index().search(query, limit=50)
+        if not results:
+            print("Нічого не знайдено.")
+            return
+
+        self.menu_renderer.print_table(
+            f"Результати пошуку: {query}",
+            ("№", "Категорія", "Запитання", "Варіанти відповідей"),
+            [(str(idx), question["category"], question["question"],
+              ", ".join(question["options"]))
+             for idx, question in enumerate(results, 1)]
+        )
+
+    def report_duplicates(self):
+        """
+        Reports groups of duplicate and near-duplicate questions, and
+        categories whose names differ only in case or look-alike letters.
+
+        :return: None
+        """
+        questions = self.quiz_data_manager.get_questions()
+
+        for variants in find_category_variants(
+                question["category"] for question in questions):
+            print(f"Схожі назви категорій: {', '.join(variants)}")
+
+        clusters = find_duplicate_clusters(questions)
+        if not clusters:
+            print("Дублікатів не знайдено.")
+            return
+
+        rows = []
+        for group, cluster in enumerate(clusters, 1):
+            for position in cluster:
+                question = questions[position]
+                rows.append(
+                    (str(group), question["category"], question["question"])
                 )
 
-            self.console.print(table)
+        self.menu_renderer.print_table(
+            f"Знайдено груп дублікатів: {len(clusters)}",
+            ("Група", "Категорія", "Запитання"), rows
+        )
 
     def run(self):
         """
@@ -414,8 +918,9 @@ class VictorineUtilityMenu(IVictorineUtility):
 
         This method continuously displays the Victorine utility menu to the user,
         allowing them to choose between adding a new quiz, deleting an existing
-        quiz, editing an existing quiz, viewing all quizzes, or exiting the
-        application. Based on the user's input, it directs them to the appropriate
+        quiz, editing an existing quiz, viewing all quizzes, importing or
+        exporting questions in bulk, searching questions, reporting
+        duplicates, or exiting the application. Based on the user's input, it directs them to the appropriate
         action. The loop continues until the user chooses to exit.
 
         User Options:
@@ -423,7 +928,11 @@ class VictorineUtilityMenu(IVictorineUtility):
             2. Delete an existing quiz.
             3. Edit an existing quiz.
             4. View all quizzes.
-            5. Exit the application.
+            5. Import questions from a JSONL/CSV file.
+            6. Export questions to a JSONL/CSV file.
+            7. Search questions.
+            8. Report duplicate questions.
+            9. Exit the application.
         """
         while True:
             self.display_menu()
@@ -438,6 +947,14 @@ class VictorineUtilityMenu(IVictorineUtility):
             elif choice == "4":
                 self.view_quizzes()
             elif choice == "5":
+                self.import_quiz()
+            elif choice == "6":
+                self.export_quiz()
+            elif choice == "7":
+                self.search_quizzes()
+            elif choice == "8":
+                self.report_duplicates()
+            elif choice == "9":
                 print("До побачення!")
                 break
             else:
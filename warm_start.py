@@ -0,0 +1,143 @@
+import os
+from typing import Callable, List
+
+SNAPSHOT_VERSION = 2
+
+
+def file_fingerprint(file_path: str):
+    """
+    Returns the (inode, size, mtime) triple of a file, or None if the file
+    does not exist. A file replaced through os.replace gets a new inode, so
+    the fingerprint changes even if size and mtime happen to match.
+    """
+    try:
+        stat = os.stat(file_path)
+    except (FileNotFoundError, TypeError):
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def is_trusted_file(stat: os.stat_result) -> bool:
+    """
+    Tells whether a file only this process's user (or root) can have
+    written: it is owned by one of them and not writable by others. Files
+    that are mapped or unpickled must pass this, since whoever can write
+    them controls what the process reads or runs.
+    """
+    return stat.st_uid in (os.getuid(), 0) and not stat.st_mode & 0o002
+
+
+class SnapshotCache:
+    def __init__(self, directory: str = ".quiz_cache"):
+        """
+        Initializes a cache of objects derived from data files.
+
+        pickle and tempfile are imported on first use: this module is also
+        imported for `file_fingerprint` on the normal startup path.
+
+        Each entry is a pickle file holding the derived object together
+        with the fingerprints of the files it was built from. An entry is
+        used only if every source file still has the same fingerprint, so a
+        restart skips parsing and index building whenever the data did not
+        change. The files are written by this application only and must not
+        be shared with untrusted users, as unpickling can run code: a file
+        owned by another user or writable by others (see `is_trusted_file`)
+        is deleted instead of loaded.
+
+        Args:
+            directory (str): The directory holding the snapshot files.
+        """
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.pickle")
+
+    def load(self, name: str, sources: List[str]):
+        """
+        Returns the cached object, or None if it is missing, unreadable or
+        built from files that have changed since.
+
+        Args:
+            name (str): The entry name.
+            sources (List[str]): The files the object is derived from.
+        """
+        import pickle
+
+        path = self._path(name)
+        try:
+            with open(path, "rb") as file:
+                if not is_trusted_file(os.fstat(file.fileno())):
+                    os.remove(path)
+                    return None
+                snapshot = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            return None
+
+        fingerprints = [file_fingerprint(source) for source in sources]
+        if (not isinstance(snapshot, dict)
+                or snapshot.get("version") != SNAPSHOT_VERSION
+                or snapshot.get("sources") != list(sources)
+                or snapshot.get("fingerprints") != fingerprints
+                or None in fingerprints):
+            return None
+        return snapshot["payload"]
+
+    def store(self, name: str, sources: List[str], payload, fingerprints=None):
+        """
+        Writes an object to the cache, replacing the entry atomically.
+
+        Args:
+            name (str): The entry name.
+            sources (List[str]): The files the object is derived from.
+            payload: The object to cache.
+            fingerprints (list, optional): The fingerprints of `sources` the
+                object reflects. Taken now if omitted.
+        """
+        import pickle
+        import tempfile
+
+        if fingerprints is None:
+            fingerprints = [file_fingerprint(source) for source in sources]
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "sources": list(sources),
+            "fingerprints": list(fingerprints),
+            "payload": payload,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{name}-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path(name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load_or_build(self, name: str, sources: List[str],
+                      build: Callable[[], object]):
+        """
+        Returns the cached object, building and caching it if the cache
+        entry is not valid.
+
+        The fingerprints are taken before `build` runs, so a source file
+        that changes during the build invalidates the entry on next use.
+
+        Args:
+            name (str): The entry name.
+            sources (List[str]): The files the object is derived from.
+            build (Callable): Builds the object from the source files.
+        """
+        payload = self.load(name, sources)
+        if payload is not None:
+            return payload
+
+        fingerprints = [file_fingerprint(source) for source in sources]
+        payload = build()
+        if None not in fingerprints:
+            self.store(name, sources, payload, fingerprints)
+        return payload